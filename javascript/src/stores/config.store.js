@@ -1,6 +1,6 @@
 import { defineStore } from 'pinia'
 import { toRaw } from 'vue'
-import { collection, doc, getDocs, collectionGroup, updateDoc } from 'firebase/firestore'
+import { collection, doc, getDoc, getDocs, collectionGroup, updateDoc } from 'firebase/firestore'
 import eventMap from '@/event_map.json'
 import { db } from '../firebase'
 
@@ -39,6 +39,28 @@ const getEventResults = (event) => {
   return []
 }
 
+// Keys of a Firestore field path: 'a.`b.c`' -> ['a', 'b.c']
+const splitFieldPath = (path) => {
+  const keys = []
+  let current = ''
+  let quoted = false
+  for (let i = 0; i < path.length; i++) {
+    const char = path[i]
+    if (quoted && char === '\\') {
+      current += path[++i]
+    } else if (char === '`') {
+      quoted = !quoted
+    } else if (char === '.' && !quoted) {
+      keys.push(current)
+      current = ''
+    } else {
+      current += char
+    }
+  }
+  keys.push(current)
+  return keys
+}
+
 export const useConfigStore = defineStore('config', {
   state: () => ({
     meets: [],
@@ -121,13 +143,6 @@ export const useConfigStore = defineStore('config', {
       this.loadingEvents = true;
 
       try {
-        // --- Default columns (common to all genders) ---
-        const defaultColumns = [
-          { headerName: 'Rk', field: 'rank', sticky: true, meta: { fullHeaderName: 'Rank' } },
-          { headerName: 'Team', field: 'logo', sticky: true, sortable: false, meta: { fullHeaderName: 'Team' } },
-          { headerName: 'Pts', field: 'total_pts', sticky: true, meta: { fullHeaderName: 'Total Points' }},
-        ];
-
         // --- Fetch events for each gender ---
         for (const gender of this.genders) {
           const genderCollectionRef = collection(
@@ -145,23 +160,7 @@ export const useConfigStore = defineStore('config', {
           this.eventsData[gender] = events.slice().sort((a, b) => a.id - b.id);
 
           // Build columns for this gender
-          const eventColumns = this.eventsData[gender].map(event => {
-            const eventName = event.event_name
-
-            let status = event.status
-
-            return {
-              headerName: eventMap[eventName] || eventName,
-              field: event.id,
-              meta: {
-                fullHeaderName: eventName,
-                isEventColumn: true,
-                status
-              }
-            }
-          })
-
-          this.columnDefs[gender] = [...defaultColumns, ...eventColumns];
+          this.buildColumnDefs(gender);
         }
       } catch (err) {
         console.error('Failed to fetch events:', err);
@@ -170,6 +169,84 @@ export const useConfigStore = defineStore('config', {
         this.loadingEvents = false;
       }
     },
+    buildColumnDefs(gender) {
+      // --- Default columns (common to all genders) ---
+      const defaultColumns = [
+        { headerName: 'Rk', field: 'rank', sticky: true, meta: { fullHeaderName: 'Rank' } },
+        { headerName: 'Team', field: 'logo', sticky: true, sortable: false, meta: { fullHeaderName: 'Team' } },
+        { headerName: 'Pts', field: 'total_pts', sticky: true, meta: { fullHeaderName: 'Total Points' }},
+      ];
+
+      const eventColumns = this.eventsData[gender].map(event => {
+        const eventName = event.event_name
+
+        let status = event.status
+
+        return {
+          headerName: eventMap[eventName] || eventName,
+          field: event.id,
+          meta: {
+            fullHeaderName: eventName,
+            isEventColumn: true,
+            status
+          }
+        }
+      })
+
+      this.columnDefs[gender] = [...defaultColumns, ...eventColumns];
+    },
+    // ---------------------------
+    // Apply a versioned event change from the SSE stream
+    // ---------------------------
+    applyEventChange(change) {
+      if (change.meet_document_id !== this.meetDocumentId) return;
+
+      const events = this.eventsData[change.gender];
+      if (!events) return;
+
+      const index = events.findIndex(event => event.id === change.event_id);
+      const currentVersion = index === -1 ? 0 : (events[index].version ?? 0);
+
+      if (change.version <= currentVersion) return; // already applied
+      if (index === -1 || change.version !== currentVersion + 1) {
+        // Missed a version (or a new event): reread just this event
+        this.resyncEvent(change.gender, change.event_id);
+        return;
+      }
+
+      // Replace the event object so everything derived from it recomputes
+      const event = structuredClone(toRaw(events[index]));
+      for (const [path, value] of Object.entries(change.updates)) {
+        const keys = splitFieldPath(path);
+        const leaf = keys.pop();
+        let target = event;
+        for (const key of keys) {
+          if (typeof target[key] !== 'object' || target[key] === null) target[key] = {};
+          target = target[key];
+        }
+        target[leaf] = value;
+      }
+      event.version = change.version;
+
+      events.splice(index, 1, event);
+      this.buildColumnDefs(change.gender);
+    },
+    async resyncEvent(gender, eventId) {
+      const meet = this.meets.find(m => m.path === `meets/${this.meetDocumentId}`);
+      if (!meet) return;
+
+      try {
+        const snapshot = await getDoc(doc(db, 'meets', meet.year, meet.season, meet.id, gender, eventId));
+        const events = this.eventsData[gender].filter(event => event.id !== eventId);
+        if (snapshot.exists()) {
+          events.push({ id: snapshot.id, ...snapshot.data() });
+        }
+        this.eventsData[gender] = events.sort((a, b) => a.id - b.id);
+        this.buildColumnDefs(gender);
+      } catch (err) {
+        console.error('Failed to resync event:', err);
+      }
+    },
     async updateEventDoc(eventId, updates) {
       try {
         const response = await fetch(`${import.meta.env.VITE_API_HOST}/update_event`, {
@@ -1,29 +1,79 @@
-import os
+import io
+import time
+import uuid
 import asyncio
-import json
+import zipfile
 import configparser
-from tempfile import NamedTemporaryFile
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-from typing import Dict, Any
-from fastapi import Request, FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, List
+from collections import OrderedDict
+from fastapi import Request, FastAPI, HTTPException, UploadFile, File, Header
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from google.api_core.exceptions import NotFound
 from processors.startlist import process_merged_start_list
-from processors.event import process_event
-from processors.gcs import slugify, get_gcs_client, get_gcs_client, get_firestore_client
+from processors.event import parse_event_csv, process_event_rows, prepare_event_update, write_events
+from processors.gcs import slugify, close_clients, PartialWriteError
+from processors.storage import get_database, get_bucket, start_sync, stop_sync, storage_stats, BUCKET_NAME
+from processors.executor import run_blocking, shutdown_executor
+from processors.deletion import delete_meet_data, new_deletion_progress
+from processors.cache import document_cache, standings_cache
+from processors.scoring import get_meet_standings
+from processors.simulation import get_meet_simulation, recently_requested, SIMULATION_RUNS
+from processors.broadcast import broadcaster
+from processors.bus import create_bus
+from processors.dedupe import upload_fingerprints, content_hash
+from processors.profiling import profiler, background_context
+from processors.lazy import lazy_module
+from processors.metrics import (
+    phase, start_request_timing, server_timing_header, observe_upload, render_metrics, REQUEST_SECONDS,
+)
+
+# Only needed when a cloud call fails; importing it pulls in gRPC
+exceptions = lazy_module("google.api_core.exceptions")
+
+# Max event CSVs (after unzipping) accepted by one /upload_events request
+MAX_BULK_EVENT_FILES = 200
+# Largest event CSV accepted inside a zip, and total unzipped bytes per request (checked before decompressing)
+MAX_ZIPPED_EVENT_FILE_BYTES = 10 * 1024 * 1024
+MAX_BULK_UNZIPPED_BYTES = 100 * 1024 * 1024
+
+# Background meet deletions, most recent last (job_id -> progress)
+MAX_DELETION_JOBS = 50
+deletion_jobs = OrderedDict()
+background_tasks = set()
 
-# GCS & Firestore clients
-BUCKET_NAME = "projections-data"
+def start_background_task(coroutine) -> asyncio.Task:
+    """Run coroutine past the response (kept referenced until done, outside any request profile)."""
+    task = asyncio.create_task(coroutine, context=background_context())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
 
 # -----------------------------
 # FastAPI app
 # -----------------------------
 origins = ["http://localhost:5173",  "https://flash-results-projections.web.app"]
 
+# Carries stream messages to the SSE clients of every instance (NOTIFY_BACKEND)
+bus = create_bus(broadcaster)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # GCS & Firestore clients are created lazily on first use and shared across requests
+    start_sync()
+    await bus.start()
+    yield
+    await bus.stop()
+    # Running jobs may still write to the local store, so it closes after them
+    shutdown_executor()
+    stop_sync()
+    close_clients()
+
 app = FastAPI(
     title="Track Meet Processing API",
-    version="1.1"
+    version="1.1",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -34,6 +84,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """
+    Time every request: per-phase Server-Timing header (see processors.metrics.phase)
+    and the request duration histogram on /metrics.
+    """
+    phases = start_request_timing()
+    started = time.perf_counter()
+    response = None
+    try:
+        response = await call_next(request)
+    finally:
+        # A request whose handler raised is observed too (as the 500 it becomes)
+        elapsed = time.perf_counter() - started
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            elapsed,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=response.status_code if response is not None else 500,
+        )
+    response.headers["Server-Timing"] = server_timing_header(phases, elapsed)
+    return response
+
+@app.middleware("http")
+async def profile_uploads(request: Request, call_next):
+    """
+    Profile an upload request when asked to (X-Profile header or the /profiling
+    toggle, see processors.profiling). The profile is written once the
+    response is ready and named in the X-Profile-Id header.
+    """
+    profile = profiler.begin(request.url.path, request.headers.get("X-Profile"))
+    if profile is None:
+        return await call_next(request)
+
+    token = profiler.activate(profile)
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.deactivate(token)
+        # A profile that can't be written must not fail (or mask the error of) the request
+        try:
+            paths = await run_blocking(profiler.finish, profile, timeout=None)
+        except Exception as e:
+            print(f"⚠️ Failed to write profile {profile.name}: {e}")
+            paths = []
+
+    if paths:
+        response.headers["X-Profile-Id"] = profile.name
+    return response
+
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     return JSONResponse(
@@ -41,6 +142,13 @@ async def value_error_handler(request: Request, exc: ValueError):
         content={"detail": str(exc)},
     )
 
+@app.exception_handler(TimeoutError)
+async def timeout_error_handler(request: Request, exc: TimeoutError):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "Request took too long to process. Please try again."},
+    )
+
 # -----------------------------
 # Endpoints
 # -----------------------------
@@ -60,102 +168,105 @@ async def upload_merged_start_list(
     if not ini_file.filename.endswith(".ini"):
         raise HTTPException(status_code=400, detail="ini_file must be an INI")
 
-    # --- Save files temporarily ---
-    with NamedTemporaryFile(delete=False, suffix=".csv") as tmp_csv, \
-         NamedTemporaryFile(delete=False, suffix=".ini") as tmp_ini:
-        tmp_csv.write(await csv_file.read())
-        tmp_ini.write(await ini_file.read())
-
-        tmp_csv_path = tmp_csv.name
-        tmp_ini_path = tmp_ini.name
+    # --- Read uploads into memory ---
+    csv_bytes = await csv_file.read()
+    ini_bytes = await ini_file.read()
+    observe_upload("upload_merged_start_list", len(csv_bytes) + len(ini_bytes))
+
+    # --- Parse INI ---
+    config = configparser.ConfigParser()
+    config.read_string(ini_bytes.decode("utf-8"))
+
+    # --- Extract required fields ---
+    required_fields = {
+        "meet_name": ("index", "meet"),
+        "meet_date": ("index", "meetdate"),
+        "meet_location": ("index", "meetlocation"),
+        "meet_venue": ("index", "meetvenue"),
+        "meet_season": ("switch", "outdoor")
+    }
+
+    metadata = {}
+    missing_fields = []
+
+    for key, (section, option) in required_fields.items():
+        value = config.get(section, option, fallback=None)
+        if not value:
+            missing_fields.append(f"'{option}' in [{section}]")
+        metadata[key] = value
+
+    if missing_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"INI file missing required fields: {', '.join(missing_fields)}"
+        )
 
+    # --- Extract year from meet_date ---
     try:
-        # --- Parse INI ---
-        config = configparser.ConfigParser()
-        config.read(tmp_ini_path)
-
-        # --- Extract required fields ---
-        required_fields = {
-            "meet_name": ("index", "meet"),
-            "meet_date": ("index", "meetdate"),
-            "meet_location": ("index", "meetlocation"),
-            "meet_venue": ("index", "meetvenue"),
-            "meet_season": ("switch", "outdoor")
-        }
-
-        metadata = {}
-        missing_fields = []
-
-        for key, (section, option) in required_fields.items():
-            value = config.get(section, option, fallback=None)
-            if not value:
-                missing_fields.append(f"'{option}' in [{section}]")
-            metadata[key] = value
-
-        if missing_fields:
-            raise HTTPException(
-                status_code=400,
-                detail=f"INI file missing required fields: {', '.join(missing_fields)}"
-            )
-
-        # --- Extract year from meet_date ---
-        try:
-            metadata["meet_year"] = int(metadata["meet_date"].split(",")[-1].strip())
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot extract year from meetdate: {metadata['meet_date']}"
-            )
-        
-        # --- Map meet_season to indoor/outdoor ---
-        season_mapping = {"on": "outdoor", "off": "indoor"}
-        mapped_season = season_mapping.get(metadata.get("meet_season", "").lower())
-
-        if mapped_season is None:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid meet_season value: {metadata.get('meet_season')}"
-            )
-
-        # Overwrite meet_season with mapped value
-        metadata["meet_season"] = mapped_season
+        metadata["meet_year"] = int(metadata["meet_date"].split(",")[-1].strip())
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot extract year from meetdate: {metadata['meet_date']}"
+        )
 
-        metadata["meet_id"] = slugify(metadata["meet_name"])
+    # --- Map meet_season to indoor/outdoor ---
+    season_mapping = {"on": "outdoor", "off": "indoor"}
+    mapped_season = season_mapping.get(metadata.get("meet_season", "").lower())
 
-        # --- Process CSV ---
-        process_merged_start_list(
-            file_path=tmp_csv_path,
-            meet_year=metadata["meet_year"],
-            meet_id=metadata["meet_id"],
-            meet_name=metadata["meet_name"],
-            meet_season=metadata["meet_season"],
-            meet_date=metadata["meet_date"],
-            meet_location=metadata["meet_location"]
+    if mapped_season is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid meet_season value: {metadata.get('meet_season')}"
         )
 
-        # --- Upload CSV to GCS ---
-        raw_bucket = get_gcs_client().bucket(BUCKET_NAME)
+    # Overwrite meet_season with mapped value
+    metadata["meet_season"] = mapped_season
 
-        # CSV blob
-        csv_blob_name = f"merged-start-lists/{metadata['meet_year']}/{metadata['meet_season']}/{metadata['meet_id']}/start_list.csv"
-        raw_bucket.blob(csv_blob_name).upload_from_filename(tmp_csv_path)
+    metadata["meet_id"] = slugify(metadata["meet_name"])
 
-        # INI blob
-        ini_blob_name = f"merged-start-lists/{metadata['meet_year']}/{metadata['meet_season']}/{metadata['meet_id']}/config.ini"
-        raw_bucket.blob(ini_blob_name).upload_from_filename(tmp_ini_path)
+    blob_prefix = f"merged-start-lists/{metadata['meet_year']}/{metadata['meet_season']}/{metadata['meet_id']}"
+    csv_blob_name = f"{blob_prefix}/start_list.csv"
+    ini_blob_name = f"{blob_prefix}/config.ini"
 
-        return JSONResponse(
-            content={
-                "message": f"Files '{csv_file.filename}' and '{ini_file.filename}' uploaded and processed successfully.",
-                "merged_start_list_file": f"gs://{BUCKET_NAME}/{csv_blob_name}",
-                "ini_file": f"gs://{BUCKET_NAME}/{ini_blob_name}",
-                **metadata,
-            }
+    # --- Process CSV and archive both files to GCS concurrently ---
+    try:
+        await process_with_raw_archive(
+            run_blocking(
+                process_merged_start_list,
+                source=csv_bytes,
+                meet_year=metadata["meet_year"],
+                meet_id=metadata["meet_id"],
+                meet_name=metadata["meet_name"],
+                meet_season=metadata["meet_season"],
+                meet_date=metadata["meet_date"],
+                meet_location=metadata["meet_location"]
+            ),
+            {csv_blob_name: (csv_bytes, "text/csv"), ini_blob_name: (ini_bytes, "text/plain")}
+        )
+    except PartialWriteError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Start list was only partly written, upload it again to finish: {e}",
         )
-
     finally:
-        os.remove(tmp_csv_path)
-        os.remove(tmp_ini_path)
+        # Reseeded events (even some of them) no longer hold earlier results,
+        # so re-uploads must be processed
+        upload_fingerprints.forget_meet(metadata["meet_year"], metadata["meet_season"], metadata["meet_id"])
+    # Every event of the meet was rewritten: connected clients refetch it
+    await notify_clients({
+        "type": "resync",
+        "meet_document_id": f"{metadata['meet_year']}/{metadata['meet_season']}/{metadata['meet_id']}",
+    })
+
+    return JSONResponse(
+        content={
+            "message": f"Files '{csv_file.filename}' and '{ini_file.filename}' uploaded and processed successfully.",
+            "merged_start_list_file": f"gs://{BUCKET_NAME}/{csv_blob_name}",
+            "ini_file": f"gs://{BUCKET_NAME}/{ini_blob_name}",
+            **metadata,
+        }
+    )
 
 @app.post("/upload_event")
 async def upload_event(file: UploadFile = File(...)):
@@ -169,42 +280,297 @@ async def upload_event(file: UploadFile = File(...)):
     if "splits" in file.filename.lower():
         raise ValueError('filename cannot contain "splits"')
     
-    # Save file temporarily
-    with NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
-        tmp_file.write(await file.read())
-        tmp_file_path = tmp_file.name
-    
-    try:
-        # process_event may raise ValueError internally (e.g., invalid status)
-        metadata = process_event(file_path=tmp_file_path)
-
-        # Upload CSV to GCS
-        raw_blob_name = (
-            f"events/{metadata.get('meet_year')}/{metadata.get('meet_season')}/"
-            f"{metadata.get('meet_id')}/{file.filename}"
-        )
-        raw_bucket = get_gcs_client().bucket(BUCKET_NAME)
-        raw_bucket.blob(raw_blob_name).upload_from_filename(tmp_file_path)
-        print(f"✅ Uploaded raw event file to gs://{BUCKET_NAME}/{raw_blob_name}")
+    data = await file.read()
+    observe_upload("upload_event", len(data))
+
+    # Identical re-push of a file we just processed: skip everything
+    with phase("dedupe"):
+        digest = content_hash(data)
+        metadata = upload_fingerprints.find(digest)
+    if metadata is not None:
+        return duplicate_upload_response(file.filename, metadata)
+
+    # Metadata (first row) gives the GCS path, so parse before processing
+    with phase("csv_parse"):
+        metadata, raw_rows = await run_blocking(parse_event_csv, data)
+
+    with phase("dedupe"):
+        duplicate = await run_blocking(upload_fingerprints.matches_stored, metadata, digest)
+    if duplicate:
+        return duplicate_upload_response(file.filename, metadata)
+
+    raw_blob_name = (
+        f"events/{metadata.get('meet_year')}/{metadata.get('meet_season')}/"
+        f"{metadata.get('meet_id')}/{file.filename}"
+    )
 
-    finally:
-        os.remove(tmp_file_path)
+    # process_event_rows may raise ValueError internally (e.g., invalid status)
+    metadata, changes = await process_with_raw_archive(
+        run_blocking(process_event_rows, metadata, raw_rows, digest),
+        {raw_blob_name: (data, "text/csv")}
+    )
+    upload_fingerprints.remember(metadata, digest)
 
-    # Notify any subscribed clients
-    await notify_clients({
-        "type": "event_uploaded",
-        "meet_document_id": f"{metadata.get('meet_year')}/{metadata.get('meet_season')}/{metadata.get('meet_id')}",
-        **metadata,
-    })
+    # Send subscribers the change itself so they don't refetch the meet
+    await notify_event_changes(changes)
 
     return JSONResponse(
         content={
             "message": f"File '{file.filename}' uploaded and processed successfully.",
             "event_file": f"gs://{BUCKET_NAME}/{raw_blob_name}",
+            **metadata,
+            **describe_change(changes[0] if changes else None),
+        }
+    )
+
+def describe_change(change: dict = None):
+    """Response fields saying what an event upload actually changed."""
+    if change is None:
+        return {"unchanged": True}
+    return {
+        "unchanged": False,
+        "version": change["version"],
+        "changed_fields": list(change["updates"]),
+        "results_diff": change["results_diff"],
+    }
+
+def duplicate_upload_response(filename: str, metadata: dict):
+    """Cheap reply for a file identical to the last one processed for its event round."""
+    return JSONResponse(
+        content={
+            "message": f"File '{filename}' is unchanged since the last upload; skipped.",
+            "duplicate": True,
             **metadata
         }
     )
 
+@app.post("/upload_events")
+async def upload_events(files: List[UploadFile] = File(...)):
+    """
+    Upload many event CSV files (or zip archives of event CSVs) at once.
+    Files are parsed in parallel, Firestore writes are committed per meet,
+    and subscribers get one message per meet with every versioned change. Returns a result per file;
+    one bad file does not fail the others.
+    """
+    results = []
+    entries = []
+    unzipped_bytes = 0
+
+    for upload in files:
+        data = await upload.read()
+        observe_upload("upload_events", len(data))
+        if upload.filename.lower().endswith(".zip"):
+            try:
+                extracted = extract_event_csvs(
+                    upload.filename, data,
+                    max_files=MAX_BULK_EVENT_FILES - len(entries),
+                    max_bytes=MAX_BULK_UNZIPPED_BYTES - unzipped_bytes,
+                )
+                entries.extend(extracted)
+                unzipped_bytes += sum(len(content) for _, _, content in extracted)
+                continue
+            except zipfile.BadZipFile:
+                pass
+        entries.append((upload.filename, upload.filename, data))
+
+    if len(entries) > MAX_BULK_EVENT_FILES:
+        raise ValueError(f"Too many event files: {len(entries)} (max {MAX_BULK_EVENT_FILES})")
+
+    async def prepare(name: str, data: bytes):
+        if name.lower().endswith(".zip"):
+            raise ValueError("file is not a valid zip archive")
+        if not name.endswith(".csv"):
+            raise ValueError("file must be a CSV")
+        if "splits" in name.lower():
+            raise ValueError('filename cannot contain "splits"')
+
+        with phase("dedupe"):
+            digest = content_hash(data)
+            metadata = upload_fingerprints.find(digest)
+        if metadata is not None:
+            return metadata, digest, None
+
+        with phase("csv_parse"):
+            metadata, raw_rows = await run_blocking(parse_event_csv, data)
+        with phase("dedupe"):
+            duplicate = await run_blocking(upload_fingerprints.matches_stored, metadata, digest)
+        if duplicate:
+            return metadata, digest, None
+
+        event_ref, update_data = await run_blocking(prepare_event_update, metadata, raw_rows, digest)
+        return metadata, digest, (event_ref, update_data)
+
+    # --- Parse and clean every file in parallel ---
+    prepared = await asyncio.gather(
+        *(prepare(filename, data) for _, filename, data in entries),
+        return_exceptions=True
+    )
+
+    # --- Group writes per meet ---
+    meets = {}
+    for (display_name, filename, data), outcome in zip(entries, prepared):
+        result = {"file": display_name}
+        results.append(result)
+
+        if isinstance(outcome, Exception):
+            result.update({"success": False, "error": str(outcome)})
+            continue
+
+        metadata, digest, write = outcome
+        if write is None:
+            # Identical re-upload: nothing to write, archive or announce
+            result.update({"success": True, "duplicate": True, **metadata})
+            continue
+
+        meet_document_id = f"{metadata.get('meet_year')}/{metadata.get('meet_season')}/{metadata.get('meet_id')}"
+        raw_blob_name = f"events/{meet_document_id}/{filename}"
+        result.update({"success": True, "event_file": f"gs://{BUCKET_NAME}/{raw_blob_name}", **metadata})
+
+        meet = meets.setdefault(meet_document_id, {"writes": [], "raw_files": {}, "results": [], "fingerprints": []})
+        meet["writes"].append(write)
+        meet["raw_files"][raw_blob_name] = (data, "text/csv")
+        meet["results"].append(result)
+        meet["fingerprints"].append((metadata, digest))
+
+    # --- One batched commit per meet, archived to GCS concurrently ---
+    db = get_database()
+    committed = await asyncio.gather(
+        *(
+            process_with_raw_archive(
+                run_blocking(write_events, db, meet["writes"]),
+                meet["raw_files"]
+            )
+            for meet in meets.values()
+        ),
+        return_exceptions=True
+    )
+
+    changes = []
+    for meet, outcome in zip(meets.values(), committed):
+        if isinstance(outcome, Exception):
+            for result in meet["results"]:
+                result.update({"success": False, "error": str(outcome)})
+                result.pop("event_file", None)
+        else:
+            changes.extend(outcome)
+            for metadata, digest in meet["fingerprints"]:
+                upload_fingerprints.remember(metadata, digest)
+            by_event = {(c["gender"], c["event_id"]): c for c in outcome}
+            for result in meet["results"]:
+                result.update(describe_change(by_event.get((result.get("event_gender"), result.get("event_num")))))
+
+    await notify_event_changes(changes)
+
+    return JSONResponse(
+        content={
+            "message": f"{sum(r['success'] for r in results)} of {len(results)} event files processed successfully.",
+            "results": results,
+        }
+    )
+
+def extract_event_csvs(zip_name: str, data: bytes, max_files: int = MAX_BULK_EVENT_FILES,
+                       max_bytes: int = MAX_BULK_UNZIPPED_BYTES):
+    """
+    Returns (display_name, filename, bytes) for each CSV inside a zip archive.
+
+    Sizes are checked from the archive's directory before anything is
+    decompressed, so a small zip can't expand into gigabytes of memory.
+
+    Raises:
+        ValueError: if the archive holds more than max_files CSVs, a CSV larger
+            than MAX_ZIPPED_EVENT_FILE_BYTES, or more than max_bytes in total.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = []
+        for info in archive.infolist():
+            filename = info.filename.rsplit("/", 1)[-1]
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or not filename.endswith(".csv"):
+                continue
+            members.append((info, filename))
+
+        if len(members) > max_files:
+            raise ValueError(f"Too many event files in {zip_name} (max {MAX_BULK_EVENT_FILES} per request)")
+
+        total = 0
+        for info, _ in members:
+            if info.file_size > MAX_ZIPPED_EVENT_FILE_BYTES:
+                raise ValueError(
+                    f"{zip_name}/{info.filename} is too large: {info.file_size} bytes "
+                    f"(max {MAX_ZIPPED_EVENT_FILE_BYTES})"
+                )
+            total += info.file_size
+            if total > max_bytes:
+                raise ValueError(f"Zip contents too large (max {MAX_BULK_UNZIPPED_BYTES} bytes unzipped per request)")
+
+        # read() stops at the declared file_size, so a lying directory fails the CRC check instead
+        return [(f"{zip_name}/{info.filename}", filename, archive.read(info)) for info, filename in members]
+
+async def process_with_raw_archive(processing, raw_files: dict):
+    """
+    Await a processing coroutine while the raw upload bytes are archived to GCS
+    concurrently. Files are uploaded under staging names and only replace the
+    archived copies once processing succeeded, so a failed re-upload leaves
+    the previous archive intact. Archiving failures are logged, never raised:
+    they must not fail an upload whose data was already committed.
+
+    Args:
+        processing: Awaitable doing the Firestore processing.
+        raw_files: {blob_name: (data, content_type)} to upload from memory.
+    """
+    bucket = get_bucket()
+    staging_suffix = f".staging-{uuid.uuid4().hex[:12]}"
+    uploads = [
+        run_blocking(_upload_blob, bucket, f"{blob_name}{staging_suffix}", data, content_type)
+        for blob_name, (data, content_type) in raw_files.items()
+    ]
+
+    result, *upload_results = await asyncio.gather(processing, *uploads, return_exceptions=True)
+
+    staged = {}
+    for blob_name, upload_result in zip(raw_files, upload_results):
+        if isinstance(upload_result, BaseException):
+            print(f"⚠️ Failed to archive '{blob_name}': {upload_result}")
+        else:
+            staged[blob_name] = upload_result
+
+    if isinstance(result, BaseException):
+        if staged:
+            try:
+                await run_blocking(_delete_blobs, bucket, [blob.name for blob in staged.values()])
+            except Exception as e:
+                print(f"⚠️ Failed to remove staged archive files: {e}")
+        raise result
+
+    if staged:
+        try:
+            await run_blocking(_promote_blobs, bucket, staged)
+        except Exception as e:
+            print(f"⚠️ Failed to archive {', '.join(staged)}: {e}")
+
+    return result
+
+def _upload_blob(bucket, blob_name, data, content_type):
+    with phase("gcs_upload"):
+        blob = bucket.blob(blob_name)
+        blob.upload_from_string(data, content_type=content_type)
+        return blob
+
+def _promote_blobs(bucket, staged: dict):
+    """Move staged blobs ({final name: blob}) to their final names."""
+    for blob_name, blob in staged.items():
+        try:
+            bucket.rename_blob(blob, blob_name)
+            print(f"✅ Archived raw file to gs://{BUCKET_NAME}/{blob_name}")
+        except Exception as e:
+            print(f"⚠️ Failed to archive '{blob_name}': {e}")
+
+def _delete_blobs(bucket, blob_names):
+    for blob_name in blob_names:
+        try:
+            bucket.blob(blob_name).delete()
+        except exceptions.NotFound:
+            continue
+
 class UpdateEventRequest(BaseModel):
     meetDocumentId: str
     gender: str
@@ -216,7 +582,7 @@ async def update_event(req: UpdateEventRequest):
     """
     Update any fields on a specific event document within a meet and gender.
     """
-    db = get_firestore_client()
+    db = get_database()
     try:
         doc_ref = (
             db.collection("meets")
@@ -225,97 +591,218 @@ async def update_event(req: UpdateEventRequest):
             .document(req.eventId)
         )
 
-        doc_ref.update(req.updates)
-
-        await notify_clients({
-          "type": "event_updated",
-          "meet_document_id": req.meetDocumentId
-        })
+        changes = await run_blocking(write_events, db, [(doc_ref, req.updates)], field_updates=True)
+        await notify_event_changes(changes)
 
         return {"success": True, "updatedFields": req.updates}
 
+    except (TimeoutError, ValueError):
+        raise  # 504 / 400 through the exception handlers
+    except exceptions.NotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/delete_meet")
-async def delete_meet(database_id: str):
+async def delete_meet(database_id: str, background: bool = False):
     """
     Delete all files in GCS and Firestore for a given meet document.
     The meet document is assumed to be at 'meets/{database_id}'.
+    With background=true the deletion runs as a job; poll
+    /delete_meet/jobs/{job_id} for progress.
     """
     document_id = database_id.strip()
     if not document_id:
         raise HTTPException(status_code=400, detail="document_id must not be empty")
 
-    gcs_client = get_gcs_client()
-    db = get_firestore_client()
-    bucket = gcs_client.bucket(BUCKET_NAME)
+    db = get_database()
+    bucket = get_bucket()
 
     # Reference to the meet document
     meet_ref = db.collection("meets").document(document_id)
 
-    # Check if meet exists
-    if not meet_ref.get().exists:
+    # Check if meet exists (the same read gives year/season/id for GCS paths)
+    meet_snapshot = await run_blocking(meet_ref.get)
+    if not meet_snapshot.exists:
         return JSONResponse(
             status_code=404,
             content={"message": f"Meet '{document_id}' does not exist."}
         )
 
-    # Fetch the meet data for year (used in GCS paths)
-    meet_doc = meet_ref.get().to_dict()
-    meet_year = meet_doc.get("year", "unknown")
-    meet_season = meet_doc.get("season", "unknown")
-    meet_id = meet_doc.get("id", "unknown")
+    meet_doc = meet_snapshot.to_dict()
+    progress = new_deletion_progress(document_id)
+    upload_fingerprints.forget_meet(meet_doc.get("year"), meet_doc.get("season"), meet_doc.get("id"))
 
-    # Delete GCS files
-    prefixes = [
-        f"merged-start-lists/{meet_year}/{meet_season}/{meet_id}",
-        f"events/{meet_year}/{meet_season}/{meet_id}/",
-    ]
-    for prefix in prefixes:
-        blobs = bucket.list_blobs(prefix=prefix)
-        for blob in blobs:
-            try:
-                blob.delete()
-            except NotFound:
-                continue
+    if not background:
+        await run_blocking(delete_meet_data, db, bucket, meet_ref, meet_doc, progress)
+        return JSONResponse(
+            content={"message": f"Meet '{document_id}' deleted successfully.", **progress}
+        )
 
-    # Delete Firestore subcollections recursively
-    def delete_subcollections(doc_ref):
-        for coll in doc_ref.collections():
-            for doc in coll.stream():
-                delete_subcollections(doc.reference)
-                doc.reference.delete()
+    job_id = uuid.uuid4().hex
+    deletion_jobs[job_id] = progress
+    while len(deletion_jobs) > MAX_DELETION_JOBS:
+        deletion_jobs.popitem(last=False)
 
-    delete_subcollections(meet_ref)
-    meet_ref.delete()
+    task = start_background_task(
+        run_blocking(delete_meet_data, db, bucket, meet_ref, meet_doc, progress, timeout=None)
+    )
+    task.add_done_callback(lambda task: record_deletion_outcome(task, progress))
 
     return JSONResponse(
-        content={"message": f"Meet '{document_id}' deleted successfully."}
+        status_code=202,
+        content={
+            "message": f"Deletion of meet '{document_id}' started.",
+            "job_id": job_id,
+            "status_url": f"/delete_meet/jobs/{job_id}",
+        }
     )
 
-subscribers = []
+def record_deletion_outcome(task: asyncio.Task, progress: dict):
+    """
+    Done-callback of a background deletion: retrieves its exception (so it is
+    logged here, not as "never retrieved") and marks the job failed, including
+    when it died before delete_meet_data could (e.g. cancelled at shutdown).
+    """
+    error = "cancelled" if task.cancelled() else task.exception()
+    if error is None:
+        return
+    print(f"⚠️ Background deletion of meet '{progress['meet_document_id']}' failed: {error}")
+    progress["status"] = "failed"
+    progress["error"] = progress.get("error") or str(error)
+
+@app.get("/delete_meet/jobs/{job_id}")
+async def delete_meet_job(job_id: str):
+    """
+    Progress of a background meet deletion started with delete_meet?background=true.
+    """
+    progress = deletion_jobs.get(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Deletion job '{job_id}' not found")
+    return {"job_id": job_id, **progress}
+
+@app.get("/meets/{meet_year}/{meet_season}/{meet_id}/standings")
+async def meet_standings(meet_year: str, meet_season: str, meet_id: str):
+    """
+    Projected/scored team standings for a meet, keyed by gender.
+    Rows match the frontend's team table (rank, team, total_pts, per-event points).
+    """
+    standings = await run_blocking(get_meet_standings, meet_year, meet_season, meet_id)
+    if standings is None:
+        raise HTTPException(status_code=404, detail=f"Meet '{meet_year}/{meet_season}/{meet_id}' does not exist.")
+    return {"meet_document_id": f"{meet_year}/{meet_season}/{meet_id}", "standings": standings}
+
+@app.get("/meets/{meet_year}/{meet_season}/{meet_id}/simulation")
+async def meet_simulation(meet_year: str, meet_season: str, meet_id: str, runs: int = SIMULATION_RUNS, seed: int = None):
+    """
+    Monte Carlo outcome of a meet, keyed by gender: per team win probability,
+    mean points and a 90% points interval. Scored events count as scored;
+    the rest are simulated from each athlete's SB/PB.
+    """
+    simulation = await run_blocking(get_meet_simulation, meet_year, meet_season, meet_id, runs, seed)
+    if simulation is None:
+        raise HTTPException(status_code=404, detail=f"Meet '{meet_year}/{meet_season}/{meet_id}' does not exist.")
+    return {"meet_document_id": f"{meet_year}/{meet_season}/{meet_id}", **simulation}
+
+class ProfilingRequest(BaseModel):
+    sample_rate: float
+    requests: int
+
+@app.get("/profiling", include_in_schema=False)
+async def profiling_status(x_profile: str = Header(None)):
+    """Profiler toggle state and counters. Needs the X-Profile token."""
+    if not profiler.authorized(x_profile):
+        raise HTTPException(status_code=403, detail="Profiling is disabled or the X-Profile token is wrong")
+    return profiler.status()
+
+@app.post("/profiling", include_in_schema=False)
+async def configure_profiling(req: ProfilingRequest, x_profile: str = Header(None)):
+    """
+    Admin toggle: profile sample_rate (0-1) of upload requests until `requests`
+    profiles were taken ({"sample_rate": 0, "requests": 0} turns it off).
+    Needs the X-Profile token.
+    """
+    if not profiler.authorized(x_profile):
+        raise HTTPException(status_code=403, detail="Profiling is disabled or the X-Profile token is wrong")
+    profiler.configure(req.sample_rate, req.requests)
+    return profiler.status()
+
+def instance_stats() -> dict:
+    return {
+        "document_cache": document_cache.stats(),
+        "standings_cache": standings_cache.stats(),
+        "stream": broadcaster.stats(),
+        "bus": bus.stats(),
+        "upload_dedupe": upload_fingerprints.stats(),
+        "storage": storage_stats(),
+    }
+
+@app.get("/stats", include_in_schema=False)
+async def stats():
+    """In-process cache, stream and storage sync counters for this instance."""
+    return instance_stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: request/phase/upload histograms and the /stats counters and gauges."""
+    return PlainTextResponse(render_metrics(instance_stats()), media_type="text/plain; version=0.0.4")
 
 async def notify_clients(payload: dict):
-    """Send a message to all active subscribers."""
-    for queue in subscribers:
-        await queue.put(payload)
+    """
+    Publish a message to the subscribers of every instance watching its meet
+    (payload["meet_document_id"]). Never waits on slow clients.
+    """
+    await bus.publish(payload.get("meet_document_id"), payload)
 
-@app.get("/stream", include_in_schema=False)
-async def stream():
-    """SSE endpoint that streams JSON updates."""
-    queue = asyncio.Queue()
-    subscribers.append(queue)
-    print("🔌 Client connected")
+async def notify_event_changes(changes: list):
+    """
+    Publish versioned event changes (see write_events). Clients apply the
+    field updates to their copy of the event and resync it on a version gap.
+
+    One message per meet: a single change goes out as "event_changed", several
+    (a bulk upload) as one "events_changed" carrying them all in order.
+    """
+    by_meet = {}
+    for change in changes:
+        by_meet.setdefault(change["meet_document_id"], []).append(change)
+
+    with phase("notify"):
+        for meet_document_id, meet_changes in by_meet.items():
+            if len(meet_changes) == 1:
+                await notify_clients({"type": "event_changed", **meet_changes[0]})
+            else:
+                await notify_clients({
+                    "type": "events_changed",
+                    "meet_document_id": meet_document_id,
+                    "changes": meet_changes,
+                })
+
+    # Re-simulate meets people are following so the next request is instant
+    for meet_document_id in {change["meet_document_id"] for change in changes}:
+        if recently_requested(meet_document_id):
+            start_background_task(
+                run_blocking(get_meet_simulation, *meet_document_id.split("/"), refresh=True, timeout=None)
+            )
 
+@app.get("/stream", include_in_schema=False)
+async def stream(request: Request, meet_document_id: str = None):
+    """
+    SSE endpoint that streams JSON updates, for one meet
+    (e.g. ?meet_document_id=2025/indoor/some-meet) or for every meet.
+    """
     async def event_generator():
+        # Subscribed once the body is iterated: a response that is never sent leaks nothing
+        subscriber = broadcaster.subscribe(meet_document_id)
+        print("🔌 Client connected")
         try:
-            while True:
-                data = await queue.get()
-                yield f"data: {json.dumps(data)}\n\n"
-        except asyncio.CancelledError:
+            async for chunk in broadcaster.stream(subscriber, request.is_disconnected):
+                yield chunk
+        finally:
+            broadcaster.unsubscribe(subscriber)
             print("❌ Client disconnected")
-            subscribers.remove(queue)
-            raise
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
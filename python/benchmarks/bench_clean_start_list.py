@@ -0,0 +1,43 @@
+"""
+Benchmark parse_start_list + clean_start_list from a dual meet to a championship.
+
+Run from the python/ directory:
+    python -m benchmarks.bench_clean_start_list
+"""
+import os
+import tempfile
+import time
+from processors.startlist import parse_start_list, clean_start_list
+from benchmarks.synthetic import generate_start_list
+
+SIZES = [200, 1000, 2500, 5000]
+REPEATS = 5
+
+def time_call(func, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    print(f"{'entries':>8} {'events':>7} {'parse (ms)':>11} {'clean (ms)':>11} {'us/entry':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            file_name = f"start_list_{size}.csv"
+            with open(os.path.join(tmp_dir, file_name), "w", encoding="utf-8") as f:
+                f.write(generate_start_list(size))
+
+            df = parse_start_list(tmp_dir, file_name)
+            n_events = df[["Gender", "Event_num"]].drop_duplicates().shape[0]
+
+            parse_s = time_call(parse_start_list, tmp_dir, file_name)
+            clean_s = time_call(clean_start_list, df)
+            print(
+                f"{len(df):>8} {n_events:>7} {parse_s * 1000:>11.1f} "
+                f"{clean_s * 1000:>11.1f} {clean_s * 1e6 / len(df):>9.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark the start list and event processors at dual meet, conference and
+national championship scale, against an in-memory Firestore.
+
+Reports the best of REPEATS runs per phase, throughput in rows per second and
+peak traced memory (a separate run under tracemalloc, so it doesn't skew the
+timings).
+
+Run from the python/ directory:
+    python -m benchmarks.bench_processors [dual conference championship] [--repeats N]
+"""
+import os
+import argparse
+import tempfile
+import time
+import tracemalloc
+from processors.cache import document_cache
+from processors.gcs import slugify
+from processors.startlist import parse_start_list, clean_start_list
+from processors.event import (
+    parse_event_metadata, parse_standard_event_results, parse_multi_event_results,
+    clean_event, get_meet_ref, get_event_ref,
+)
+from processors.event_records import parse_standard_event_records, parse_multi_event_records, clean_event_records
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.synthetic import (
+    SCALES, MULTI_EVENTS, make_teams, generate_start_list, generate_event_results, generate_multi_event_results,
+)
+
+REPEATS = 5
+MEET_NAME = "Synthetic Meet"
+MEET_YEAR = "2025"
+MEET_SEASON = "Indoor"
+
+def measure(func, repeats: int = REPEATS):
+    """(best seconds, peak traced bytes) of func()."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def seed_events(db, cleaned_data: dict):
+    """Write the start list's event documents the way process_merged_start_list does."""
+    meet_ref = db.collection("meets").document(MEET_YEAR) \
+        .collection(slugify(MEET_SEASON)).document(slugify(MEET_NAME))
+    for gender, events in cleaned_data.items():
+        for event_num, event_data in events.items():
+            meet_ref.collection(slugify(gender)).document(slugify(event_num)).set({
+                "event_gender": gender,
+                "event_name": event_data["event_name"],
+                "event_type": event_data["event_type"],
+                "sort_ascending": event_data["sort_ascending"],
+                "status": "projected",
+                "projection": {"event_results": event_data["event_results"], "event_round": "prelim"},
+            })
+    meet_ref.set({"name": MEET_NAME, "id": slugify(MEET_NAME), "year": MEET_YEAR, "season": slugify(MEET_SEASON)})
+
+def write_result_files(tmp_dir: str, cleaned_data: dict, teams: list, multi_athletes: int) -> list:
+    """One result CSV per start list event; returns the file names."""
+    multi_names = {name for _, _, name, _ in MULTI_EVENTS}
+    file_names = []
+    for gender, events in cleaned_data.items():
+        for event_num, event_data in events.items():
+            if event_data["event_name"] in multi_names:
+                content = generate_multi_event_results(
+                    multi_athletes, event_data["event_name"], event_num,
+                    MEET_NAME, MEET_YEAR, MEET_SEASON, teams, seed=int(event_num),
+                )
+            else:
+                content = generate_event_results(
+                    event_num, event_data["event_name"], gender, event_data["event_results"],
+                    MEET_NAME, MEET_YEAR, MEET_SEASON, event_data["event_type"] == "field", seed=int(event_num),
+                )
+            file_name = f"{slugify(gender)}_{event_num}.csv"
+            with open(os.path.join(tmp_dir, file_name), "w", encoding="utf-8") as f:
+                f.write(content)
+            file_names.append(file_name)
+    return file_names
+
+def bench_scale(scale: str, repeats: int) -> list:
+    config = SCALES[scale]
+    teams = make_teams(config["teams"])
+    rows = []
+
+    def record(phase, n_rows, func):
+        seconds, peak = measure(func, repeats)
+        rows.append((scale, phase, n_rows, seconds, peak))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # --- Start list ---
+        with open(os.path.join(tmp_dir, "start_list.csv"), "w", encoding="utf-8") as f:
+            f.write(generate_start_list(config["entries"], teams=teams, multi_athletes=config["multi_athletes"]))
+
+        df = parse_start_list(tmp_dir, "start_list.csv")
+        cleaned_data = clean_start_list(df)
+        record("parse_start_list", len(df), lambda: parse_start_list(tmp_dir, "start_list.csv"))
+        record("clean_start_list", len(df), lambda: clean_start_list(df))
+
+        # --- Event results ---
+        file_names = write_result_files(tmp_dir, cleaned_data, teams, config["multi_athletes"])
+        parsed = [parse_event_metadata(tmp_dir, file_name) for file_name in file_names]
+        standard = [(metadata, data_rows) for metadata, data_rows in parsed if metadata["event_type"] == "standard"]
+        multi = [(metadata, data_rows) for metadata, data_rows in parsed if metadata["event_type"] == "multi"]
+        n_result_rows = sum(len(data_rows) for _, data_rows in parsed)
+
+        record("parse_event_metadata", n_result_rows,
+               lambda: [parse_event_metadata(tmp_dir, file_name) for file_name in file_names])
+        record("parse_standard_event_results", sum(len(r) for _, r in standard),
+               lambda: [parse_standard_event_results(m, r) for m, r in standard])
+        record("parse_standard_event_records", sum(len(r) for _, r in standard),
+               lambda: [parse_standard_event_records(m, r) for m, r in standard])
+        if multi:
+            record("parse_multi_event_results", sum(len(r) - 1 for _, r in multi),
+                   lambda: [parse_multi_event_results(m, r) for m, r in multi])
+            record("parse_multi_event_records", sum(len(r) - 1 for _, r in multi),
+                   lambda: [parse_multi_event_records(m, r) for m, r in multi])
+
+        # --- clean_event(_records) against the fake, cold document cache every run ---
+        db = FakeFirestore()
+        seed_events(db, cleaned_data)
+        frames = [(parse_standard_event_results(m, r), get_event_ref(get_meet_ref(db, m), m)) for m, r in standard]
+        frames += [(parse_multi_event_results(m, r), get_event_ref(get_meet_ref(db, m), m)) for m, r in multi]
+
+        def clean_all():
+            document_cache.clear()
+            for frame, event_ref in frames:
+                clean_event(frame, event_ref)
+
+        record("clean_event", sum(len(frame) for frame, _ in frames), clean_all)
+
+        records = [(parse_standard_event_records(m, r), get_event_ref(get_meet_ref(db, m), m)) for m, r in standard]
+        records += [(parse_multi_event_records(m, r), get_event_ref(get_meet_ref(db, m), m)) for m, r in multi]
+
+        def clean_all_records():
+            document_cache.clear()
+            for results, event_ref in records:
+                clean_event_records(results, event_ref)
+
+        record("clean_event_records", sum(len(results.rows) for results, _ in records), clean_all_records)
+        document_cache.clear()
+
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scales", nargs="*", default=list(SCALES), help=f"any of {', '.join(SCALES)}")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+    unknown = set(args.scales) - set(SCALES)
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(sorted(unknown))}")
+
+    print(f"{'scale':<13} {'phase':<29} {'rows':>6} {'best (ms)':>10} {'rows/s':>10} {'peak (MiB)':>11}")
+    for scale in args.scales:
+        for scale_name, phase, n_rows, seconds, peak in bench_scale(scale, args.repeats):
+            print(
+                f"{scale_name:<13} {phase:<29} {n_rows:>6} {seconds * 1000:>10.1f} "
+                f"{n_rows / seconds if seconds else 0:>10.0f} {peak / 2**20:>11.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
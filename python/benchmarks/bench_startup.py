@@ -0,0 +1,210 @@
+"""
+Benchmark the server's cold start: import time per module and time to first
+request, the way Cloud Run starts an instance after scaling to zero.
+
+Import times come from `python -X importtime -c "import app"` (best of
+REPEATS fresh interpreters). Time to first request starts a uvicorn process
+on the local storage backend (offline, seeded with a synthetic start list)
+and reports, per EVENT_INGEST mode, the time from spawning the process to
+its first response, the first (cold) event upload and a second (warm) one.
+
+Run from the python/ directory:
+    python -m benchmarks.bench_startup [--repeats N]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.error
+import urllib.request
+import uuid
+from processors.gcs import slugify
+from benchmarks.bench_processors import MEET_NAME, MEET_YEAR, MEET_SEASON
+from benchmarks.synthetic import SCALES, make_teams, generate_start_list, generate_event_results
+
+REPEATS = 3
+SCALE = "conference"
+INGEST_MODES = ("records", "pandas")
+READY_TIMEOUT_SECONDS = 30
+
+# Reported whether or not they are imported at startup
+HEAVY_MODULES = [
+    "fastapi", "pandas", "numpy", "grpc", "google.api_core",
+    "google.cloud.firestore", "google.cloud.storage", "redis",
+]
+# Other top-level packages are listed once they take this long to import
+MIN_REPORTED_IMPORT_MS = 10.0
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- Import time per module ---
+
+def import_times() -> dict:
+    """{module: cumulative import microseconds} for one fresh `import app`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=PYTHON_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+def report_imports(repeats: int):
+    runs = [import_times() for _ in range(repeats)]
+    best = {name: min(run.get(name, 0) for run in runs) for name in runs[0]}
+
+    reported = [
+        name for name in best
+        if name == "app" or name.startswith("processors")
+        or ("." not in name and best[name] / 1000 >= MIN_REPORTED_IMPORT_MS)
+    ]
+    reported += [name for name in HEAVY_MODULES if name in best and name not in reported]
+
+    print(f"{'module':<32} {'import (ms)':>12}")
+    for name in sorted(reported, key=lambda name: -best[name]):
+        print(f"{name:<32} {best[name] / 1000:>12.1f}")
+    lazy = [name for name in HEAVY_MODULES if name not in best]
+    print(f"not imported at startup: {', '.join(lazy) or '-'}")
+
+# --- Time to first request ---
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def multipart(files: dict):
+    """(body, content type) for {field: (filename, bytes)}."""
+    boundary = uuid.uuid4().hex
+    body = b""
+    for field, (filename, data) in files.items():
+        body += (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8") + data + b"\r\n"
+    body += f"--{boundary}--\r\n".encode("utf-8")
+    return body, f"multipart/form-data; boundary={boundary}"
+
+def post_files(base_url: str, path: str, files: dict) -> float:
+    """Seconds taken by a multipart POST; raises for a non-2xx response."""
+    body, content_type = multipart(files)
+    request = urllib.request.Request(f"{base_url}{path}", data=body, headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+class Server:
+    """uvicorn serving app:app on the local backend, for one measurement."""
+
+    def __init__(self, storage_dir: str, ingest: str = "records"):
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.env = {
+            **os.environ,
+            "STORAGE_BACKEND": "local",
+            "LOCAL_STORAGE_DIR": storage_dir,
+            "LOCAL_SYNC_ENABLED": "0",
+            "NOTIFY_BACKEND": "memory",
+            "EVENT_INGEST": ingest,
+        }
+        self.proc = None
+
+    def start(self) -> float:
+        """Spawn the server; returns seconds until its first response."""
+        start = time.perf_counter()
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--port", str(self.port), "--log-level", "warning"],
+            cwd=PYTHON_DIR, env=self.env, stdout=subprocess.DEVNULL,
+        )
+        while time.perf_counter() - start < READY_TIMEOUT_SECONDS:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.proc.returncode}")
+            try:
+                with urllib.request.urlopen(f"{self.base_url}/stats") as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise RuntimeError(f"Server not ready after {READY_TIMEOUT_SECONDS}s")
+
+    def stop(self):
+        if self.proc is not None:
+            self.proc.terminate()
+            self.proc.wait()
+
+def event_upload(event_num: str, event_name: str, gender: str, entries: list, seed: int) -> dict:
+    """A scored result CSV (seed makes each upload distinct, so none is deduplicated)."""
+    content = generate_event_results(
+        event_num, event_name, gender, entries, MEET_NAME, MEET_YEAR, MEET_SEASON, seed=seed,
+    ).replace(",Finals,Official,", ",Finals,Scored,", 1)
+    return {"file": (f"{slugify(gender)}_{event_num}.csv", content.encode("utf-8"))}
+
+def report_first_request(repeats: int):
+    # Imported here: the parent process's own cold start isn't being measured
+    from processors.startlist import parse_start_list, clean_start_list
+
+    config = SCALES[SCALE]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start_list = generate_start_list(config["entries"], teams=make_teams(config["teams"]))
+        with open(os.path.join(tmp_dir, "start_list.csv"), "w", encoding="utf-8") as f:
+            f.write(start_list)
+        ini = (
+            f"[index]\nmeet={MEET_NAME}\nmeetdate=Jan 1, {MEET_YEAR}\nmeetlocation=Here\nmeetvenue=There\n"
+            f"[switch]\noutdoor={'on' if MEET_SEASON == 'Outdoor' else 'off'}\n"
+        )
+
+        # The largest running event is uploaded: cleaning and scoring it dominates
+        cleaned = clean_start_list(parse_start_list(tmp_dir, "start_list.csv"))
+        gender, event_num, event = max(
+            ((gender, num, event) for gender, events in cleaned.items() for num, event in events.items()
+             if event["event_type"] == "running"),
+            key=lambda item: len(item[2]["event_results"]),
+        )
+        upload_args = (event_num, event["event_name"], gender, event["event_results"])
+
+        storage_dir = os.path.join(tmp_dir, "local-data")
+        seeding = Server(storage_dir)
+        try:
+            seeding.start()
+            post_files(seeding.base_url, "/upload_merged_start_list", {
+                "csv_file": ("start_list.csv", start_list.encode("utf-8")),
+                "ini_file": ("meet.ini", ini.encode("utf-8")),
+            })
+        finally:
+            seeding.stop()
+
+        print(f"\n{'EVENT_INGEST':<13} {'first response (ms)':>20} {'first upload (ms)':>18} {'warm upload (ms)':>17}")
+        seed = 0
+        for ingest in INGEST_MODES:
+            best = None
+            for _ in range(repeats):
+                server = Server(storage_dir, ingest)
+                try:
+                    ready = server.start()
+                    first = post_files(server.base_url, "/upload_event", event_upload(*upload_args, seed=seed))
+                    warm = post_files(server.base_url, "/upload_event", event_upload(*upload_args, seed=seed + 1))
+                    seed += 2
+                finally:
+                    server.stop()
+                run = (ready, first, warm)
+                best = run if best is None else tuple(map(min, best, run))
+            print(f"{ingest:<13} {best[0] * 1000:>20.1f} {best[1] * 1000:>18.1f} {best[2] * 1000:>17.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    report_imports(args.repeats)
+    report_first_request(args.repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+In-memory stand-in for the parts of the Firestore client the processors use,
+so benchmarks run without GCP credentials or network round trips.
+
+Documents are plain dicts keyed by path. Reads and writes are counted so a
+benchmark can report Firestore traffic alongside timings.
+"""
+import copy
+from processors.cache import deep_merge
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self.exists else None
+
+class FakeDocumentReference:
+    def __init__(self, db, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str):
+        return FakeCollectionReference(self._db, f"{self.path}/{name}")
+
+    def get(self, transaction=None):
+        self._db.reads += 1
+        return FakeSnapshot(self, self._db.documents.get(self.path))
+
+    def set(self, data: dict, merge: bool = False):
+        self._db.writes += 1
+        if merge and self.path in self._db.documents:
+            deep_merge(self._db.documents[self.path], data)
+        else:
+            self._db.documents[self.path] = copy.deepcopy(data)
+
+    def delete(self):
+        self._db.writes += 1
+        self._db.documents.pop(self.path, None)
+
+class FakeCollectionReference:
+    def __init__(self, db, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: str):
+        return FakeDocumentReference(self._db, f"{self.path}/{document_id}")
+
+    def stream(self, transaction=None):
+        prefix = f"{self.path}/"
+        for path in sorted(self._db.documents):
+            if path.startswith(prefix) and "/" not in path[len(prefix):]:
+                yield self.document(path[len(prefix):]).get()
+
+class FakeWriteBatch:
+    def __init__(self):
+        self._writes = []
+
+    def set(self, doc_ref, data: dict, merge: bool = False):
+        self._writes.append((doc_ref, data, merge))
+
+    def commit(self):
+        for doc_ref, data, merge in self._writes:
+            doc_ref.set(data, merge=merge)
+
+class FakeFirestore:
+    def __init__(self):
+        self.documents = {}
+        self.reads = 0
+        self.writes = 0
+
+    def collection(self, name: str):
+        return FakeCollectionReference(self, name)
+
+    def batch(self):
+        return FakeWriteBatch()
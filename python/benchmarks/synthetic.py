@@ -0,0 +1,192 @@
+"""
+Synthetic meet data for offline benchmarks.
+
+Everything is generated from a seeded random.Random so runs are repeatable.
+"""
+import random
+
+RUNNING_EVENTS = [
+    ("60 Meter Dash", 6.5, 7.6),
+    ("200 Meter Dash", 20.5, 25.0),
+    ("400 Meter Dash", 45.5, 56.0),
+    ("800 Meter Run", 106.0, 135.0),
+    ("Mile Run", 238.0, 290.0),
+    ("3000 Meter Run", 470.0, 560.0),
+    ("60 Meter Hurdles", 7.5, 8.9),
+]
+
+RELAY_EVENTS = [
+    ("4x400 Meter Relay", 182.0, 225.0),
+    ("Distance Medley Relay", 570.0, 680.0),
+]
+
+FIELD_EVENTS = [
+    ("High Jump", 1.60, 2.30),
+    ("Pole Vault", 3.80, 5.80),
+    ("Long Jump", 5.60, 8.20),
+    ("Triple Jump", 12.00, 17.00),
+    ("Shot Put", 13.00, 21.00),
+    ("Weight Throw", 15.00, 24.00),
+]
+
+# Combined events: start list prefix, gender, component events (with mark ranges)
+MULTI_EVENTS = [
+    ("Hept", "Men", "Heptathlon", [
+        ("60 Meter Dash", 6.8, 7.4, False), ("Long Jump", 6.5, 7.6, True),
+        ("Shot Put", 11.5, 15.5, True), ("High Jump", 1.80, 2.15, True),
+        ("60 Meter Hurdles", 7.9, 8.8, False), ("Pole Vault", 4.20, 5.30, True),
+        ("1000 Meter Run", 155.0, 175.0, False),
+    ]),
+    ("Pen", "Women", "Pentathlon", [
+        ("60 Meter Hurdles", 8.2, 9.2, False), ("High Jump", 1.60, 1.90, True),
+        ("Shot Put", 11.0, 15.0, True), ("Long Jump", 5.60, 6.50, True),
+        ("800 Meter Run", 130.0, 150.0, False),
+    ]),
+]
+
+# Meet sizes: teams, start list entries, athletes per multi event
+SCALES = {
+    "dual": {"teams": 2, "entries": 200, "multi_athletes": 4},
+    "conference": {"teams": 12, "entries": 1200, "multi_athletes": 16},
+    "championship": {"teams": 120, "entries": 5000, "multi_athletes": 24},
+}
+
+def make_teams(n_teams: int) -> list:
+    return [f"Team {chr(65 + i // 26 % 26)}{chr(65 + i % 26)}" for i in range(n_teams)]
+
+TEAMS = make_teams(36)
+
+def format_time(seconds: float) -> str:
+    if seconds >= 60:
+        minutes, rest = divmod(seconds, 60)
+        return f"{int(minutes)}:{rest:05.2f}"
+    return f"{seconds:.2f}"
+
+def format_mark(value: float, is_field: bool) -> str:
+    return f"{value:.2f}m" if is_field else format_time(value)
+
+def generate_start_list(n_entries: int, seed: int = 0, teams: list = TEAMS, multi_athletes: int = 0) -> str:
+    """
+    Build a merged start list CSV with roughly n_entries athlete rows,
+    split evenly over both genders and a rotating set of events.
+    With multi_athletes, every MULTI_EVENTS component gets its own block
+    ('Hept Men 60 Meter Dash', ...) with that many athletes.
+    """
+    rnd = random.Random(seed)
+    catalog = [(name, lo, hi, False) for name, lo, hi in RUNNING_EVENTS + RELAY_EVENTS] + \
+              [(name, lo, hi, True) for name, lo, hi in FIELD_EVENTS]
+
+    per_event = 24 if n_entries >= 2000 else 8
+    n_events = max(1, n_entries // per_event)
+    lines = []
+
+    for event_idx in range(n_events):
+        gender = "Women" if event_idx % 2 == 0 else "Men"
+        name, lo, hi, is_field = catalog[(event_idx // 2) % len(catalog)]
+        lines.append(";;StartList,,,,")
+        lines.append("R,Facility Record,,")
+        lines.append("N,Collegiate,,")
+        lines.append(f"{event_idx + 1:04d},1,{gender} {name} Prelims,,")
+
+        for entry in range(per_event):
+            mark = rnd.uniform(lo, hi)
+            sb = format_mark(mark, is_field) if rnd.random() > 0.1 else ""
+            pb = format_mark(mark * (1.02 if is_field else 0.98), is_field) if sb else ""
+            team = rnd.choice(teams)
+            lines.append(",".join([
+                str(entry + 1), str(entry // 8 + 1), f"First{entry}", f"LAST{event_idx}",
+                rnd.choice(["FR", "SO", "JR", "SR"]), str(10000 + event_idx * 100 + entry),
+                team, team.replace(" ", "")[:6].upper(), sb, "", pb,
+            ]))
+
+    event_num = n_events
+    for prefix, gender, _, components in MULTI_EVENTS if multi_athletes else []:
+        for name, lo, hi, is_field in components:
+            event_num += 1
+            lines.append(";;StartList,,,,")
+            lines.append(f"{event_num:04d},1,{prefix} {gender} {name},,")
+            for entry in range(multi_athletes):
+                team = teams[entry % len(teams)]
+                lines.append(",".join([
+                    str(entry + 1), "1", f"Multi{entry}", f"{prefix.upper()}{entry}",
+                    "SR", str(90000 + entry), team, team.replace(" ", "")[:6].upper(),
+                    format_mark(rnd.uniform(lo, hi), is_field), "", "", str(rnd.randint(600, 1000)),
+                ]))
+
+    return "\n".join(lines) + "\n"
+
+def generate_event_results(
+    event_num: str,
+    event_name: str,
+    gender: str,
+    entries: list,
+    meet_name: str = "Synthetic Meet",
+    meet_year: str = "2025",
+    meet_season: str = "Indoor",
+    is_field: bool = False,
+    seed: int = 0,
+) -> str:
+    """
+    Standard result CSV for one event, as exported by the timing software.
+    entries are start list records (athlete_name, athlete_id, team_name,
+    team_abbr, sb_numeric); each gets a mark near its SB.
+    """
+    rnd = random.Random(seed)
+    lines = [f"{int(event_num):04d},1,{gender} {event_name},Finals,Official,,,,{meet_name},,{meet_year},,{meet_season}"]
+
+    marks = []
+    for entry in entries:
+        sb = entry.get("sb_numeric") or (15.0 if is_field else 60.0)
+        marks.append((sb * rnd.uniform(0.97, 1.03), entry))
+    marks.sort(key=lambda item: -item[0] if is_field else item[0])
+
+    for place, (mark, entry) in enumerate(marks, start=1):
+        first, _, last = (entry.get("athlete_name") or "").partition(" ")
+        lines.append(",".join([
+            str(place), first, last, str(entry.get("athlete_id") or ""), "SR",
+            entry.get("team_abbr") or "", entry.get("team_name") or "",
+            format_mark(mark, is_field), "", "", "", str((place - 1) // 8 + 1), str((place - 1) % 8 + 1),
+        ]))
+
+    return "\n".join(lines) + "\n"
+
+def generate_multi_event_results(
+    n_athletes: int,
+    multi_event: str = "Heptathlon",
+    event_num: str = "1",
+    meet_name: str = "Synthetic Meet",
+    meet_year: str = "2025",
+    meet_season: str = "Indoor",
+    teams: list = TEAMS,
+    seed: int = 0,
+) -> str:
+    """
+    Multi-event standings CSV: an 11-column header, a row of component
+    event names, then per athlete 10 base columns + 4 per component
+    (time, distance, points, running total).
+    """
+    rnd = random.Random(seed)
+    components = next(c for _, _, name, c in MULTI_EVENTS if name == multi_event)
+    lines = [f"{int(event_num):04d},1,{multi_event},Finals,Standings,,{meet_name},,{meet_year},,{meet_season}"]
+    lines.append(",".join([""] * 10 + [name for name, _, _, _ in components]))
+
+    rows = []
+    for athlete in range(n_athletes):
+        team = teams[athlete % len(teams)]
+        total = 0
+        columns = []
+        for _, lo, hi, is_field in components:
+            mark = format_mark(rnd.uniform(lo, hi), is_field)
+            points = rnd.randint(600, 1000)
+            total += points
+            columns += ["" if is_field else mark, mark if is_field else "", str(points), str(total)]
+        rows.append((total, [
+            f"Multi{athlete}", f"{multi_event[:4].upper()}{athlete}", team.replace(" ", "")[:6].upper(), team,
+            str(total), "", str(90000 + athlete), "SR", "",
+        ] + columns))
+
+    rows.sort(key=lambda row: -row[0])
+    for place, (_, row) in enumerate(rows, start=1):
+        lines.append(",".join([str(place)] + row))
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import asyncio
+import itertools
+from collections import OrderedDict
+
+# Max messages held per SSE client before the oldest is dropped
+SSE_QUEUE_SIZE = int(os.environ.get("SSE_QUEUE_SIZE", "32"))
+# Seconds between keep-alive comments on an idle stream
+SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+
+def coalesce_key(payload: dict):
+    """
+    Messages with the same key replace each other while still queued: clients
+    only need the latest "meet X changed" notice to refetch once.
+    Returns None for messages that must each be delivered, such as
+    versioned event changes (one or a bulk list of them).
+    """
+    if "version" in payload or "changes" in payload:
+        return None
+    meet_ids = payload.get("meet_document_ids")
+    if meet_ids is not None:
+        return (payload.get("type"), tuple(meet_ids))
+    if payload.get("meet_document_id") is not None:
+        return (payload.get("type"), payload["meet_document_id"])
+    return None
+
+class Subscriber:
+    """
+    One SSE client: a bounded, coalescing message queue.
+    topic is the meet_document_id it watches, or None for every meet.
+    """
+
+    def __init__(self, max_size: int, topic: str = None):
+        self.max_size = max_size
+        self.topic = topic
+        self.connected_at = time.monotonic()
+        self._messages = OrderedDict()
+        self._ids = itertools.count()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+        # Set when messages were dropped; the client is told to resync
+        self.overflowed = False
+
+    def __len__(self):
+        return len(self._messages)
+
+    def offer(self, payload: dict) -> str:
+        """
+        Queue a message without ever blocking the publisher.
+        Returns 'queued', 'coalesced' or 'dropped-oldest'.
+        """
+        key = coalesce_key(payload)
+        outcome = "queued"
+
+        if key is not None and key in self._messages:
+            # Latest wins, at the back of the queue
+            del self._messages[key]
+            self.coalesced += 1
+            outcome = "coalesced"
+        elif len(self._messages) >= self.max_size:
+            self._messages.popitem(last=False)
+            self.dropped += 1
+            self.overflowed = True
+            outcome = "dropped-oldest"
+
+        self._messages[key if key is not None else next(self._ids)] = payload
+        self._ready.set()
+        return outcome
+
+    async def next_message(self, timeout: float):
+        """
+        Wait up to timeout seconds for the next message; None on timeout.
+        After an overflow the next message is {"type": "resync"}.
+        """
+        if self.overflowed:
+            self.overflowed = False
+            return {"type": "resync"}
+        if not self._messages:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._messages.popitem(last=False)[1]
+
+class Broadcaster:
+    """
+    Fan-out of JSON messages to connected SSE clients.
+
+    Publishing never awaits a client: each subscriber has a bounded queue
+    (coalesce-to-latest, then drop-oldest), so a stalled client costs at most
+    max_queue messages, and one that lost messages is sent {"type": "resync"}.
+    Idle streams get heartbeats, which is also how dead connections are
+    noticed and reaped.
+    """
+
+    def __init__(self, max_queue: int = SSE_QUEUE_SIZE, heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS):
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers = set()
+        # Clients per watched topic (None = every meet), so a bus can follow
+        # only the topics someone here is watching
+        self._topics = {}
+        self.bus = None
+        self.connected_total = 0
+        self.disconnected_total = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def subscribe(self, topic: str = None) -> Subscriber:
+        subscriber = Subscriber(self.max_queue, topic)
+        self._subscribers.add(subscriber)
+        self.connected_total += 1
+        self._topics[topic] = self._topics.get(topic, 0) + 1
+        if self._topics[topic] == 1 and self.bus is not None:
+            self.bus.watch(topic)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.discard(subscriber)
+            self.disconnected_total += 1
+            topic = subscriber.topic
+            self._topics[topic] -= 1
+            if not self._topics[topic]:
+                del self._topics[topic]
+                if self.bus is not None:
+                    self.bus.unwatch(topic)
+
+    def watched_topics(self) -> set:
+        """Topics with at least one client here (None = every meet)."""
+        return set(self._topics)
+
+    def publish(self, payload: dict, topic: str = None, to_watchers: bool = True, to_wildcard: bool = True):
+        """
+        Queue a message for the local clients it concerns: those watching topic
+        (to_watchers) and those watching every meet (to_wildcard).
+        Messages without a topic go to every client.
+        """
+        self.published += 1
+        for subscriber in list(self._subscribers):
+            if topic is not None:
+                if subscriber.topic is None and not to_wildcard:
+                    continue
+                if subscriber.topic is not None and (subscriber.topic != topic or not to_watchers):
+                    continue
+            outcome = subscriber.offer(payload)
+            if outcome == "dropped-oldest":
+                self.dropped += 1
+            elif outcome == "coalesced":
+                self.coalesced += 1
+
+    async def stream(self, subscriber: Subscriber, is_disconnected):
+        """
+        SSE body for one client. is_disconnected is an async callable
+        (e.g. request.is_disconnected) polled on every heartbeat.
+        """
+        try:
+            yield f"retry: {int(self.heartbeat_seconds * 1000)}\n\n"
+            while True:
+                payload = await subscriber.next_message(self.heartbeat_seconds)
+                if payload is None:
+                    if await is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                self.delivered += 1
+                yield f"data: {json.dumps(payload, default=str)}\n\n"
+        finally:
+            # Runs on client disconnect, cancellation and server shutdown alike
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        depths = [len(subscriber) for subscriber in self._subscribers]
+        return {
+            "subscribers": len(depths),
+            "topics": len(self._topics),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "queue_size": self.max_queue,
+            "connected_total": self.connected_total,
+            "disconnected_total": self.disconnected_total,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+broadcaster = Broadcaster()
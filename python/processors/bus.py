@@ -0,0 +1,175 @@
+import os
+import json
+import asyncio
+
+# "memory" (single instance) or "redis" (fan out across instances)
+NOTIFY_BACKEND = os.environ.get("NOTIFY_BACKEND", "memory")
+# e.g. redis://10.0.0.3:6379/0 (Memorystore) or redis://localhost:6379 locally
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+# Channels are {prefix}meet:{meet_document_id}; {prefix}all carries untopiced messages
+NOTIFY_CHANNEL_PREFIX = os.environ.get("NOTIFY_CHANNEL_PREFIX", "flash-results:")
+
+class InProcessBus:
+    """Delivers straight to this process's SSE clients. Fine for one instance."""
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self.published = 0
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, topic: str, payload: dict):
+        self.published += 1
+        self.broadcaster.publish(payload, topic)
+
+    def watch(self, topic: str):
+        pass
+
+    def unwatch(self, topic: str):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "published": self.published}
+
+class RedisBus:
+    """
+    Redis pub/sub between instances, one channel per meet. An instance only
+    subscribes to the meets its own clients watch (plus a pattern subscription
+    while any client watches every meet), so it only receives that traffic.
+
+    Publishing goes through Redis even for local clients, so every instance
+    (this one included) delivers each message exactly once.
+    """
+
+    def __init__(self, broadcaster, url: str = REDIS_URL, prefix: str = NOTIFY_CHANNEL_PREFIX):
+        self.broadcaster = broadcaster
+        self.url = url
+        self.prefix = prefix
+        self._redis = None
+        self._pubsub = None
+        self._reader = None
+        self._pending = set()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+        self.publish_errors = 0
+
+    def channel(self, topic: str) -> str:
+        return f"{self.prefix}all" if topic is None else f"{self.prefix}meet:{topic}"
+
+    def _topic(self, channel: str):
+        meet_prefix = f"{self.prefix}meet:"
+        return channel[len(meet_prefix):] if channel.startswith(meet_prefix) else None
+
+    async def start(self):
+        # Imported here so the in-process backend doesn't need redis installed
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel(None))
+        for topic in self.broadcaster.watched_topics():
+            await self._subscribe(topic)
+        self._reader = asyncio.create_task(self._read())
+
+    async def stop(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def publish(self, topic: str, payload: dict):
+        # The change is already committed: a Redis outage only costs live updates
+        # (clients resync on the next version), so it must not fail the request
+        try:
+            await self._redis.publish(self.channel(topic), json.dumps(payload, default=str))
+        except Exception as e:
+            self.publish_errors += 1
+            print(f"⚠️ Notification bus publish failed: {e}")
+            return
+        self.published += 1
+
+    def watch(self, topic: str):
+        self._schedule(self._subscribe(topic))
+
+    def unwatch(self, topic: str):
+        self._schedule(self._unsubscribe(topic))
+
+    def _schedule(self, coroutine):
+        if self._pubsub is None:
+            # Not started yet: start() subscribes to whatever is watched by then
+            coroutine.close()
+            return
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _subscribe(self, topic: str):
+        if topic is None:
+            await self._pubsub.psubscribe(f"{self.prefix}meet:*")
+        else:
+            await self._pubsub.subscribe(self.channel(topic))
+
+    async def _unsubscribe(self, topic: str):
+        # Re-check: a client may have started watching again in the meantime
+        if topic in self.broadcaster.watched_topics():
+            return
+        if topic is None:
+            await self._pubsub.punsubscribe(f"{self.prefix}meet:*")
+        else:
+            await self._pubsub.unsubscribe(self.channel(topic))
+
+    async def _read(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Notification bus read failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None or message["type"] not in ("message", "pmessage"):
+                continue
+
+            self.received += 1
+            topic = self._topic(message["channel"])
+            payload = json.loads(message["data"])
+            # A meet channel message reaches us via the pattern (wildcard
+            # clients) and/or the meet's own channel (its watchers), never both
+            # for the same client
+            if topic is None:
+                self.broadcaster.publish(payload)
+            elif message["type"] == "pmessage":
+                self.broadcaster.publish(payload, topic, to_watchers=False)
+            else:
+                self.broadcaster.publish(payload, topic, to_wildcard=False)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+            "publish_errors": self.publish_errors,
+        }
+
+def create_bus(broadcaster, backend: str = NOTIFY_BACKEND):
+    """Build the configured bus and attach it to the broadcaster."""
+    if backend == "memory":
+        bus = InProcessBus(broadcaster)
+    elif backend == "redis":
+        bus = RedisBus(broadcaster)
+    else:
+        raise ValueError(f"Unknown NOTIFY_BACKEND '{backend}' (expected 'memory' or 'redis')")
+    broadcaster.bus = bus
+    return bus
@@ -0,0 +1,153 @@
+import os
+import copy
+import time
+import threading
+from collections import OrderedDict
+
+DOCUMENT_CACHE_SIZE = int(os.environ.get("DOCUMENT_CACHE_SIZE", "1024"))
+DOCUMENT_CACHE_TTL_SECONDS = float(os.environ.get("DOCUMENT_CACHE_TTL_SECONDS", "60"))
+STANDINGS_CACHE_TTL_SECONDS = float(os.environ.get("STANDINGS_CACHE_TTL_SECONDS", "10"))
+SIMULATION_CACHE_TTL_SECONDS = float(os.environ.get("SIMULATION_CACHE_TTL_SECONDS", "60"))
+
+def deep_merge(target: dict, updates: dict):
+    """Apply updates the way Firestore's set(..., merge=True) does."""
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+class DocumentCache:
+    """
+    Bounded, in-process read-through cache of Firestore documents keyed by path.
+
+    Entries expire after ttl_seconds and the least recently used entry is
+    evicted once max_size is reached. Missing documents are cached as None.
+    Cached dicts are shared: callers must not mutate them.
+    """
+
+    def __init__(self, max_size: int = DOCUMENT_CACHE_SIZE, ttl_seconds: float = DOCUMENT_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so in-flight reads don't store stale data
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, doc_ref):
+        """
+        Returns the document data as a dict (None if it does not exist),
+        reading it from Firestore on a miss.
+        """
+        def load():
+            snapshot = doc_ref.get()
+            return snapshot.to_dict() if snapshot.exists else None
+
+        return self.get_or_load(doc_ref.path, load)
+
+    def get_or_load(self, path: str, loader):
+        """Returns the cached value for path, calling loader() on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        data = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                self._store(path, data)
+        return data
+
+    def merge(self, path: str, updates: dict):
+        """Reflect our own set(updates, merge=True) write in a cached entry."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[1] is None:
+                self._invalidate(path)
+                return
+            self._generation += 1
+            data = copy.deepcopy(entry[1])
+            deep_merge(data, updates)
+            self._store(path, data)
+
+    def put(self, path: str, data):
+        """Store a document we just wrote in full."""
+        with self._lock:
+            self._generation += 1
+            self._store(path, data)
+
+    def invalidate(self, path: str):
+        """Drop a single document."""
+        with self._lock:
+            self._invalidate(path)
+
+    def invalidate_prefix(self, path: str):
+        """Drop a document and everything below it (e.g. a meet and its events)."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k == path or k.startswith(path + "/")]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _invalidate(self, path: str):
+        self._generation += 1
+        self._entries.pop(path, None)
+
+    def _store(self, path: str, data):
+        self._entries[path] = (time.monotonic() + self.ttl_seconds, data)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+# Shared by the processors and the API endpoints
+document_cache = DocumentCache()
+# Computed team standings keyed by meet document path
+standings_cache = DocumentCache(max_size=64, ttl_seconds=STANDINGS_CACHE_TTL_SECONDS)
+# Monte Carlo meet simulations keyed by meet document path
+simulation_cache = DocumentCache(max_size=32, ttl_seconds=SIMULATION_CACHE_TTL_SECONDS)
+
+def on_event_write(event_path: str, updates: dict = None, document: dict = None):
+    """
+    Keep caches coherent after writing meets/{year}/{season}/{meet}/{gender}/{event}.
+    Pass the resulting document when it is known, else the set(merge=True)
+    payload as updates, or neither to just drop the cached copy.
+    """
+    if document is not None:
+        document_cache.put(event_path, document)
+    elif updates is None:
+        document_cache.invalidate(event_path)
+    else:
+        document_cache.merge(event_path, updates)
+    meet_path = event_path.rsplit("/", 2)[0]
+    standings_cache.invalidate(meet_path)
+    simulation_cache.invalidate(meet_path)
+
+def on_meet_write(meet_path: str):
+    """Drop everything cached for a meet after reseeding or deleting it."""
+    document_cache.invalidate_prefix(meet_path)
+    standings_cache.invalidate(meet_path)
+    simulation_cache.invalidate(meet_path)
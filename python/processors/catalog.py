@@ -0,0 +1,108 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+from .constants import MULTI_EVENT_LIST, FIELD_EVENT_LIST, DECATHALON, HEPTATHALON, PENTATHALON
+
+class EventInfo(NamedTuple):
+    name: str              # canonical display name
+    event_type: str        # 'running', 'field', 'relay' or 'multi'
+    sort_ascending: bool   # True when lower marks are better
+    sub_events: tuple = () # multi events: component event names, in order
+
+# Start list rows of a combined event are named after it ('Dec 100m', 'Hept LJ', ...)
+MULTI_EVENT_PREFIXES = {
+    'Dec': 'Decathlon',
+    'Hept': 'Heptathlon',
+    'Pen': 'Pentathlon',
+}
+
+MULTI_EVENT_COMPONENTS = {
+    'Decathlon': DECATHALON,
+    'Heptathlon': HEPTATHALON,
+    'Pentathlon': PENTATHALON,
+}
+
+# Multi events tell the gender apart by season: (season, event) -> gender
+MULTI_EVENT_GENDERS = {
+    ('outdoor', 'Decathlon'): 'Men',
+    ('outdoor', 'Heptathlon'): 'Women',
+    ('indoor', 'Heptathlon'): 'Men',
+    ('indoor', 'Pentathlon'): 'Women',
+}
+
+# Field event names as they appear in results -> canonical name
+FIELD_EVENT_ALIASES = {name: name for name in FIELD_EVENT_LIST}
+FIELD_EVENT_ALIASES['Weight'] = 'Weight Throw'
+
+def _alternation(names) -> re.Pattern:
+    """One case-insensitive pattern matching any of names, longest first."""
+    ordered = sorted(names, key=len, reverse=True)
+    return re.compile("|".join(re.escape(name) for name in ordered), re.IGNORECASE)
+
+# --- Compiled once at import ---
+_MULTI_PATTERN = _alternation(MULTI_EVENT_LIST)
+_FIELD_PATTERN = _alternation(FIELD_EVENT_ALIASES)
+_RELAY_PATTERN = re.compile(r"relay|medley|dmr", re.IGNORECASE)
+_RELAY_LEGS_PATTERN = re.compile(r"(\d)\s*x\s*(\d+)", re.IGNORECASE)
+_SPRINT_MEDLEY_PATTERN = re.compile(r"sprint", re.IGNORECASE)
+_DISTANCE_MEDLEY_PATTERN = re.compile(r"medley|dmr", re.IGNORECASE)
+_GENDER_PATTERN = re.compile(r"\b(Men|Women)\b\s*")
+_SPACES_PATTERN = re.compile(r"[\s_\-]+")
+
+_MULTI_NAMES = {name.lower(): name for name in MULTI_EVENT_LIST}
+_FIELD_NAMES = {alias.lower(): name for alias, name in FIELD_EVENT_ALIASES.items()}
+
+@lru_cache(maxsize=4096)
+def normalize_event_name(event_name: str) -> str:
+    """Strip gender words and collapse separators ('Men 4x400-Meter  Relay' -> '4x400 Meter Relay')."""
+    name = _GENDER_PATTERN.sub("", event_name or "")
+    return _SPACES_PATTERN.sub(" ", name).strip()
+
+@lru_cache(maxsize=4096)
+def classify_event(event_name: str) -> EventInfo:
+    """
+    Canonical event for a raw event name, as found in start lists and result
+    CSVs (with or without gender, slugified or not).
+
+    Multi events win over field events (a decathlon name may mention a
+    throw), then field events, then relays; anything else is a running event.
+    """
+    name = normalize_event_name(event_name)
+
+    match = _MULTI_PATTERN.search(name)
+    if match:
+        multi_event = _MULTI_NAMES[match.group(0).lower()]
+        components = MULTI_EVENT_COMPONENTS.get(multi_event, {})
+        return EventInfo(multi_event, 'multi', False, tuple(components.values()))
+
+    match = _FIELD_PATTERN.search(name)
+    if match:
+        field_event = _FIELD_NAMES[match.group(0).lower()]
+        return EventInfo(field_event, 'field', False)
+
+    if _RELAY_PATTERN.search(name):
+        # Relay names aren't standardized: '4x400 Meter Relay', '4 X 400m Relay', 'DMR', ...
+        legs = _RELAY_LEGS_PATTERN.search(name)
+        if legs:
+            relay = f"{legs.group(1)}x{legs.group(2)} Relay"
+        elif _SPRINT_MEDLEY_PATTERN.search(name):
+            relay = "Sprint Medley Relay"
+        elif _DISTANCE_MEDLEY_PATTERN.search(name):
+            relay = "Distance Medley Relay"
+        else:
+            relay = name
+        return EventInfo(relay, 'relay', True)
+
+    return EventInfo(name, 'running', True)
+
+def multi_event_for(event_name: str):
+    """Combined event a start list row belongs to ('Dec 100m' -> 'Decathlon'), or None."""
+    prefix = next((p for p in MULTI_EVENT_PREFIXES if event_name.startswith(p)), None)
+    return MULTI_EVENT_PREFIXES[prefix] if prefix else None
+
+def multi_event_gender(event_name: str, meet_season: str):
+    """Gender of a multi event from its name and season, or None if it can't be told."""
+    info = classify_event(event_name)
+    if info.event_type != 'multi':
+        return None
+    return MULTI_EVENT_GENDERS.get(((meet_season or "").lower(), info.name))
@@ -52,4 +52,13 @@ HEPTATHALON = {
   'JV': 'Javelin',
   '800m': '800 M',
   '200m': '200 M'
-}
\ No newline at end of file
+}
+
+# Women's Indoor Pentathlon Mappings
+PENTATHALON = {
+  '60mH': '60 M Hurdles',
+  'HJ': 'High Jump',
+  'SP': 'Shot Put',
+  'LJ': 'Long Jump',
+  '800m': '800 M'
+}
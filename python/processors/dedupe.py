@@ -0,0 +1,106 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from processors.storage import get_database
+from processors.cache import document_cache
+from processors.event import get_meet_ref, get_event_ref
+
+# Most recent (meet, gender, event, round) uploads remembered in-process
+UPLOAD_FINGERPRINTS_SIZE = int(os.environ.get("UPLOAD_FINGERPRINTS_SIZE", "4096"))
+
+def content_hash(data: bytes) -> str:
+    """Fingerprint of a raw upload."""
+    return hashlib.sha256(data).hexdigest()
+
+def upload_key(metadata: dict) -> tuple:
+    """What an upload replaces: one round of one event at one meet."""
+    return tuple(
+        metadata.get(field)
+        for field in ("meet_year", "meet_season", "meet_id", "event_gender", "event_num", "event_round")
+    )
+
+class UploadFingerprints:
+    """
+    Latest content hash per upload key, to short-circuit identical re-uploads
+    (timing software re-pushes the same CSV while a heat is running).
+
+    Checked twice: by hash alone before parsing (this instance's recent
+    uploads), then against the hash stored on the event document (uploads
+    handled by other instances or before a restart).
+    """
+
+    def __init__(self, max_size: int = UPLOAD_FINGERPRINTS_SIZE):
+        self.max_size = max_size
+        self._latest = OrderedDict()  # upload key -> (digest, metadata)
+        self._keys = {}               # digest -> upload key
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.memory_hits = 0
+        self.stored_hits = 0
+
+    def find(self, digest: str):
+        """
+        Metadata of the upload if digest is still the latest content for its
+        key on this instance, else None. Counts as one upload check.
+        """
+        with self._lock:
+            self.checks += 1
+            key = self._keys.get(digest)
+            entry = self._latest.get(key) if key is not None else None
+            if entry is None or entry[0] != digest:
+                return None
+            self._latest.move_to_end(key)
+            self.memory_hits += 1
+            return entry[1]
+
+    def matches_stored(self, metadata: dict, digest: str) -> bool:
+        """True if the event document already records digest for this round."""
+        event_ref = get_event_ref(get_meet_ref(get_database(), metadata), metadata)
+        event = document_cache.get(event_ref) or {}
+        stored = (event.get("upload_hashes") or {}).get(str(metadata.get("event_round")))
+        if stored != digest:
+            return False
+
+        self.remember(metadata, digest)
+        with self._lock:
+            self.stored_hits += 1
+        return True
+
+    def remember(self, metadata: dict, digest: str):
+        """Record digest as the latest processed content for its upload key."""
+        key = upload_key(metadata)
+        with self._lock:
+            previous = self._latest.pop(key, None)
+            if previous is not None and self._keys.get(previous[0]) == key:
+                del self._keys[previous[0]]
+            self._latest[key] = (digest, metadata)
+            self._keys[digest] = key
+            while len(self._latest) > self.max_size:
+                old_digest, _ = self._latest.popitem(last=False)[1]
+                self._keys.pop(old_digest, None)
+
+    def forget_meet(self, meet_year: str, meet_season: str, meet_id: str):
+        """Drop a meet's fingerprints once its events are reseeded or deleted."""
+        # Keys hold the year as parsed from event CSVs (a string); callers may pass the INI's int
+        meet = (str(meet_year), meet_season, meet_id)
+        with self._lock:
+            for key in [k for k in self._latest if k[:3] == meet]:
+                digest, _ = self._latest.pop(key)
+                if self._keys.get(digest) == key:
+                    del self._keys[digest]
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.stored_hits
+            return {
+                "checks": self.checks,
+                "duplicates": hits,
+                "memory_hits": self.memory_hits,
+                "stored_hits": self.stored_hits,
+                "hit_rate": hits / self.checks if self.checks else 0.0,
+                "size": len(self._latest),
+                "max_size": self.max_size,
+            }
+
+upload_fingerprints = UploadFingerprints()
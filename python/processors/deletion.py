@@ -0,0 +1,112 @@
+import os
+import threading
+from processors.lazy import lazy_module
+from processors.cache import on_meet_write
+
+exceptions = lazy_module("google.api_core.exceptions")
+bulk_writer_options = lazy_module("google.cloud.firestore_v1.bulk_writer")
+
+# GCS JSON API accepts at most 100 calls per batch request
+GCS_DELETE_BATCH_SIZE = 100
+# Upper bound on Firestore deletes per second issued by the BulkWriter
+FIRESTORE_DELETE_OPS_PER_SECOND = int(os.environ.get("FIRESTORE_DELETE_OPS_PER_SECOND", "500"))
+
+def new_deletion_progress(document_id: str) -> dict:
+    return {
+        "meet_document_id": document_id,
+        "status": "queued",
+        "blobs_deleted": 0,
+        "documents_deleted": 0,
+        "error": None,
+    }
+
+def delete_meet_data(db, bucket, meet_ref, meet_doc: dict, progress: dict = None) -> dict:
+    """
+    Delete every GCS file and Firestore document belonging to a meet.
+
+    Args:
+        db: Firestore client.
+        bucket: GCS bucket holding the raw meet files.
+        meet_ref: Reference to the meet document.
+        meet_doc: The meet document data (used for GCS paths).
+        progress: Optional dict (see new_deletion_progress) updated in place,
+            so callers can report on long-running deletions.
+
+    Returns:
+        The progress dict.
+    """
+    if progress is None:
+        progress = new_deletion_progress(meet_ref.path)
+
+    meet_year = meet_doc.get("year", "unknown")
+    meet_season = meet_doc.get("season", "unknown")
+    meet_id = meet_doc.get("id", "unknown")
+
+    try:
+        # Delete GCS files
+        progress["status"] = "deleting-files"
+        delete_blobs(bucket, [
+            f"merged-start-lists/{meet_year}/{meet_season}/{meet_id}",
+            f"events/{meet_year}/{meet_season}/{meet_id}/",
+        ], progress)
+
+        # Delete Firestore documents (meet document and all subcollections)
+        progress["status"] = "deleting-documents"
+        delete_documents(db, meet_ref, progress)
+        on_meet_write(meet_ref.path)
+
+        progress["status"] = "done"
+    except Exception as e:
+        progress.update({"status": "failed", "error": str(e)})
+        raise
+
+    return progress
+
+def delete_blobs(bucket, prefixes: list, progress: dict):
+    """
+    Delete all blobs under the given prefixes using GCS batch requests
+    (up to GCS_DELETE_BATCH_SIZE deletes per HTTP call).
+    """
+    client = bucket.client
+    chunk = []
+
+    def flush():
+        try:
+            with client.batch():
+                for blob in chunk:
+                    blob.delete()
+        except exceptions.NotFound:
+            # Already gone; the rest of the batch was still applied
+            pass
+        progress["blobs_deleted"] += len(chunk)
+        chunk.clear()
+
+    for prefix in prefixes:
+        for blob in bucket.list_blobs(prefix=prefix):
+            chunk.append(blob)
+            if len(chunk) == GCS_DELETE_BATCH_SIZE:
+                flush()
+
+    if chunk:
+        flush()
+
+def delete_documents(db, doc_ref, progress: dict):
+    """
+    Recursively delete a document and all of its subcollections with a
+    rate-limited BulkWriter, which sends deletes in parallel batches.
+    """
+    lock = threading.Lock()
+
+    def on_deleted(*_):
+        with lock:
+            progress["documents_deleted"] += 1
+
+    ops_per_second = FIRESTORE_DELETE_OPS_PER_SECOND
+    bulk_writer = db.bulk_writer(bulk_writer_options.BulkWriterOptions(
+        initial_ops_per_second=min(500, ops_per_second),
+        max_ops_per_second=ops_per_second,
+    ))
+    bulk_writer.on_write_result(on_deleted)
+
+    # recursive_delete lists descendants with id-only queries and closes the writer
+    return db.recursive_delete(doc_ref, bulk_writer=bulk_writer)
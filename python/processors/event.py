@@ -1,50 +1,281 @@
 import os
 import re
-import pandas as pd
 import csv
-from processors.gcs import get_firestore_client, slugify, parse_time_or_distance
-from .constants import RELAY_EVENT_LIST
-def process_event(file_path: str):
+import copy
+from processors.gcs import open_text_source, slugify, parse_marks
+from processors.storage import get_database, transactional
+from processors.metrics import phase
+from processors.cache import document_cache, on_event_write
+from processors.scoring import update_standings_in_transaction
+from processors.catalog import classify_event, multi_event_gender
+from processors.lazy import lazy_module
+from processors.event_records import parse_standard_event_records, parse_multi_event_records, clean_event_records
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+exceptions = lazy_module("google.api_core.exceptions")
+field_path = lazy_module("google.cloud.firestore_v1.field_path")
+
+# "records" parses and cleans results with the csv module and NamedTuples (no pandas import),
+# "pandas" with DataFrames
+EVENT_INGEST = os.environ.get("EVENT_INGEST", "records")
+
+def process_event(source):
     """
     Process a single event CSV and upload the scored data to Firestore
     under meets/year/season/{meet_id}.
-    """
-    print(f"Processing file: {file_path}")
 
+    Args:
+        source: Local CSV path, raw CSV bytes, or a file-like object.
+    """
     # --- Parse CSV ---
-    metadata, raw_rows = parse_event_metadata(
-        os.path.dirname(file_path),
-        os.path.basename(file_path)
+    with phase("csv_parse"):
+        metadata, raw_rows = parse_event_csv(source)
+    metadata, _ = process_event_rows(metadata, raw_rows)
+    return metadata
+
+def process_event_rows(metadata: dict, raw_rows: list, content_hash: str = None):
+    """
+    Score already-parsed event rows (see parse_event_csv) and upload them to Firestore.
+
+    Returns:
+        (metadata, changes) where changes is the list from write_events.
+    """
+    event_ref, update_data = prepare_event_update(metadata, raw_rows, content_hash)
+    changes = write_events(get_database(), [(event_ref, update_data)])
+    return metadata, changes
+
+# --- Versioned event writes ---
+
+def split_path(path: str) -> list:
+    """
+    Keys of a field path: 'a.`b.c`' (FieldPath.to_api_repr()) -> ['a', 'b.c'].
+    Raises ValueError for a malformed path.
+    """
+    keys = field_path.parse_field_path(path)
+    if not keys:
+        raise ValueError(f"Invalid field path: {path!r}")
+    return keys
+
+def flatten_updates(updates: dict, parents: tuple = ()) -> dict:
+    """
+    Turn a set(merge=True) payload into the equivalent {"a.b.c": leaf} field updates.
+    Keys containing '.' or other special characters are backtick-quoted.
+    """
+    flat = {}
+    for key, value in updates.items():
+        keys = (*parents, key)
+        if isinstance(value, dict) and value:
+            flat.update(flatten_updates(value, keys))
+        else:
+            flat[field_path.FieldPath(*keys).to_api_repr()] = value
+    return flat
+
+def apply_field_updates(data: dict, updates: dict) -> dict:
+    """Apply {"a.b.c": value} updates to a copy of data, like DocumentReference.update."""
+    data = copy.deepcopy(data)
+    for path, value in updates.items():
+        *parents, leaf = split_path(path)
+        target = data
+        for key in parents:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[leaf] = copy.deepcopy(value)
+    return data
+
+_MISSING = object()
+
+# Recorded alongside real changes, but never a reason to write on their own
+BOOKKEEPING_FIELDS = {"upload_hashes"}
+
+def get_field(data: dict, path: str):
+    """Value at a dotted field path, or _MISSING."""
+    for key in split_path(path):
+        if not isinstance(data, dict) or key not in data:
+            return _MISSING
+        data = data[key]
+    return data
+
+def diff_results(old_results, new_results) -> dict:
+    """
+    Athlete-level summary of an event_results change: names of athletes
+    added, removed and with changed fields.
+    """
+    def by_athlete(results):
+        if not isinstance(results, list):
+            return {}
+        return {
+            (r.get("athlete_id") if r.get("athlete_id") is not None else (r.get("athlete_name"), r.get("team_name"))): r
+            for r in results
+        }
+
+    old, new = by_athlete(old_results), by_athlete(new_results)
+    return {
+        "added": [new[k].get("athlete_name") for k in new if k not in old],
+        "removed": [old[k].get("athlete_name") for k in old if k not in new],
+        "changed": [new[k].get("athlete_name") for k in new if k in old and new[k] != old[k]],
+    }
+
+@transactional
+def _write_events_in_transaction(transaction, meet_ref, gender, writes, field_updates):
+    # --- Reads: the meet, every event, then (inside the scoring helper) the standings ---
+    # Not from the cache: another instance may have just deleted the meet, and
+    # writing its events would recreate them as orphans
+    if not meet_ref.get(transaction=transaction).exists:
+        _, meet_year, meet_season, meet_id = meet_ref.path.split("/")
+        message = f"Meet not found for meet_id='{meet_id}', meet_season='{meet_season}', meet_year='{meet_year}'."
+        raise exceptions.NotFound(message) if field_updates else ValueError(message)
+
+    current = {}
+    existed = {}
+    for event_ref, _ in writes:
+        if event_ref.path not in current:
+            snapshot = event_ref.get(transaction=transaction)
+            current[event_ref.path] = snapshot.to_dict() if snapshot.exists else None
+            existed[event_ref.path] = snapshot.exists
+
+    # --- Diff each write against the stored (or earlier in this batch) version ---
+    changes = []
+    for event_ref, data in writes:
+        event = current[event_ref.path]
+        if field_updates and event is None:
+            raise exceptions.NotFound(f"Event '{event_ref.path}' does not exist.")
+
+        requested = dict(data) if field_updates else flatten_updates(data)
+        updates = {
+            path: value for path, value in requested.items()
+            if get_field(event or {}, path) != value
+        }
+        if all(split_path(path)[0] in BOOKKEEPING_FIELDS for path in updates):
+            continue
+
+        results_diff = {
+            path: diff_results(get_field(event or {}, path), value)
+            for path, value in updates.items()
+            if split_path(path)[-1] == "event_results" and isinstance(value, list)
+        }
+
+        event = apply_field_updates(event or {}, updates)
+        event["version"] = (current[event_ref.path] or {}).get("version", 0) + 1
+        current[event_ref.path] = event
+        changes.append((event_ref, event["version"], updates, results_diff))
+
+    if not changes:
+        return changes, {}
+
+    update_standings_in_transaction(
+        transaction, meet_ref, gender,
+        {event_ref.id: current[event_ref.path] for event_ref, *_ in changes}
     )
 
-    event_type = metadata.get("event_type")
+    # --- Writes: only changed fields; new or repeated events are written in full ---
+    written = {}
+    for event_ref, version, updates, _ in changes:
+        written.setdefault(event_ref.path, []).append((event_ref, updates))
+    for path, entries in written.items():
+        event_ref, updates = entries[0]
+        if existed[path] and len(entries) == 1:
+            transaction.update(event_ref, {**updates, "version": current[path]["version"]})
+        else:
+            transaction.set(event_ref, current[path])
 
-    if event_type == "standard":
-        df = parse_standard_event_results(metadata, raw_rows)
-    else:
-        df = parse_multi_event_results(metadata, raw_rows)
+    return changes, {path: current[path] for path in written}
 
-    # --- Firestore refs ---
-    db = get_firestore_client()
-    meet_doc_ref = (
+def write_events(db, writes: list, field_updates: bool = False) -> list:
+    """
+    Write event documents and keep their meet's materialized standings in step.
+
+    Writes are diffed against the stored event: only fields whose value
+    changed are written, and a write that changes nothing (bookkeeping such as
+    upload_hashes aside) is skipped, with no version bump, standings update or
+    change reported.
+
+    Each changed event gets a version number that goes up by one. The event
+    writes, version bumps and standings delta for one meet/gender commit in a
+    single transaction, so concurrent uploads can't reorder versions or lose
+    standings updates.
+
+    Args:
+        writes: (event_ref, data) pairs. data is a set(merge=True) payload, or
+            {"a.b": value} field updates when field_updates is True. Keys
+            containing '.' must be backtick-quoted, as in FieldPath.to_api_repr().
+
+    Returns:
+        One change per write that changed something, in order:
+        {meet_document_id, gender, event_id, version, updates, results_diff}.
+        updates are the {"a.b": value} field updates that turn version - 1
+        into version; results_diff summarises each changed event_results list
+        (see diff_results).
+
+    Raises:
+        ValueError: the meet doesn't exist (uploads), or a malformed field path.
+        google.api_core.exceptions.NotFound: field updates for a meet or event that doesn't exist.
+    """
+    if field_updates:
+        # Reject bad paths before opening a transaction
+        for _, data in writes:
+            for path in data:
+                split_path(path)
+
+    groups = {}
+    for event_ref, data in writes:
+        gender_ref = event_ref.parent
+        meet_ref = gender_ref.parent
+        groups.setdefault(gender_ref.path, (meet_ref, gender_ref.id, []))[2].append((event_ref, data))
+
+    changes = []
+    for meet_ref, gender, group in groups.values():
+        with phase("firestore_write"):
+            group_changes, events = _write_events_in_transaction(
+                db.transaction(), meet_ref, gender, group, field_updates
+            )
+        for event_ref, version, updates, results_diff in group_changes:
+            changes.append({
+                "meet_document_id": meet_ref.path.split("/", 1)[1],
+                "gender": gender,
+                "event_id": event_ref.id,
+                "version": version,
+                "updates": updates,
+                "results_diff": results_diff,
+            })
+        for path, event in events.items():
+            on_event_write(path, document=event)
+
+    return changes
+
+def get_meet_ref(db, metadata: dict):
+    """meets/{meet_year}/{meet_season}/{meet_id} for parsed event metadata."""
+    return (
         db.collection("meets")
           .document(metadata.get("meet_year"))
           .collection(metadata.get("meet_season"))
           .document(metadata.get("meet_id"))
     )
 
-    if not meet_doc_ref.get().exists:
-        raise ValueError(
-            f"Meet not found for meet_id='{metadata.get('meet_id')}', "
-            f"meet_season='{metadata.get('meet_season')}', "
-            f"meet_year='{metadata.get('meet_year')}'."
-        )
+def get_event_ref(meet_ref, metadata: dict):
+    """The event document under a meet for parsed event metadata."""
+    return meet_ref.collection(metadata.get("event_gender")).document(metadata.get("event_num"))
 
-    event_ref = (
-        meet_doc_ref
-        .collection(metadata.get("event_gender"))
-        .document(metadata.get("event_num"))
-    )
+def prepare_event_update(metadata: dict, raw_rows: list, content_hash: str = None):
+    """
+    Validate and clean already-parsed event rows without writing anything.
+    content_hash (see processors.dedupe) is recorded on the event per round.
+
+    Returns:
+        (event_ref, update_data) to be written with event_ref.set(update_data, merge=True).
+    """
+    print(f"Processing event: {metadata.get('meet_id')} {metadata.get('event_gender')} {metadata.get('event_num')}")
+
+    event_type = metadata.get("event_type")
+    parse_results, clean_results = get_ingest_functions(event_type)
+
+    with phase("results_parse"):
+        results = parse_results(metadata, raw_rows)
+
+    # --- Firestore refs (the meet must exist: checked by write_events, in its transaction) ---
+    meet_doc_ref = get_meet_ref(get_database(), metadata)
+    event_ref = get_event_ref(meet_doc_ref, metadata)
 
     # --- Status rules ---
     VALID_STATUSES = {
@@ -95,11 +326,15 @@ def process_event(file_path: str):
     # --- Build update payload ---
     update_data = {"status": status}
 
+    if content_hash is not None:
+        update_data["upload_hashes"] = {str(event_round): content_hash}
+
     if (
         status in INTERIM_STATUSES
         and event_round in {"prelims", "semifinal"}
     ):
-        cleaned_data = clean_event(df, event_ref)
+        with phase("clean_event"):
+            cleaned_data = clean_results(results, event_ref)
         update_data[event_round] = {
             "event_results": (
                 cleaned_data
@@ -110,7 +345,8 @@ def process_event(file_path: str):
         }
 
     elif status in SCORING_STATUSES:
-        cleaned_data = clean_event(df, event_ref)
+        with phase("clean_event"):
+            cleaned_data = clean_results(results, event_ref)
         update_data["scored"] = {
             "event_results": (
                 cleaned_data
@@ -120,21 +356,32 @@ def process_event(file_path: str):
             "event_round": event_round,
         }
 
+    return event_ref, update_data
 
-    event_ref.set(update_data, merge=True)
-    return metadata
+def get_ingest_functions(event_type: str):
+    """(parse, clean) functions for an event type under EVENT_INGEST."""
+    if EVENT_INGEST == "records":
+        if event_type == "standard":
+            return parse_standard_event_records, clean_event_records
+        return parse_multi_event_records, clean_event_records
+    if EVENT_INGEST == "pandas":
+        if event_type == "standard":
+            return parse_standard_event_results, clean_event
+        return parse_multi_event_results, clean_event
+    raise ValueError(f"Unknown EVENT_INGEST '{EVENT_INGEST}' (expected 'records' or 'pandas')")
 
 def parse_event_metadata(input_dir: str, input_filename: str):
     """
     Reads a CSV, extracts the first-line metadata fields,
     returns metadata and raw data rows.
     """
-    input_csv_path = os.path.join(input_dir, input_filename)
+    return parse_event_csv(os.path.join(input_dir, input_filename))
 
-    if not os.path.exists(input_csv_path):
-        raise FileNotFoundError(f"File not found: {input_csv_path}")
-    
-    with open(input_csv_path, 'r', encoding='utf-8') as f:
+def parse_event_csv(source):
+    """
+    Same as parse_event_metadata() for a path, raw bytes or a file-like object.
+    """
+    with open_text_source(source) as f:
         reader = list(csv.reader(f))
 
     if len(reader) < 2:
@@ -343,96 +590,61 @@ def normalize_round_and_status(event_round: str, event_status: str):
     return round_name, status_name
 
 def infer_gender(event_name: str, meet_season: str) -> str:
-    name = event_name.lower()
-    season = meet_season.lower()
-
-    # Outdoor rules
-    if season == "outdoor":
-        if "decathlon" in name:
-            return "Men"
-        if "heptathlon" in name:
-            return "Women"
-
-    # Indoor rules
-    if season == "indoor":
-        if "heptathlon" in name:
-            return "Men"
-        if "pentathlon" in name:
-            return "Women"
-    
+    """Multi-event CSVs carry no gender: tell it from the event and season (see processors.catalog)."""
+    return multi_event_gender(event_name, meet_season)
+
 def clean_event(df, event_ref):
     """
     Processes an event DataFrame into the same nested structure as score_event(),
     but without assigning scores. Also enriches each athlete with sb_numeric
     from the 'projection' event document if available.
     """
+    # --- Fetch the event document once (read-through cache) ---
+    with phase("event_read"):
+        event_data = document_cache.get(event_ref) or {}
+    # Events seeded before the start list stored these: classify from the name
+    event_name = event_data.get("event_name") or (df["Event Name"].iat[0] if len(df) else "")
+    event_info = classify_event(event_name)
+    event_sort_ascending = event_data.get("sort_ascending", event_info.sort_ascending)
+    event_type = event_data.get("event_type", event_info.event_type)
+
+    # --- Build sb_lookup by athlete_id once per upload ---
+    projection_results = event_data.get("projection", {}).get("event_results", [])
+    sb_lookup = pd.Series(
+        {r["athlete_id"]: r.get("sb_numeric") for r in projection_results if r.get("athlete_id") is not None},
+        dtype=float
+    )
+
+    # --- Build record columns ---
+    raw_id = df["ID"].astype(str).str.strip()
+    athlete_id = pd.to_numeric(raw_id.where(raw_id.str.isdigit()))
+    athlete_name = df["First"].str.cat(df["Last"], sep=" ").str.strip()
+
+    # Relay fix
+    team_name = athlete_name if event_type == 'relay' else df["Team_name"]
+    team_name = team_name.str.strip().str.upper().fillna("")
+
+    seed_numeric = parse_marks(df["Result"]).to_numpy()
+
+    # Update sb_numeric if seed is better than current sb (hash join on athlete_id)
+    # Running / relay events: lower is better (sort_ascending=True)
+    # Field / multi events: higher is better (sort_ascending=False)
+    improve = np.fmin if event_sort_ascending else np.fmax
+    sb_numeric = improve(athlete_id.map(sb_lookup).to_numpy(), seed_numeric)
 
     nested_data = {}
-    genders = df['Event Gender'].unique()
-
-    # Fetch the event document once
-    event_doc = event_ref.get()
-    event_data = event_ref.get().to_dict() if event_doc.exists else {}
-    event_sort_ascending = event_data["sort_ascending"] 
-
-    for gender in genders:
-        nested_data[gender] = {}
-        events = df[df['Event Gender'] == gender]['Event Num'].unique()
-
-        for event in events:
-            event_df = df[(df['Event Gender'] == gender) & (df['Event Num'] == event)]
-
-            # --- Build sb_lookup by athlete_id ---
-            sb_lookup = {}
-            if event_doc.exists and "projection" in event_data:
-                proj = event_data["projection"]
-                event_results = proj.get("event_results", [])
-                for r in event_results:
-                    athlete_id = r.get("athlete_id")
-                    sb_val = r.get("sb_numeric")
-                    if athlete_id is not None:
-                        sb_lookup[athlete_id] = sb_val
-
-            event_type = None
-            if event_doc.exists and "event_type" in event_data:
-                event_type = event_data["event_type"]
-
-            event_records = []
-            for _, row in event_df.iterrows():
-              raw_id = str(row["ID"]).strip()
-              athlete_id = int(raw_id) if raw_id.isdigit() else None
-              athlete_name = f"{row['First']} {row['Last']}".strip()
-
-              seed_val = parse_time_or_distance(row["Result"])
-              sb_val = sb_lookup.get(athlete_id)
-
-              # Update sb_numeric if seed is better than current sb
-              if seed_val is not None:
-                  if sb_val is None:
-                    sb_val = seed_val
-                  else:
-                      # Running / relay events: lower is better (sort_ascending=True)
-                      if event_sort_ascending and seed_val < sb_val:
-                          sb_val = seed_val
-                      # Field / multi events: higher is better (sort_ascending=False)
-                      elif not event_sort_ascending and seed_val > sb_val:
-                          sb_val = seed_val
-              rec = {
-                  "team_name": row["Team_name"].strip() if isinstance(row["Team_name"], str) else None,
-                  "team_abbr": row["Team_abbr"],
-                  "athlete_id": athlete_id,
-                  "athlete_name": athlete_name,
-                  "seed_numeric": seed_val,
-                  "sb_numeric": sb_val
-              }
-
-              # Relay fix
-              if event_type == 'relay':
-                  rec["team_name"] = athlete_name
-
-              rec["team_name"] = rec["team_name"].strip().upper() if isinstance(rec["team_name"], str) and rec["team_name"].strip() else ""
-              event_records.append(rec)
-
-            nested_data[gender][event] = event_records
-
-    return nested_data
\ No newline at end of file
+    columns = zip(
+        df["Event Gender"], df["Event Num"], team_name, df["Team_abbr"],
+        athlete_id.tolist(), athlete_name, seed_numeric.tolist(), sb_numeric.tolist()
+    )
+    for gender, event, team, team_abbr, athlete, name, seed_val, sb_val in columns:
+        nested_data.setdefault(gender, {}).setdefault(event, []).append({
+            "team_name": team,
+            "team_abbr": team_abbr,
+            "athlete_id": None if athlete != athlete else int(athlete),
+            "athlete_name": name,
+            "seed_numeric": None if seed_val != seed_val else seed_val,
+            "sb_numeric": None if sb_val != sb_val else sb_val
+        })
+
+    return nested_data
@@ -0,0 +1,104 @@
+from typing import NamedTuple
+from processors.gcs import parse_time_or_distance
+from processors.metrics import phase
+from processors.cache import document_cache
+from processors.catalog import classify_event
+
+class ResultRow(NamedTuple):
+    """The columns clean_event_records() reads from one result row."""
+    place: str
+    first: str
+    last: str
+    athlete_id: str
+    team_abbr: str
+    team_name: str
+    result: str
+
+class EventResults(NamedTuple):
+    """Result rows of one event CSV with the metadata they are filed under."""
+    event_gender: str
+    event_num: str
+    event_name: str
+    rows: list
+
+# CSV column of each ResultRow field
+STANDARD_COLUMNS = (0, 1, 2, 3, 5, 6, 7)
+MULTI_COLUMNS = (0, 1, 2, 7, 3, 4, 5)
+
+def _result_rows(data_rows: list, columns: tuple) -> list:
+    """Rows with a numeric place, missing trailing columns read as ''."""
+    rows = []
+    for row in data_rows:
+        if not row or not row[0].strip().isdigit():
+            continue
+        rows.append(ResultRow(*(row[i] if i < len(row) else "" for i in columns)))
+    return rows
+
+def _event_results(metadata: dict, rows: list) -> EventResults:
+    return EventResults(metadata["event_gender"], metadata["event_num"], metadata["event_name"], rows)
+
+def parse_standard_event_records(metadata: dict, data_rows: list) -> EventResults:
+    """parse_standard_event_results() without pandas."""
+    return _event_results(metadata, _result_rows(data_rows, STANDARD_COLUMNS))
+
+def parse_multi_event_records(metadata: dict, data_rows: list) -> EventResults:
+    """
+    parse_multi_event_results() without pandas. The first row names the
+    component events; their per-event columns aren't needed for cleaning.
+    """
+    return _event_results(metadata, _result_rows(data_rows[1:], MULTI_COLUMNS))
+
+def _number(value):
+    """float(value), or None for missing and NaN values."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if value != value else value
+
+def clean_event_records(results: EventResults, event_ref):
+    """
+    Same output as clean_event() for parsed records: the nested
+    {gender: {event_num: [athlete, ...]}} structure, with sb_numeric taken
+    from the 'projection' results and improved by the uploaded mark.
+    """
+    # --- Fetch the event document once (read-through cache) ---
+    with phase("event_read"):
+        event_data = document_cache.get(event_ref) or {}
+    # Events seeded before the start list stored these: classify from the name
+    event_name = event_data.get("event_name") or (results.event_name if results.rows else "")
+    event_info = classify_event(event_name)
+    event_sort_ascending = event_data.get("sort_ascending", event_info.sort_ascending)
+    event_type = event_data.get("event_type", event_info.event_type)
+
+    # Running / relay events: lower is better; field / multi events: higher is better
+    improve = min if event_sort_ascending else max
+
+    projection_results = event_data.get("projection", {}).get("event_results", [])
+    sb_lookup = {r["athlete_id"]: r.get("sb_numeric") for r in projection_results if r.get("athlete_id") is not None}
+
+    nested_data = {}
+    for row in results.rows:
+        raw_id = row.athlete_id.strip()
+        athlete_id = int(raw_id) if raw_id.isdigit() else None
+        athlete_name = f"{row.first} {row.last}".strip()
+
+        # Relay fix
+        team_name = athlete_name if event_type == 'relay' else row.team_name
+
+        seed_numeric = _number(parse_time_or_distance(row.result))
+        sb_numeric = _number(sb_lookup.get(athlete_id)) if athlete_id is not None else None
+        if sb_numeric is None:
+            sb_numeric = seed_numeric
+        elif seed_numeric is not None:
+            sb_numeric = improve(sb_numeric, seed_numeric)
+
+        nested_data.setdefault(results.event_gender, {}).setdefault(results.event_num, []).append({
+            "team_name": team_name.strip().upper(),
+            "team_abbr": row.team_abbr,
+            "athlete_id": athlete_id,
+            "athlete_name": athlete_name,
+            "seed_numeric": seed_numeric,
+            "sb_numeric": sb_numeric,
+        })
+
+    return nested_data
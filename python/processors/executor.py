@@ -0,0 +1,56 @@
+import os
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from processors.profiling import profiled
+
+# Threads that run blocking work (pandas parsing, Firestore / GCS SDK calls)
+BLOCKING_WORKERS = int(os.environ.get("BLOCKING_WORKERS", "8"))
+# Max blocking jobs in flight at once; further requests wait their turn
+BLOCKING_CONCURRENCY = int(os.environ.get("BLOCKING_CONCURRENCY", str(BLOCKING_WORKERS)))
+# Budget (seconds) of each run_blocking call, including time spent waiting for a slot
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get("REQUEST_TIMEOUT_SECONDS", "120"))
+
+_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+_slots = asyncio.Semaphore(BLOCKING_CONCURRENCY)
+
+async def run_blocking(func, *args, timeout: float = REQUEST_TIMEOUT_SECONDS, **kwargs):
+    """
+    Run a blocking callable on the bounded executor without stalling the event loop.
+
+    The timeout applies to this call, not to the whole request. A thread
+    can't be interrupted: on timeout the caller stops waiting, but a call
+    that already started runs to completion (a write may still commit) and
+    keeps its concurrency slot until then.
+
+    Raises:
+        TimeoutError: if the call (including the wait for a free slot) exceeds timeout.
+    """
+    # Run in a copy of the caller's context so per-request state (phase timings) follows the work
+    context = contextvars.copy_context()
+    func = profiled(func)
+    loop = asyncio.get_running_loop()
+
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(_slots.release)
+        except RuntimeError:
+            pass  # event loop already closed (shutdown)
+
+    async def run():
+        await _slots.acquire()
+        try:
+            future = _executor.submit(context.run, func, *args, **kwargs)
+        except BaseException:
+            _slots.release()
+            raise
+        # Freed when the thread is done (or the job is cancelled before it started),
+        # not when the caller gives up waiting
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    return await asyncio.wait_for(run(), timeout)
+
+def shutdown_executor():
+    """Stop accepting blocking work and let running jobs finish."""
+    _executor.shutdown(wait=True, cancel_futures=True)
@@ -1,12 +1,28 @@
+import io
 import os
+import json
 import re
-import pandas as pd
-from google.cloud import storage
-from google.cloud import firestore
-from google.oauth2 import service_account
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from processors.lazy import lazy_module
+
+# Imported on first use: keeps them out of the server's cold start
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+storage = lazy_module("google.cloud.storage")
+firestore = lazy_module("google.cloud.firestore")
+service_account = lazy_module("google.oauth2.service_account")
 
 SERVICE_ACCOUNT_FILE = "GOOGLE_APPLICATION_CREDENTIALS.json"
 
+# Firestore accepts at most 500 writes per batch commit
+FIRESTORE_BATCH_LIMIT = 500
+# ... and at most 10 MiB per request: batches are cut below that, estimated from JSON size
+FIRESTORE_BATCH_BYTES = 9 * 1024 * 1024
+FIRESTORE_COMMIT_WORKERS = 8
+
 def slugify(text: str) -> str:
     """Generate a slug from a string."""
     text = text.lower().strip()
@@ -17,32 +33,160 @@ def slugify(text: str) -> str:
     return text
 
 
-def get_firestore_client():
+# Process-wide clients, created once and shared by every request
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _load_credentials():
     """
-    Returns a Firestore client. 
-    
-    If service_account_path is provided, uses that key.
-    Otherwise, uses default credentials (e.g., Cloud Run / GCP environment).
+    Returns service account credentials if the key file exists,
+    otherwise None to use default credentials (e.g., Cloud Run / GCP environment).
     """
     if os.path.isfile(SERVICE_ACCOUNT_FILE):
-        creds = service_account.Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE)
-        return firestore.Client(credentials=creds, project=creds.project_id)
-    else:
-        # Use default credentials (works on GCP)
-        return firestore.Client()
-    
+        return service_account.Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE)
+    return None
+
+def _get_client(name: str, client_class):
+    client = _clients.get(name)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        # Another thread may have created it while we waited on the lock
+        client = _clients.get(name)
+        if client is None:
+            creds = _load_credentials()
+            if creds is not None:
+                client = client_class(credentials=creds, project=creds.project_id)
+            else:
+                client = client_class()
+            _clients[name] = client
+        return client
+
+def get_firestore_client():
+    """
+    Returns the process-wide Firestore client, creating it on first use.
+    The client (and its gRPC channel) is reused across requests.
+    """
+    return _get_client("firestore", firestore.Client)
+
 
 def get_gcs_client():
     """
-    Returns a Google Cloud client. 
+    Returns the process-wide Google Cloud Storage client, creating it on first use.
+    The client (and its HTTP session) is reused across requests.
     """
-    if os.path.isfile(SERVICE_ACCOUNT_FILE):
-        creds = service_account.Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE)
-        return storage.Client(credentials=creds, project=creds.project_id)
+    return _get_client("storage", storage.Client)
+
+def close_clients():
+    """Close and forget every pooled client. Called on application shutdown."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        # Firestore keeps its gRPC channel on the API transport, not the HTTP session
+        firestore_api = getattr(client, "_firestore_api_internal", None)
+        if firestore_api is not None:
+            firestore_api.transport.close()
+        client.close()
+
+def estimate_write_bytes(path: str, data) -> int:
+    """Rough request size of one set-write: its path and JSON-encoded fields, plus framing."""
+    encoded = data if isinstance(data, str) else json.dumps(data, default=str)
+    return len(path) + len(encoded) + 64
+
+def chunk_writes(writes, batch_limit: int = FIRESTORE_BATCH_LIMIT, batch_bytes: int = FIRESTORE_BATCH_BYTES) -> list:
+    """
+    Split (doc_ref, data) writes, in order, into chunks of at most batch_limit
+    writes and (estimated) batch_bytes. A write larger than batch_bytes goes alone.
+    """
+    chunks, chunk, chunk_bytes = [], [], 0
+    for doc_ref, data in writes:
+        write_bytes = estimate_write_bytes(doc_ref.path, data)
+        if chunk and (len(chunk) == batch_limit or chunk_bytes + write_bytes > batch_bytes):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append((doc_ref, data))
+        chunk_bytes += write_bytes
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+class PartialWriteError(Exception):
+    """A chunked commit_writes failed after some of its chunks were committed."""
+
+def commit_writes(db, writes, merge: bool = False, batch_limit: int = FIRESTORE_BATCH_LIMIT,
+                  batch_bytes: int = FIRESTORE_BATCH_BYTES):
+    """
+    Commit a list of (doc_ref, data) set-writes using Firestore write batches.
+    With merge=True each write behaves like doc_ref.set(data, merge=True).
+
+    Writes that fit in a single batch (batch_limit writes, batch_bytes of
+    payload) are committed atomically in one round trip.
+    Larger write sets are chunked: every chunk but the last is committed in
+    parallel, and the last chunk is committed only once all others succeeded.
+    Callers put their "commit marker" document (e.g. the meet document) last.
+
+    Chunked writes are not atomic: when a chunk fails, the chunks already
+    committed stay written (there is no rollback) and the last chunk is never
+    committed. Callers must be able to simply send the same writes again,
+    i.e. write whole documents rather than increments.
+
+    Raises:
+        PartialWriteError: a chunk failed after others were committed (the
+            original error is chained). A failure with nothing committed is
+            raised as is.
+    """
+    chunks = chunk_writes(writes, batch_limit, batch_bytes)
+    committed = []
+
+    def commit(chunk):
+        batch = db.batch()
+        for doc_ref, data in chunk:
+            batch.set(doc_ref, data, merge=merge)
+        batch.commit()
+        committed.append(len(chunk))
+
+    *leading_chunks, last_chunk = chunks or [[]]
+    try:
+        if leading_chunks:
+            with ThreadPoolExecutor(max_workers=FIRESTORE_COMMIT_WORKERS) as executor:
+                # list() re-raises the first failed commit
+                list(executor.map(commit, leading_chunks))
+        if last_chunk:
+            commit(last_chunk)
+    except Exception as e:
+        if not committed:
+            raise
+        raise PartialWriteError(
+            f"{sum(committed)} of {len(writes)} writes were committed before a batch failed: {e}"
+        ) from e
+
+    return len(writes)
+
+@contextmanager
+def open_text_source(source):
+    """
+    Open a CSV/INI source for reading as text.
+
+    Args:
+        source: A local file path, raw bytes, or a file-like object (binary or text).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        with open(source, 'r', encoding='utf-8') as f:
+            yield f
+        return
+
+    if hasattr(source, 'read'):
+        source = source.read()
+
+    if isinstance(source, str):
+        yield io.StringIO(source)
     else:
-        # Use default credentials (works on GCP)
-        return storage.Client()
-    
+        yield io.TextIOWrapper(io.BytesIO(source), encoding='utf-8')
 
 def upload_file_to_gcs(client, bucket_name, local_file_path, blob_name):
     bucket = client.bucket(bucket_name)
@@ -50,18 +194,30 @@ def upload_file_to_gcs(client, bucket_name, local_file_path, blob_name):
     blob.upload_from_filename(local_file_path)
     print(f"Uploaded '{blob_name}' to bucket '{bucket_name}'.")
 
-def parse_time_or_distance(seed_value):
-    if pd.isna(seed_value) or not isinstance(seed_value, str):
-        return None
-    seed_str = seed_value.strip().lower()
+def to_nullable(data):
+    """Object-typed copy of a Series/DataFrame with missing values as None (Firestore-safe)."""
+    return data.astype(object).where(data.notna(), None)
+
+# Bounded cache of mark string -> parsed value, shared by the scalar and batch parsers
+MARK_CACHE_SIZE = 8192
+_mark_cache = OrderedDict()
+_mark_cache_lock = threading.Lock()
+_MISSING = object()
+
+_NON_NUMERIC_PATTERN = re.compile(r'[^\d\.\-]')
+_UNIT_PATTERN = re.compile(r'm|ft|&frac')
+
+def _parse_mark(seed_str: str):
+    """Parse one raw mark string ('m:ss.xx', '7.45m', '21-04&frac12;', '6.71')."""
+    seed_str = seed_str.strip().lower()
     if ':' in seed_str:
         parts = seed_str.split(':')
         try:
             return float(parts[0]) * 60 + float(parts[1])
         except ValueError:
             return None
-    if 'm' in seed_str or 'ft' in seed_str or '&frac' in seed_str:
-        numeric_str = re.sub(r'[^\d\.\-]', '', seed_str)
+    if _UNIT_PATTERN.search(seed_str):
+        numeric_str = _NON_NUMERIC_PATTERN.sub('', seed_str)
         try:
             return float(numeric_str)
         except ValueError:
@@ -69,4 +225,68 @@ def parse_time_or_distance(seed_value):
     try:
         return float(seed_str)
     except ValueError:
-        return None
\ No newline at end of file
+        return None
+
+def _cache_lookup(marks):
+    """Return ({mark: value} for cached marks, [uncached marks])."""
+    found, missing = {}, []
+    with _mark_cache_lock:
+        for mark in marks:
+            value = _mark_cache.get(mark, _MISSING)
+            if value is _MISSING:
+                missing.append(mark)
+            else:
+                _mark_cache.move_to_end(mark)
+                found[mark] = value
+    return found, missing
+
+def _cache_store(parsed: dict):
+    with _mark_cache_lock:
+        _mark_cache.update(parsed)
+        while len(_mark_cache) > MARK_CACHE_SIZE:
+            _mark_cache.popitem(last=False)
+
+def parse_marks(values):
+    """
+    Parse a whole Series or list of mark strings at once.
+
+    The input is factorized so each distinct string is handled once; distinct
+    strings are served from the shared mark cache or parsed and cached.
+
+    Returns:
+        A float Series (NaN for missing/unparseable marks) aligned with the
+        input when given a Series, otherwise a list of floats or None.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = pd.factorize(series)
+    unique_marks = [mark if isinstance(mark, str) else None for mark in uniques]
+
+    found, missing = _cache_lookup(mark for mark in unique_marks if mark is not None)
+    if missing:
+        parsed = {mark: _parse_mark(mark) for mark in missing}
+        _cache_store(parsed)
+        found.update(parsed)
+
+    lookup = np.array(
+        [np.nan if found.get(mark) is None else found[mark] for mark in unique_marks] + [np.nan],
+        dtype=float
+    )
+    # factorize marks missing values with code -1, which picks the trailing NaN
+    result = lookup[codes]
+
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return [None if np.isnan(value) else float(value) for value in result]
+
+def parse_time_or_distance(seed_value):
+    """Parse a single mark. Thin wrapper over the cached mark parser."""
+    if not isinstance(seed_value, str):
+        return None
+
+    found, _ = _cache_lookup([seed_value])
+    if seed_value in found:
+        return found[seed_value]
+
+    value = _parse_mark(seed_value)
+    _cache_store({seed_value: value})
+    return value
@@ -0,0 +1,37 @@
+import importlib
+import threading
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access, so
+    heavy dependencies (pandas, NumPy, the Google Cloud clients, gRPC) stay
+    out of the server's cold start until a request needs them.
+
+        pd = lazy_module("pandas")   # nothing imported yet
+        pd.DataFrame(...)            # imports pandas
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        module = self._module
+        if module is None:
+            module = self._load()
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_module(name: str) -> LazyModule:
+    """A LazyModule for name (e.g. "numpy", "google.cloud.firestore")."""
+    return LazyModule(name)
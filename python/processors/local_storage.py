@@ -0,0 +1,599 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import nullcontext
+from processors.lazy import lazy_module
+from processors.cache import deep_merge
+from processors.gcs import estimate_write_bytes, FIRESTORE_BATCH_BYTES
+
+exceptions = lazy_module("google.api_core.exceptions")
+
+# --- Local storage for venue operation ---
+#
+# LocalDatabase and LocalBucket mirror the subset of the Firestore client and
+# GCS bucket APIs the processors use, backed by one SQLite file and a blob
+# directory. Every write also appends to an outbox table in the same SQLite
+# transaction; CloudSync replays the outbox to Firestore/GCS in order.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    collection TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_collection ON documents (collection);
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS outbox_failed (
+    seq INTEGER PRIMARY KEY,
+    op TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+# Outbox entries replayed through Firestore write batches
+_DOCUMENT_OPS = ("set", "delete")
+
+def is_transient(error: Exception) -> bool:
+    """
+    True for sync errors that say nothing about the entry itself (connectivity,
+    overload): those are retried for as long as it takes, never given up on.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return isinstance(error, (
+        exceptions.ServiceUnavailable, exceptions.DeadlineExceeded, exceptions.TooManyRequests,
+        exceptions.InternalServerError, exceptions.RetryError, exceptions.Unauthenticated,
+    ))
+
+def split_field_path(field_path: str) -> list:
+    """'a.b' or FieldPath(...).to_api_repr() ('teams.`TEAM A`') -> ['teams', 'TEAM A']."""
+    parts, current, quoted, escaped = [], [], False, False
+    for char in field_path:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\" and quoted:
+            escaped = True
+        elif char == "`":
+            quoted = not quoted
+        elif char == "." and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+def apply_update(data: dict, updates: dict) -> dict:
+    """Apply Firestore update() field paths to a document dict, in place."""
+    for field_path, value in updates.items():
+        *parents, leaf = split_field_path(field_path)
+        target = data
+        for key in parents:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[leaf] = value
+    return data
+
+class LocalSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return self._data
+
+class LocalDocumentReference:
+    def __init__(self, db, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self):
+        return LocalCollectionReference(self._db, self.path.rsplit("/", 1)[0])
+
+    def collection(self, name: str):
+        return LocalCollectionReference(self._db, f"{self.path}/{name}")
+
+    def get(self, transaction=None):
+        return LocalSnapshot(self, self._db._read(self.path))
+
+    def set(self, data: dict, merge: bool = False):
+        self._db._commit([("set", self, data, merge)])
+
+    def update(self, updates: dict):
+        self._db._commit([("update", self, updates, False)])
+
+    def delete(self):
+        self._db._commit([("delete", self, None, False)])
+
+class LocalCollectionReference:
+    def __init__(self, db, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self):
+        if "/" not in self.path:
+            return None
+        return LocalDocumentReference(self._db, self.path.rsplit("/", 1)[0])
+
+    def document(self, document_id: str):
+        return LocalDocumentReference(self._db, f"{self.path}/{document_id}")
+
+    def stream(self, transaction=None):
+        for path, data in self._db._list(self.path):
+            yield LocalSnapshot(LocalDocumentReference(self._db, path), data)
+
+class LocalWriteBatch:
+    """Buffered writes applied atomically on commit(), like a Firestore WriteBatch."""
+
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, doc_ref, data: dict, merge: bool = False):
+        self._writes.append(("set", doc_ref, data, merge))
+
+    def update(self, doc_ref, updates: dict):
+        self._writes.append(("update", doc_ref, updates, False))
+
+    def delete(self, doc_ref):
+        self._writes.append(("delete", doc_ref, None, False))
+
+    def commit(self):
+        self._db._commit(self._writes)
+        self._writes = []
+
+class LocalTransaction(LocalWriteBatch):
+    """
+    Runs a transactional function under the database lock, so it never has
+    to retry: reads see committed data and the buffered writes are applied
+    together when the function returns.
+    """
+
+    def run(self, func, *args, **kwargs):
+        with self._db._lock:
+            self._writes = []
+            result = func(self, *args, **kwargs)
+            self.commit()
+            return result
+
+class LocalBulkWriter:
+    """Stand-in for Firestore's BulkWriter in recursive_delete()."""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def on_write_result(self, callback):
+        self._callbacks.append(callback)
+
+class LocalDatabase:
+    """SQLite-backed document store with the Firestore client's reference API."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # Set on every write so the sync thread wakes up
+        self.written = threading.Event()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Client API ---
+
+    def collection(self, name: str):
+        return LocalCollectionReference(self, name)
+
+    def document(self, path: str):
+        return LocalDocumentReference(self, path)
+
+    def batch(self):
+        return LocalWriteBatch(self)
+
+    def transaction(self):
+        return LocalTransaction(self)
+
+    def bulk_writer(self, options=None):
+        return LocalBulkWriter()
+
+    def recursive_delete(self, doc_ref, bulk_writer=None) -> int:
+        """Delete a document and everything under it; synced as one recursive delete."""
+        prefix = f"{doc_ref.path}/"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                paths = [
+                    row[0] for row in self._conn.execute(
+                        "SELECT path FROM documents WHERE path = ? OR substr(path, 1, ?) = ?",
+                        (doc_ref.path, len(prefix), prefix),
+                    )
+                ]
+                self._conn.executemany("DELETE FROM documents WHERE path = ?", [(path,) for path in paths])
+                self._enqueue("delete_tree", doc_ref.path)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.written.set()
+
+        for callback in (bulk_writer._callbacks if bulk_writer is not None else []):
+            for _ in paths:
+                callback()
+        return len(paths)
+
+    # --- Storage ---
+
+    def _read(self, path: str):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM documents WHERE path = ?", (path,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _list(self, collection: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, data FROM documents WHERE collection = ? ORDER BY path", (collection,)
+            ).fetchall()
+        return [(path, json.loads(data)) for path, data in rows]
+
+    def _enqueue(self, op: str, path: str, data: str = None):
+        """Append to the outbox; call inside the write's SQLite transaction."""
+        self._conn.execute(
+            "INSERT INTO outbox (op, path, data, enqueued_at) VALUES (?, ?, ?, ?)",
+            (op, path, data, time.time()),
+        )
+
+    def _commit(self, writes: list):
+        """
+        Apply (op, doc_ref, data, merge) writes in one SQLite transaction.
+        Each write queues the document's resulting state (or its deletion) for
+        the cloud, so replaying the outbox is idempotent.
+        """
+        if not writes:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for op, doc_ref, data, merge in writes:
+                    path = doc_ref.path
+                    if op == "delete":
+                        self._conn.execute("DELETE FROM documents WHERE path = ?", (path,))
+                        self._enqueue("delete", path)
+                        continue
+
+                    current = self._read(path)
+                    if op == "update":
+                        if current is None:
+                            raise exceptions.NotFound(f"No document to update: {path}")
+                        document = apply_update(current, data)
+                    elif merge and current is not None:
+                        deep_merge(current, data)
+                        document = current
+                    else:
+                        document = json.loads(json.dumps(data, default=str))
+
+                    encoded = json.dumps(document, default=str)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO documents (path, collection, data) VALUES (?, ?, ?)",
+                        (path, path.rsplit("/", 1)[0], encoded),
+                    )
+                    self._enqueue("set", path, encoded)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.written.set()
+
+    # --- Outbox ---
+
+    def pending(self, limit: int) -> list:
+        """Oldest outbox entries first: (seq, op, path, data, attempts)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, op, path, data, attempts FROM outbox ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+
+    def acknowledge(self, last_seq: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE seq <= ?", (last_seq,))
+
+    def record_failure(self, seqs: list, error: str):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE seq = ?",
+                [(error, seq) for seq in seqs],
+            )
+
+    def move_to_failed(self, seq: int):
+        """Take an entry out of the outbox (unblocking the ones after it) into outbox_failed."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO outbox_failed "
+                    "SELECT seq, op, path, data, enqueued_at, attempts, last_error, ? FROM outbox WHERE seq = ?",
+                    (time.time(), seq),
+                )
+                self._conn.execute("DELETE FROM outbox WHERE seq = ?", (seq,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def failed(self, limit: int = 20) -> list:
+        """Most recently failed entries first, as dicts."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, op, path, attempts, last_error, failed_at FROM outbox_failed "
+                "ORDER BY failed_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            dict(zip(("seq", "op", "path", "attempts", "last_error", "failed_at"), row)) for row in rows
+        ]
+
+    def outbox_stats(self) -> dict:
+        with self._lock:
+            count, oldest, attempts = self._conn.execute(
+                "SELECT COUNT(*), MIN(enqueued_at), MAX(attempts) FROM outbox"
+            ).fetchone()
+            failed = self._conn.execute("SELECT COUNT(*) FROM outbox_failed").fetchone()[0]
+        return {
+            "pending": count,
+            "oldest_pending_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "max_attempts": attempts or 0,
+            "failed": failed,
+            "failed_entries": self.failed(),
+        }
+
+class LocalBlob:
+    def __init__(self, bucket, name: str):
+        self.bucket = bucket
+        self.name = name
+        self.content_type = None
+        self._file = bucket._file(name)
+
+    def upload_from_string(self, data, content_type: str = None):
+        self.content_type = content_type
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        os.makedirs(os.path.dirname(self._file), exist_ok=True)
+        temp_file = f"{self._file}.tmp-{threading.get_ident()}"
+        with open(temp_file, "wb") as f:
+            f.write(data)
+        os.replace(temp_file, self._file)
+        self.bucket._db_enqueue("upload_blob", self.name, content_type)
+
+    def upload_from_filename(self, filename: str, content_type: str = None):
+        with open(filename, "rb") as f:
+            self.upload_from_string(f.read(), content_type=content_type)
+
+    def download_as_bytes(self) -> bytes:
+        try:
+            with open(self._file, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise exceptions.NotFound(f"No such object: {self.name}")
+
+    def delete(self):
+        try:
+            os.remove(self._file)
+        except FileNotFoundError:
+            raise exceptions.NotFound(f"No such object: {self.name}")
+        self.bucket._db_enqueue("delete_blob", self.name)
+
+class LocalBucket:
+    """Blob directory with the GCS bucket API the app uses; writes are synced via the outbox."""
+
+    def __init__(self, root: str, db: LocalDatabase, name: str):
+        self.root = os.path.abspath(root)
+        self.name = name
+        self._db = db
+        os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def client(self):
+        # delete_blobs() batches through bucket.client.batch()
+        return self
+
+    def batch(self):
+        return nullcontext()
+
+    def blob(self, name: str):
+        return LocalBlob(self, name)
+
+    def rename_blob(self, blob, new_name: str):
+        """Move blob to new_name (synced as an upload of new_name and a delete of the old name)."""
+        new_blob = LocalBlob(self, new_name)
+        os.makedirs(os.path.dirname(new_blob._file), exist_ok=True)
+        try:
+            os.replace(blob._file, new_blob._file)
+        except FileNotFoundError:
+            raise exceptions.NotFound(f"No such object: {blob.name}")
+        new_blob.content_type = blob.content_type
+        self._db_enqueue("upload_blob", new_name, blob.content_type)
+        self._db_enqueue("delete_blob", blob.name)
+        return new_blob
+
+    def list_blobs(self, prefix: str = ""):
+        for directory, _, files in os.walk(self.root):
+            for file_name in files:
+                name = os.path.relpath(os.path.join(directory, file_name), self.root).replace(os.sep, "/")
+                if name.startswith(prefix) and ".tmp-" not in name:
+                    yield LocalBlob(self, name)
+
+    def _file(self, name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid blob name '{name}'")
+        return path
+
+    def _db_enqueue(self, op: str, name: str, data: str = None):
+        with self._db._lock:
+            self._db._enqueue(op, name, data)
+        self._db.written.set()
+
+class CloudSync:
+    """
+    Write-behind replication of the local outbox to Firestore and GCS.
+
+    Entries are replayed strictly in write order: consecutive document writes
+    go out as one Firestore batch (within its size limit), and a failing entry is retried with
+    exponential backoff before anything after it is sent. Entries of a failed
+    batch are retried one at a time, so the one at fault is found; an entry the
+    cloud keeps rejecting (max_attempts, connectivity errors aside) moves to
+    outbox_failed and the rest carry on. The outbox lives in SQLite, so
+    unsynced writes survive restarts.
+    """
+
+    def __init__(self, db: LocalDatabase, bucket: LocalBucket, cloud_db, cloud_bucket,
+                 batch_size: int, retry_max_seconds: float, interval_seconds: float,
+                 max_attempts: int = 10):
+        self.db = db
+        self.bucket = bucket
+        self.cloud_db = cloud_db
+        self.cloud_bucket = cloud_bucket
+        self.batch_size = batch_size
+        self.retry_max_seconds = retry_max_seconds
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self._stop = threading.Event()
+        self._thread = None
+        self.synced = 0
+        self.failures = 0
+        self.given_up = 0
+        self.last_error = None
+        self.last_synced_at = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="cloud-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is not None:
+            self._stop.set()
+            self.db.written.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        backoff = min(1.0, self.retry_max_seconds)
+        while not self._stop.is_set():
+            self.db.written.clear()
+            try:
+                sent = self.sync_once()
+                backoff = min(1.0, self.retry_max_seconds)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                print(f"⚠️ Cloud sync failed, retrying in {backoff:.0f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.retry_max_seconds)
+                continue
+            if sent < self.batch_size:
+                # Caught up: sleep until the next local write (or the interval)
+                self.db.written.wait(self.interval_seconds)
+
+    def sync_once(self) -> int:
+        """Send the oldest outbox entries; returns how many were synced."""
+        entries = self.db.pending(self.batch_size)
+        sent = 0
+        while sent < len(entries):
+            seq, op, path, data, attempts = entries[sent]
+            end = sent + 1
+            # Consecutive document writes go out as one atomic batch, where only
+            # the latest state of each document matters. Entries that already
+            # failed go alone, so a bad one can't sink its neighbours again.
+            if op in _DOCUMENT_OPS and not attempts:
+                batch_bytes = estimate_write_bytes(path, data or "")
+                while end < len(entries) and entries[end][1] in _DOCUMENT_OPS and not entries[end][4]:
+                    batch_bytes += estimate_write_bytes(entries[end][2], entries[end][3] or "")
+                    if batch_bytes > FIRESTORE_BATCH_BYTES:
+                        break
+                    end += 1
+            try:
+                if op in _DOCUMENT_OPS:
+                    latest = {}
+                    for _, doc_op, doc_path, doc_data, _ in entries[sent:end]:
+                        latest.pop(doc_path, None)
+                        latest[doc_path] = (doc_op, doc_data)
+
+                    batch = self.cloud_db.batch()
+                    for doc_path, (doc_op, doc_data) in latest.items():
+                        if doc_op == "set":
+                            batch.set(self.cloud_db.document(doc_path), json.loads(doc_data))
+                        else:
+                            batch.delete(self.cloud_db.document(doc_path))
+                    batch.commit()
+                else:
+                    self._send(op, path, data)
+            except Exception as e:
+                self.db.record_failure([entry[0] for entry in entries[sent:end]], str(e))
+                if end - sent > 1 or attempts + 1 < self.max_attempts or is_transient(e):
+                    raise
+                self.db.move_to_failed(seq)
+                self.failures += 1
+                self.given_up += 1
+                self.last_error = str(e)
+                print(f"⚠️ Gave up syncing {op} {path} after {attempts + 1} attempts, moved to outbox_failed: {e}")
+                sent = end
+                continue
+
+            self.db.acknowledge(entries[end - 1][0])
+            self.synced += end - sent
+            self.last_synced_at = time.time()
+            sent = end
+        return sent
+
+    def _send(self, op: str, path: str, data: str):
+        if op == "delete_tree":
+            self.cloud_db.recursive_delete(self.cloud_db.document(path))
+        elif op == "upload_blob":
+            try:
+                content = self.bucket.blob(path).download_as_bytes()
+            except exceptions.NotFound:
+                return  # deleted locally since; its delete_blob entry follows
+            self.cloud_bucket.blob(path).upload_from_string(content, content_type=data)
+        elif op == "delete_blob":
+            try:
+                self.cloud_bucket.blob(path).delete()
+            except exceptions.NotFound:
+                pass
+        else:
+            raise ValueError(f"Unknown outbox operation '{op}'")
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "synced": self.synced,
+            "failures": self.failures,
+            "given_up": self.given_up,
+            "last_error": self.last_error,
+            "last_synced_at": self.last_synced_at,
+            **self.db.outbox_stats(),
+        }
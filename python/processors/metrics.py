@@ -0,0 +1,147 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Histogram buckets: request/phase durations (seconds) and upload sizes (bytes)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))  # 1 KiB .. 64 MiB
+
+METRICS_PREFIX = "flash_"
+
+# /stats keys that only ever go up (since the process started): exported as
+# counters, every other numeric stat is a gauge
+COUNTER_STATS = frozenset({
+    "published", "delivered", "dropped", "coalesced", "connected_total", "disconnected_total",
+    "received", "errors", "publish_errors",
+    "hits", "misses", "checks", "duplicates", "memory_hits", "stored_hits",
+    "synced", "failures", "given_up",
+})
+
+# Phase name -> seconds for the request being handled (None outside requests)
+_request_phases = contextvars.ContextVar("request_phases", default=None)
+
+class Histogram:
+    """Prometheus-style cumulative histogram with labels."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple, buckets: tuple = DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, values in series:
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key))
+            sep = "," if labels else ""
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="{bound:g}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels}{sep}le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {values[-1]}")
+        return lines
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+REQUEST_SECONDS = Histogram(
+    f"{METRICS_PREFIX}http_request_duration_seconds",
+    "Time to produce the response (headers, for streams)",
+    ("method", "route", "status"),
+)
+PHASE_SECONDS = Histogram(
+    f"{METRICS_PREFIX}phase_duration_seconds",
+    "Time spent in each processing phase",
+    ("phase",),
+)
+UPLOAD_BYTES = Histogram(
+    f"{METRICS_PREFIX}upload_size_bytes",
+    "Size of uploaded files",
+    ("endpoint",),
+    SIZE_BUCKETS,
+)
+
+# --- Per-request phase timing ---
+
+def start_request_timing() -> dict:
+    """Collect phase() timings for the current request (and the threads it runs work on)."""
+    phases = {}
+    _request_phases.set(phases)
+    return phases
+
+@contextmanager
+def phase(name: str):
+    """
+    Time a block as phase name: observed in PHASE_SECONDS and added to the
+    current request's Server-Timing. Repeated or concurrent phases add up.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_SECONDS.observe(elapsed, phase=name)
+        phases = _request_phases.get()
+        if phases is not None:
+            phases[name] = phases.get(name, 0.0) + elapsed
+
+def server_timing_header(phases: dict, total_seconds: float) -> str:
+    """Server-Timing value, e.g. 'csv_parse;dur=3.1, firestore_write;dur=41.0, total;dur=52.7'."""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+def observe_upload(endpoint: str, size: int):
+    UPLOAD_BYTES.observe(size, endpoint=endpoint)
+
+# --- Exposition ---
+
+def render_metrics(sections: dict) -> str:
+    """
+    Prometheus text format: the histograms above plus the stats taken from
+    {section: stats dict}, e.g. {"stream": broadcaster.stats()} becomes
+    flash_stream_subscribers (gauge), flash_stream_published (counter), ...
+    Only numeric (and boolean) stats are exported.
+    """
+    lines = []
+    for histogram in (REQUEST_SECONDS, PHASE_SECONDS, UPLOAD_BYTES):
+        lines.extend(histogram.render())
+
+    for section, stats in sections.items():
+        for key, leaf, value in _numeric_items(stats):
+            name = f"{METRICS_PREFIX}{section}_{key}"
+            kind = "counter" if leaf in COUNTER_STATS else "gauge"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+def _numeric_items(stats: dict, prefix: str = ""):
+    """(flattened key, own key, value) for each numeric stat, nested dicts included."""
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            yield from _numeric_items(value, f"{prefix}{key}_")
+        elif isinstance(value, (int, float)):
+            yield f"{prefix}{key}", key, value
+
+def _format_value(value) -> str:
+    # Exact for ints (":g" would print 1234567 as 1.23457e+06), shortest round-trip for floats
+    if isinstance(value, bool):
+        return str(int(value))
+    return str(value) if isinstance(value, int) else repr(value)
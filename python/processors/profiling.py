@@ -0,0 +1,231 @@
+import os
+import sys
+import hmac
+import time
+import uuid
+import random
+import marshal
+import pstats
+import cProfile
+import threading
+import functools
+import contextvars
+from collections import Counter, deque
+from processors.storage import get_bucket
+
+# Shared secret: requests sent with "X-Profile: <token>" are profiled (empty disables profiling)
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+# Most profiles taken per minute, whatever triggered them
+PROFILE_MAX_PER_MINUTE = int(os.environ.get("PROFILE_MAX_PER_MINUTE", "6"))
+# Stack sampling period for the collapsed-stack (flamegraph) output
+PROFILE_SAMPLE_INTERVAL_SECONDS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_SECONDS", "0.005"))
+# "local" writes to PROFILE_DIR, "gcs" uploads to profiles/ in the storage bucket
+PROFILE_OUTPUT = os.environ.get("PROFILE_OUTPUT", "local")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+
+PROFILED_ROUTES = {"/upload_event", "/upload_merged_start_list"}
+
+# Profile of the request being handled, if it is being profiled
+_active_profile = contextvars.ContextVar("active_profile", default=None)
+
+class RequestProfile:
+    """
+    Profile of one request's blocking work. Each run_blocking call runs under
+    its own cProfile (merged when the request ends) while a sampler thread
+    records the stacks of the threads doing the work.
+    """
+
+    def __init__(self, name: str, interval: float = PROFILE_SAMPLE_INTERVAL_SECONDS):
+        self.name = name
+        self.interval = interval
+        self.profiles = []
+        self.stacks = Counter()
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profile-{name}", daemon=True)
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def run(self, func, *args, **kwargs):
+        """Call func on this thread under cProfile and stack sampling."""
+        profile = cProfile.Profile()
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads.add(ident)
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._threads.discard(ident)
+                self.profiles.append(profile)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                threads = list(self._threads)
+            if not threads:
+                continue
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[collapse_stack(frame)] += 1
+
+    def stats_bytes(self) -> bytes:
+        """Merged cProfile stats in the pstats file format (load with pstats/snakeviz)."""
+        stats = pstats.Stats(*self.profiles)
+        return marshal.dumps(stats.stats)
+
+    def collapsed(self) -> bytes:
+        """Sampled stacks as 'outer;...;inner count' lines, for flamegraph.pl / speedscope."""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+def collapse_stack(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+def background_context() -> contextvars.Context:
+    """Copy of the current context for work that outlives the request: no profile attached."""
+    context = contextvars.copy_context()
+    context.run(_active_profile.set, None)
+    return context
+
+def profiled(func):
+    """
+    func itself, or a wrapper that runs it under the calling request's profile.
+    Call it on the request's side, before handing func to a worker thread.
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        return func
+    return functools.partial(profile.run, func)
+
+class Profiler:
+    """
+    Decides which requests are profiled and writes their profiles.
+
+    A request is profiled when it carries the X-Profile token, or is picked
+    by the admin toggle (sample_rate of upload requests, until `requests`
+    profiles were taken). Either way at most max_per_minute profiles are
+    taken and only one at a time, so leaving it enabled is safe.
+    """
+
+    def __init__(self, token: str = PROFILE_TOKEN, max_per_minute: int = PROFILE_MAX_PER_MINUTE):
+        self.token = token
+        self.max_per_minute = max_per_minute
+        self.sample_rate = 0.0
+        self.remaining = 0
+        self._recent = deque()
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self.taken = 0
+        self.rate_limited = 0
+        self.last_profile = None
+
+    def authorized(self, token: str) -> bool:
+        return bool(self.token) and token is not None and hmac.compare_digest(token, self.token)
+
+    def configure(self, sample_rate: float, requests: int):
+        """Admin toggle: profile sample_rate of upload requests, at most `requests` of them."""
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if requests < 0:
+            raise ValueError("requests must not be negative")
+        with self._lock:
+            self.sample_rate = sample_rate
+            self.remaining = requests
+
+    def begin(self, path: str, header: str = None):
+        """A started RequestProfile if this request should be profiled, else None."""
+        if path not in PROFILED_ROUTES:
+            return None
+
+        requested = self.authorized(header)
+        with self._lock:
+            sampled = not requested and self.remaining > 0 and random.random() < self.sample_rate
+            if not requested and not sampled:
+                return None
+
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_per_minute or not self._busy.acquire(blocking=False):
+                self.rate_limited += 1
+                return None
+
+            self._recent.append(now)
+            if sampled:
+                self.remaining -= 1
+
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{path.strip('/')}-{uuid.uuid4().hex[:8]}"
+        profile = RequestProfile(name)
+        profile.start()
+        return profile
+
+    def activate(self, profile: RequestProfile):
+        """Make profile the current request's profile; returns a token for deactivate()."""
+        return _active_profile.set(profile)
+
+    def deactivate(self, token):
+        _active_profile.reset(token)
+
+    def finish(self, profile: RequestProfile) -> list:
+        """
+        Stop profiling and write <name>.prof and <name>.collapsed (PROFILE_OUTPUT).
+        Returns the written paths; none if no blocking work ran.
+        """
+        try:
+            profile.stop()
+            if not profile.profiles:
+                return []
+
+            bucket = get_bucket() if PROFILE_OUTPUT == "gcs" else None
+            outputs = {f"{profile.name}.prof": profile.stats_bytes(), f"{profile.name}.collapsed": profile.collapsed()}
+            paths = []
+            for file_name, data in outputs.items():
+                if bucket is not None:
+                    blob_name = f"profiles/{file_name}"
+                    bucket.blob(blob_name).upload_from_string(data, content_type="application/octet-stream")
+                    paths.append(f"gs://{bucket.name}/{blob_name}")
+                else:
+                    os.makedirs(PROFILE_DIR, exist_ok=True)
+                    path = os.path.join(PROFILE_DIR, file_name)
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    paths.append(path)
+
+            with self._lock:
+                self.taken += 1
+                self.last_profile = paths
+            print(f"🔬 Profile written: {', '.join(paths)}")
+            return paths
+        finally:
+            self._busy.release()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": bool(self.token),
+                "sample_rate": self.sample_rate,
+                "remaining": self.remaining,
+                "max_per_minute": self.max_per_minute,
+                "output": PROFILE_OUTPUT,
+                "taken": self.taken,
+                "rate_limited": self.rate_limited,
+                "last_profile": self.last_profile,
+            }
+
+profiler = Profiler()
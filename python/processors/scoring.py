@@ -0,0 +1,320 @@
+import functools
+from processors.lazy import lazy_module
+from processors.storage import get_database, transactional
+from processors.cache import document_cache, standings_cache
+from .constants import POINTS_SYSTEM
+
+np = lazy_module("numpy")
+field_path = lazy_module("google.cloud.firestore_v1.field_path")
+
+GENDERS = ["men", "women"]
+STANDINGS_COLLECTION = "standings"
+
+# Statuses whose results come from the 'scored' payload (see config.store.js getEventResults)
+SCORED_RESULT_STATUSES = {"scored", "scored-protest", "scored-under-review"}
+# Statuses that fall back to semifinal -> prelim -> projection results
+PROJECTED_RESULT_STATUSES = {
+    "official", "complete", "protest", "under-review", "in-progress",
+    "projected", "scheduled", "standings",
+}
+
+@functools.cache
+def _cumulative_points():
+    """_cumulative_points()[k] = points for places 1..k combined."""
+    return np.cumsum([0] + [POINTS_SYSTEM[p] for p in range(1, max(POINTS_SYSTEM) + 1)], dtype=float)
+
+def get_event_results(event: dict) -> list:
+    """Pick the result list the standings are based on for an event document."""
+    status = event.get("status")
+
+    if status in SCORED_RESULT_STATUSES:
+        return (event.get("scored") or {}).get("event_results") or []
+
+    if status in PROJECTED_RESULT_STATUSES:
+        for round_key in ("semifinal", "prelim", "projection"):
+            payload = event.get(round_key)
+            if payload is not None and payload.get("event_results") is not None:
+                return payload["event_results"]
+
+    return []
+
+def rank_and_score(marks, ascending: bool = True):
+    """
+    Rank marks and split points for ties, matching the frontend's rankAndScoreEvent.
+
+    Missing marks (None/NaN) get no place and 0 points. Zero marks are placed
+    after every non-zero mark, like the frontend's `|| Infinity` sort.
+
+    Args:
+        marks: Sequence of numeric marks (times, distances or points).
+        ascending: True when lower marks are better.
+
+    Returns:
+        (order, places, scores): order is the indices of marks best-first;
+        places (float, NaN when unplaced) and scores are aligned with order.
+    """
+    marks = np.array([np.nan if m is None else m for m in marks], dtype=float)
+    valid = ~np.isnan(marks)
+
+    sort_key = np.where(valid & (marks != 0), marks if ascending else -marks, np.inf)
+    order = np.argsort(sort_key, kind="stable")
+
+    sorted_marks = marks[order]
+    sorted_valid = valid[order]
+
+    places = np.full(len(marks), np.nan)
+    scores = np.zeros(len(marks))
+    if not sorted_valid.any():
+        return order, places, scores
+
+    # Runs of equal consecutive marks tie. Missing marks (NaN) never equal
+    # anything, so they end a run and are skipped without using up a place.
+    run_starts = np.flatnonzero(np.r_[True, sorted_marks[1:] != sorted_marks[:-1]])
+    run_sizes = np.diff(np.r_[run_starts, len(marks)])
+    placed_before = np.cumsum(sorted_valid) - sorted_valid
+    run_places = placed_before[run_starts] + 1
+
+    # Tied athletes split the points of every place the run covers
+    cumulative_points = _cumulative_points()
+    max_place = len(cumulative_points) - 1
+    last_place = np.minimum(run_places + run_sizes - 1, max_place)
+    first_place = np.minimum(run_places - 1, max_place)
+    run_scores = (cumulative_points[last_place] - cumulative_points[first_place]) / run_sizes
+
+    places[:] = np.repeat(run_places, run_sizes)
+    scores[:] = np.repeat(run_scores, run_sizes)
+    places[~sorted_valid] = np.nan
+    scores[~sorted_valid] = 0.0
+    return order, places, scores
+
+def score_event(event: dict) -> list:
+    """
+    Rank and score one event document. Finals ('scored' present) rank by
+    seed_numeric, everything else by sb_numeric.
+
+    Returns:
+        Result records best-first, each with 'place' and 'score' added.
+    """
+    results = get_event_results(event)
+    if not results:
+        return []
+
+    sort_field = "seed_numeric" if event.get("scored") is not None else "sb_numeric"
+    order, places, scores = rank_and_score(
+        [r.get(sort_field) for r in results],
+        ascending=event.get("sort_ascending", True)
+    )
+
+    return [
+        {
+            **results[i],
+            "place": None if np.isnan(place) else int(place),
+            "score": float(score),
+        }
+        for i, place, score in zip(order, places, scores)
+    ]
+
+def event_contribution(event: dict) -> dict:
+    """
+    One event's share of the team standings, keyed by team name.
+
+    'points' counts the event whatever its status (projected standings),
+    'scored_points' only once the event is scored.
+    """
+    scored = event.get("status") in SCORED_RESULT_STATUSES
+    contribution = {}
+
+    for result in score_event(event):
+        team = result.get("team_name")
+        if not team:
+            continue
+        entry = contribution.setdefault(team, {
+            "team_abbr": result.get("team_abbr"),
+            "points": 0.0,
+            "scored_points": 0.0,
+            "scorers": [],
+        })
+        entry["points"] += result["score"]
+        if scored:
+            entry["scored_points"] += result["score"]
+        entry["scorers"].append({"athlete_name": result.get("athlete_name"), "score": result["score"]})
+
+    return contribution
+
+def build_standings(events: list) -> dict:
+    """
+    Materialized standings document for one gender:
+    {"events": {event_id: contribution}, "teams": {team: totals}}.
+    """
+    standings = {"events": {}, "teams": {}}
+    for event in events:
+        contribution = event_contribution(event)
+        standings["events"][event["id"]] = contribution
+        _apply_delta(standings["teams"], {}, contribution)
+    return standings
+
+def _apply_delta(teams: dict, old: dict, new: dict) -> set:
+    """
+    Move team totals from an event's old contribution to its new one.
+    Returns the names of the teams whose totals changed.
+    """
+    changed = set(old) | set(new)
+    for team in changed:
+        before, after = old.get(team, {}), new.get(team, {})
+        totals = teams.setdefault(team, {"team_abbr": None, "points": 0.0, "scored_points": 0.0})
+        if after.get("team_abbr"):
+            totals["team_abbr"] = after["team_abbr"]
+        for key in ("points", "scored_points"):
+            # Rounded so repeated deltas don't accumulate float error
+            totals[key] = round(totals[key] - before.get(key, 0.0) + after.get(key, 0.0), 6)
+    return changed
+
+def standings_rows(standings: dict) -> list:
+    """
+    Team rows from a materialized standings document, in the same shape as
+    the frontend's selectedGenderTableData rows.
+
+    Returns:
+        Teams sorted by total points (desc), each with rank, team, team_abbr,
+        total_pts, scored_pts and a per-event {event_pts, scorers} breakdown.
+    """
+    event_ids = sorted(standings.get("events", {}), key=_event_sort_key)
+    rows = []
+
+    for team, totals in standings.get("teams", {}).items():
+        events = {}
+        for event_id in event_ids:
+            entry = standings["events"][event_id].get(team, {})
+            events[event_id] = {"event_pts": entry.get("points", 0.0), "scorers": entry.get("scorers", [])}
+        rows.append({
+            "team": team,
+            "team_abbr": totals.get("team_abbr"),
+            "total_pts": totals.get("points", 0.0),
+            "scored_pts": totals.get("scored_points", 0.0),
+            "events": events,
+        })
+
+    rows.sort(key=lambda row: (-row["total_pts"], row["team"]))
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+
+    return rows
+
+def compute_standings(events: list) -> list:
+    """Team standings rows for one gender, computed from scratch from its event documents."""
+    return standings_rows(build_standings(events))
+
+def _event_sort_key(event_id: str):
+    """Numeric event ids in numeric order, like the frontend's (a, b) => a.id - b.id."""
+    try:
+        return float(event_id)
+    except ValueError:
+        return float("inf")
+
+def load_events(meet_ref, gender: str, transaction=None) -> list:
+    """Event documents for one gender of a meet, with 'id' set, in display order."""
+    events = [
+        {"id": snapshot.id, **snapshot.to_dict()}
+        for snapshot in meet_ref.collection(gender).stream(transaction=transaction)
+    ]
+    events.sort(key=lambda event: _event_sort_key(event["id"]))
+    return events
+
+# --- Materialized standings: meets/{year}/{season}/{meet_id}/standings/{gender} ---
+
+def get_standings_ref(meet_ref, gender: str):
+    return meet_ref.collection(STANDINGS_COLLECTION).document(gender)
+
+@transactional
+def _rebuild_in_transaction(transaction, meet_ref, gender):
+    standings = build_standings(load_events(meet_ref, gender, transaction=transaction))
+    transaction.set(get_standings_ref(meet_ref, gender), standings)
+    return standings
+
+def update_standings_in_transaction(transaction, meet_ref, gender: str, changed_events: dict):
+    """
+    Swap the changed events' contributions into a gender's materialized
+    standings as part of the caller's transaction, so the event writes and
+    the standings delta commit (or retry) together. Work is proportional to
+    the changed events, not the whole meet.
+
+    Reads before it writes: call it after the caller's reads and before the
+    caller's own writes.
+
+    Args:
+        changed_events: {event_id: event data as it will be after the write}.
+    """
+    standings_ref = get_standings_ref(meet_ref, gender)
+    snapshot = standings_ref.get(transaction=transaction)
+
+    if not snapshot.exists:
+        # Meets created before standings were materialized: build it once
+        events = {event["id"]: event for event in load_events(meet_ref, gender, transaction=transaction)}
+        for event_id, event in changed_events.items():
+            events[event_id] = {**event, "id": event_id}
+        ordered = sorted(events.values(), key=lambda event: _event_sort_key(event["id"]))
+        transaction.set(standings_ref, build_standings(ordered))
+        return
+
+    standings = snapshot.to_dict()
+    teams = standings.setdefault("teams", {})
+    events = standings.setdefault("events", {})
+    updates = {}
+    changed_teams = set()
+
+    for event_id, event in changed_events.items():
+        new = event_contribution(event)
+        old = events.get(event_id, {})
+        events[event_id] = new
+
+        changed_teams |= _apply_delta(teams, old, new)
+        updates[field_path.FieldPath("events", event_id).to_api_repr()] = new
+
+    # Teams with no result left in any event: a rebuild would leave them out
+    dropped = [team for team in changed_teams if not any(team in contribution for contribution in events.values())]
+    for team in dropped:
+        del teams[team]
+
+    if dropped:
+        # Removing map keys needs the whole (small) teams map rewritten
+        updates["teams"] = teams
+    else:
+        for team in changed_teams:
+            updates[field_path.FieldPath("teams", team).to_api_repr()] = teams[team]
+
+    transaction.update(standings_ref, updates)
+
+def rebuild_standings(db, meet_ref, genders=GENDERS):
+    """Recompute a meet's materialized standings from all of its events."""
+    standings = {
+        gender: _rebuild_in_transaction(db.transaction(), meet_ref, gender)
+        for gender in genders
+    }
+    standings_cache.invalidate(meet_ref.path)
+    return standings
+
+def get_meet_standings(meet_year: str, meet_season: str, meet_id: str):
+    """
+    Team standings for every gender of a meet, keyed by gender, read from the
+    materialized standings documents. Returns None if the meet does not exist.
+    """
+    db = get_database()
+    meet_ref = db.collection("meets").document(meet_year).collection(meet_season).document(meet_id)
+
+    if document_cache.get(meet_ref) is None:
+        return None
+
+    def load():
+        standings = {}
+        missing = []
+        for gender in GENDERS:
+            snapshot = get_standings_ref(meet_ref, gender).get()
+            if snapshot.exists:
+                standings[gender] = snapshot.to_dict()
+            else:
+                missing.append(gender)
+        if missing:
+            standings.update(rebuild_standings(db, meet_ref, missing))
+        return {gender: standings_rows(standings[gender]) for gender in GENDERS}
+
+    return standings_cache.get_or_load(meet_ref.path, load)
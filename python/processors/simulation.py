@@ -0,0 +1,204 @@
+import os
+import time
+import functools
+from processors.lazy import lazy_module
+from processors.storage import get_database
+from processors.cache import document_cache, simulation_cache
+from processors.scoring import (
+    GENDERS, SCORED_RESULT_STATUSES, get_event_results, event_contribution, load_events,
+)
+from .constants import POINTS_SYSTEM
+
+np = lazy_module("numpy")
+
+# Simulated meets per request (and the cap for ?runs=)
+SIMULATION_RUNS = int(os.environ.get("SIMULATION_RUNS", "5000"))
+MAX_SIMULATION_RUNS = int(os.environ.get("MAX_SIMULATION_RUNS", "100000"))
+# Meets simulated this recently are re-simulated in the background after each event change
+SIMULATION_REFRESH_WINDOW_SECONDS = float(os.environ.get("SIMULATION_REFRESH_WINDOW_SECONDS", "600"))
+
+# Day-to-day spread of a performance as a fraction of the mark, per event type
+BASE_VARIATION = {"running": 0.01, "field": 0.03, "multi": 0.03, "relay": 0.01}
+# Share of the SB -> PB gap added to the spread (athletes with a far better PB are less predictable)
+PB_GAP_WEIGHT = 0.5
+
+# meet_document_id -> time.monotonic() of the last simulation request
+_last_requested = {}
+
+@functools.cache
+def _place_points():
+    return np.array([POINTS_SYSTEM[place] for place in sorted(POINTS_SYSTEM)], dtype=float)
+
+def athlete_distributions(results: list, event_type: str = None):
+    """
+    Normal performance model per athlete: mean = SB, sigma = a base share of
+    the SB plus PB_GAP_WEIGHT x |PB - SB|.
+
+    Athletes without an SB are left out, like in the deterministic ranking.
+    A zero SB means "no mark yet": the athlete finishes behind everyone with
+    a mark, in random order.
+
+    Returns:
+        (entries, mean, sigma): the results that take part and their model.
+    """
+    entries = [r for r in results if r.get("sb_numeric") is not None]
+    sb = np.array([r["sb_numeric"] for r in entries], dtype=float)
+    pb = np.array([np.nan if r.get("pb_numeric") is None else r["pb_numeric"] for r in entries], dtype=float)
+
+    gap = np.where(np.isnan(pb), 0.0, np.abs(pb - sb))
+    sigma = BASE_VARIATION.get(event_type, 0.02) * np.abs(sb) + PB_GAP_WEIGHT * gap
+    return entries, sb, sigma
+
+def simulate_event_points(results: list, ascending: bool, event_type: str, runs: int, rng):
+    """
+    Sample runs outcomes of one event at once.
+
+    Returns:
+        (entries, points): points has shape (runs, len(entries)), the points
+        each athlete scored in each simulated outcome.
+    """
+    entries, mean, sigma = athlete_distributions(results, event_type)
+    points = np.zeros((runs, len(entries)), dtype=np.float32)
+    if not entries:
+        return entries, points
+
+    # float32 sampling is about twice as fast and plenty for ranking
+    if not ascending:
+        mean = -mean
+    keys = rng.standard_normal((runs, len(entries)), dtype=np.float32)
+    keys *= sigma.astype(np.float32)
+    keys += mean.astype(np.float32)
+    # No mark yet: behind every marked athlete, in random order
+    marked = mean != 0
+    if not marked.all():
+        unmarked = np.float32(1e30) * (1 + rng.random((runs, len(entries)), dtype=np.float32))
+        keys = np.where(marked, keys, unmarked)
+
+    place_points = _place_points()
+    scoring_places = min(len(place_points), len(entries))
+    order = np.argsort(keys, axis=1)[:, :scoring_places]
+    np.put_along_axis(points, order, np.broadcast_to(place_points[:scoring_places], order.shape), axis=1)
+    return entries, points
+
+def simulate_standings(events: list, runs: int = SIMULATION_RUNS, seed: int = None) -> dict:
+    """
+    Monte Carlo team outcomes for one gender.
+
+    Scored events count their actual points; every other event with results
+    is simulated from the athletes' SB/PB distributions, runs times, all
+    outcomes sampled in NumPy batches.
+
+    Returns:
+        {"runs", "events_simulated", "events_scored", "teams": [...]} with teams
+        sorted by mean points, each with win_probability, mean_points,
+        scored_points and a 90% interval (p5/p50/p95).
+    """
+    rng = np.random.default_rng(seed)
+    team_index = {}
+    team_abbrs = {}
+    scored_points = {}
+    simulated = []
+
+    def team_id(team, abbr):
+        if team not in team_index:
+            team_index[team] = len(team_index)
+            team_abbrs[team] = abbr
+        return team_index[team]
+
+    events_scored = 0
+    for event in events:
+        if event.get("status") in SCORED_RESULT_STATUSES:
+            events_scored += 1
+            for team, entry in event_contribution(event).items():
+                team_id(team, entry.get("team_abbr"))
+                scored_points[team] = scored_points.get(team, 0.0) + entry["points"]
+            continue
+
+        results = get_event_results(event)
+        if not results:
+            continue
+        entries, points = simulate_event_points(
+            results, event.get("sort_ascending", True), event.get("event_type"), runs, rng
+        )
+        teams = [team_id(r.get("team_name"), r.get("team_abbr")) for r in entries]
+        simulated.append((teams, points))
+
+    # --- Team totals per run: fixed scored points + (runs x athletes) @ (athletes x teams) per event ---
+    totals = np.zeros((runs, len(team_index)), dtype=np.float32)
+    for team, pts in scored_points.items():
+        totals[:, team_index[team]] += pts
+    for teams, points in simulated:
+        if teams:
+            membership = np.zeros((len(teams), len(team_index)), dtype=np.float32)
+            membership[np.arange(len(teams)), teams] = 1.0
+            totals += points @ membership
+
+    teams_out = []
+    if team_index:
+        best = totals.max(axis=1, keepdims=True)
+        winners = totals == best
+        # Shared wins are split between the tied teams
+        win_probability = (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+        p5, p50, p95 = np.percentile(totals, [5, 50, 95], axis=0)
+        means = totals.mean(axis=0)
+
+        for team, i in team_index.items():
+            teams_out.append({
+                "team": team,
+                "team_abbr": team_abbrs[team],
+                "win_probability": float(win_probability[i]),
+                "mean_points": float(means[i]),
+                "scored_points": scored_points.get(team, 0.0),
+                "p5": float(p5[i]),
+                "p50": float(p50[i]),
+                "p95": float(p95[i]),
+            })
+        teams_out.sort(key=lambda row: (-row["mean_points"], row["team"] or ""))
+
+    return {
+        "runs": runs,
+        "events_simulated": len(simulated),
+        "events_scored": events_scored,
+        "teams": teams_out,
+    }
+
+def recently_requested(meet_document_id: str) -> bool:
+    """True if someone asked for this meet's simulation within the refresh window."""
+    requested = _last_requested.get(meet_document_id)
+    return requested is not None and time.monotonic() - requested < SIMULATION_REFRESH_WINDOW_SECONDS
+
+def get_meet_simulation(
+    meet_year: str, meet_season: str, meet_id: str, runs: int = SIMULATION_RUNS, seed: int = None,
+    refresh: bool = False,
+):
+    """
+    Simulated outcomes for every gender of a meet, keyed by gender.
+    Returns None if the meet does not exist. Default runs are cached until
+    the meet's events change. refresh=True (background re-simulation) does
+    not count as a request, so refreshing stops once nobody asks.
+    """
+    if not 1 <= runs <= MAX_SIMULATION_RUNS:
+        raise ValueError(f"runs must be between 1 and {MAX_SIMULATION_RUNS}")
+
+    db = get_database()
+    meet_ref = db.collection("meets").document(meet_year).collection(meet_season).document(meet_id)
+
+    if document_cache.get(meet_ref) is None:
+        return None
+
+    def load():
+        started = time.perf_counter()
+        simulation = {
+            "genders": {
+                gender: simulate_standings(load_events(meet_ref, gender), runs=runs, seed=seed)
+                for gender in GENDERS
+            },
+        }
+        simulation["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return simulation
+
+    if runs != SIMULATION_RUNS or seed is not None:
+        return load()
+    if not refresh:
+        _last_requested[f"{meet_year}/{meet_season}/{meet_id}"] = time.monotonic()
+    return simulation_cache.get_or_load(meet_ref.path, load)
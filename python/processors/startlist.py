@@ -1,11 +1,18 @@
 import os
 import re
-import pandas as pd
-from processors.gcs import get_firestore_client, slugify, parse_time_or_distance
-from .constants import FIELD_EVENT_LIST, MULTI_EVENT_LIST, RELAY_EVENT_LIST
+from typing import NamedTuple
+from processors.gcs import commit_writes, open_text_source, slugify, parse_time_or_distance, parse_marks, to_nullable
+from processors.storage import get_database
+from processors.metrics import phase
+from processors.cache import on_meet_write
+from processors.scoring import rebuild_standings
+from processors.catalog import classify_event, multi_event_for
+from processors.lazy import lazy_module
+
+pd = lazy_module("pandas")
 
 def process_merged_start_list(
-    file_path: str,
+    source,
     meet_year: str,
     meet_id: str,
     meet_name: str,
@@ -14,49 +21,50 @@ def process_merged_start_list(
     meet_location: str = None
 ):
     """
-    Processes a local CSV start list file, scores it, and uploads results to Firestore.
+    Processes a CSV start list, scores it, and uploads results to Firestore.
 
     Args:
-        file_path: Path to the local CSV file.
+        source: Local CSV path, raw CSV bytes, or a file-like object.
         meet_year: Year of meet.
         meet_id: Slug of meet.
         meet_name: Name of meet.
         meet_season: 'indoor' or 'outdoor'
         meet_date: Full meet date string (optional).
         meet_location: Location of meet (optional).
+
+    A start list larger than one write batch isn't written atomically (see
+    commit_writes): on PartialWriteError some events are reseeded and others
+    not yet. Every write is a whole document and standings are rebuilt from
+    scratch, so uploading the same start list again completes the reseed.
     """
-    print(f"Processing file: {file_path}")
+    print(f"Processing start list: {meet_id}")
 
-    # --- Parse CSV and clean ---
-    df_parsed = parse_start_list(os.path.dirname(file_path), os.path.basename(file_path))
-    cleaned_data_by_gender = clean_start_list(df_parsed)
+    # --- Stream-parse CSV straight into nested event data ---
+    with phase("start_list_parse"), open_text_source(source) as f:
+        cleaned_data_by_gender = build_start_list(iter_start_list(f))
 
     # --- Firestore reference ---
-    db = get_firestore_client()
+    db = get_database()
     meet_year = str(meet_year)
     meet_ref = db.collection("meets") \
              .document(str(meet_year)) \
              .collection(meet_season) \
              .document(meet_id)
 
-    # --- Set basic meet info ---
-    meet_ref.set({
-        "name": meet_name,
-        "id": meet_id,
-        "year": meet_year,
-        "date": meet_date,
-        "location": meet_location,
-        "season": meet_season
-    })
+    # --- Versions of the events being replaced (a reseed keeps counting up) ---
+    with phase("event_read"):
+        versions = stored_event_versions(meet_ref, [slugify(gender) for gender in cleaned_data_by_gender])
 
-    # --- Upload cleaned start list data per gender and event ---
+    # --- Cleaned start list data per gender and event ---
+    writes = []
     for gender, events in cleaned_data_by_gender.items():
         gender_key = slugify(gender)
         gender_collection_ref = meet_ref.collection(gender_key)
         for event_num, event_data in events.items():
             event_num_key = slugify(event_num)
             event_doc_ref = gender_collection_ref.document(event_num_key)
-            event_doc_ref.set({
+            writes.append((event_doc_ref, {
+                "version": versions.get(event_doc_ref.path, 0) + 1,
                 "event_gender": gender,
                 "event_name": event_data.get('event_name'),
                 "event_type": event_data.get('event_type'),
@@ -67,25 +75,73 @@ def process_merged_start_list(
                     "event_results": event_data.get('event_results'),
                     "event_round": 'prelim'
                 }
-            })
+            }))
 
-    return "Upload complete"
+    # --- Basic meet info goes last so the meet only shows up once its events exist ---
+    writes.append((meet_ref, {
+        "name": meet_name,
+        "id": meet_id,
+        "year": meet_year,
+        "date": meet_date,
+        "location": meet_location,
+        "season": meet_season
+    }))
 
-def parse_start_list(input_dir, input_filename):
+    try:
+        with phase("firestore_write"):
+            commit_writes(db, writes)
+    finally:
+        # Even a partly written reseed changed some events
+        on_meet_write(meet_ref.path)
+    with phase("standings"):
+        rebuild_standings(db, meet_ref)
 
-    input_csv_path = os.path.join(input_dir, input_filename)
-    cleaned_rows = []
-    max_data_cols_found = 0
+    return "Upload complete"
 
-    if not os.path.exists(input_csv_path):
-        raise FileNotFoundError(f"File not found: {input_csv_path}")
+def stored_event_versions(meet_ref, gender_keys) -> dict:
+    """
+    {event path: version} of a meet's existing events. Reseeded events carry
+    their version forward: clients ignore changes at or below the version they
+    hold, so restarting at 1 would hide every later update from them.
+    """
+    versions = {}
+    for gender_key in gender_keys:
+        for snapshot in meet_ref.collection(gender_key).stream():
+            versions[snapshot.reference.path] = (snapshot.to_dict() or {}).get("version", 0)
+    return versions
+
+class StartListEvent(NamedTuple):
+    """One `;;StartList` block: the event header plus its raw athlete rows."""
+    event_num: str
+    gender: str
+    event_name: str
+    rows: list
+
+# Leading columns of a start list athlete row
+START_LIST_COLUMNS = {
+    "first_name": 2,
+    "last_name": 3,
+    "athlete_id": 5,
+    "team_name": 6,
+    "team_abbr": 7,
+    "sb": 8,
+    "pb": 10,
+}
+
+def iter_start_list(lines):
+    """
+    Walk a merged start list once, yielding a StartListEvent per `;;StartList` block.
 
-    with open(input_csv_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    Args:
+        lines: Any iterable of text lines (an open file, a list of strings, ...).
 
+    Yields:
+        StartListEvent for every block that has at least one athlete row.
+    """
     current_gender = None
     current_event_name = None
     current_event_num = None
+    current_rows = []
     in_header_block = False
 
     for line in lines:
@@ -95,52 +151,28 @@ def parse_start_list(input_dir, input_filename):
 
         # --- Detect new event header ---
         if line.startswith(";;StartList"):
+            if current_rows:
+                yield StartListEvent(current_event_num, current_gender, current_event_name, current_rows)
             in_header_block = True
             current_gender = None
             current_event_name = None
             current_event_num = None
+            current_rows = []
             continue
 
         # --- Inside header block ---
         if in_header_block:
             parts = [p.strip() for p in line.split(',')]
-            if not parts:
-                continue
 
             # Skip notes, meet info, collegiate info, etc.
             if parts[0] in ['R', 'N']:
                 continue
 
             # This is the first actual line that contains the event info
-            current_event_num = parts[0].lstrip("0") if parts else "Unknown"
-
-            # Detect gender in the event description (usually in column 2)
-            gender_words = ["Men", "Women"]
-            found_gender = None
-            if len(parts) > 2:
-                words = parts[2].split()
-                for idx, w in enumerate(words):
-                    if w in gender_words:
-                        found_gender = w
-                        gender_index = idx
-                        break
-
-                if found_gender:
-                    current_gender = found_gender
-                    # Build event name
-                    event_name_words = words[:gender_index + 1]
-                    for w in words[gender_index + 1:]:
-                        if w in ["Prelims", "Finals", "Semifinals", "Heats", "Qualifying"] \
-                                or re.match(r'\d{1,2}:\d{2}', w):
-                            break
-                        event_name_words.append(w)
-                    current_event_name = " ".join(event_name_words).strip()
-                else:
-                    current_gender = "Unknown"
-                    current_event_name = "Unknown Event"
-            else:
-                current_gender = "Unknown"
-                current_event_name = "Unknown Event"
+            current_event_num = parts[0].lstrip("0")
+            current_gender, current_event_name = parse_event_description(
+                parts[2] if len(parts) > 2 else ""
+            )
 
             # Header finished, next lines are data rows
             in_header_block = False
@@ -150,18 +182,110 @@ def parse_start_list(input_dir, input_filename):
         if current_gender and current_event_name and current_event_num:
             parts = [p.strip() for p in line.split(',')]
             # Skip any stray R or N rows in the middle
-            if parts and parts[0] not in ['R', 'N']:
-                if len(parts) > max_data_cols_found:
-                    max_data_cols_found = len(parts)
-                cleaned_rows.append(parts + [current_gender, current_event_name, current_event_num])
+            if parts[0] not in ['R', 'N']:
+                current_rows.append(parts)
+
+    if current_rows:
+        yield StartListEvent(current_event_num, current_gender, current_event_name, current_rows)
+
+def parse_event_description(description: str):
+    """
+    Split an event description (e.g. 'Women 60 Meter Dash Prelims') into
+    gender and event name. The event name keeps the gender word.
+    """
+    words = description.split()
+    for gender_index, word in enumerate(words):
+        if word in ["Men", "Women"]:
+            event_name_words = words[:gender_index + 1]
+            for w in words[gender_index + 1:]:
+                if w in ["Prelims", "Finals", "Semifinals", "Heats", "Qualifying"] \
+                        or re.match(r'\d{1,2}:\d{2}', w):
+                    break
+                event_name_words.append(w)
+            return word, " ".join(event_name_words).strip()
+
+    return "Unknown", "Unknown Event"
+
+def build_start_list(events):
+    """
+    Build the nested start list structure from StartListEvent blocks without
+    an intermediate DataFrame. Produces the same shape as clean_start_list().
+    """
+    nested_data = {}
+    first_multi_events = {}
+
+    for event in events:
+        # --- Keep only first event entry for combined events ---
+        event_name = event.event_name
+        multi_event = multi_event_for(event_name)
+        if multi_event:
+            first_event = first_multi_events.setdefault(multi_event, event_name)
+            if event_name != first_event:
+                continue
+            event_name = multi_event
+
+        # --- Strip gender from event_name ---
+        event_name = re.sub(r'\b(Men|Women)\b\s*', '', event_name).strip()
+        gender = event.gender.strip().title()
+
+        gender_events = nested_data.setdefault(gender, {})
+        if event.event_num not in gender_events:
+            event_info = classify_event(event_name)
+            gender_events[event.event_num] = {
+                'event_name': event_name,
+                'event_type': event_info.event_type,
+                'sort_ascending': event_info.sort_ascending,
+                'event_results': []
+            }
+        event_data = gender_events[event.event_num]
+
+        records = event_data['event_results']
+        for row in event.rows:
+            records.append(build_start_list_record(row, event_data['event_type']))
+
+    return nested_data
+
+def build_start_list_record(row: list, event_type: str) -> dict:
+    """Build one raw athlete record (no ranks, no scores) from a start list row."""
+    def col(name):
+        idx = START_LIST_COLUMNS[name]
+        return row[idx] if idx < len(row) else ''
+
+    athlete_name = f"{col('first_name')} {col('last_name')}".strip()
+    athlete_id = col('athlete_id')
+    rec = {
+        "team_name": col('team_name').upper().strip(),
+        "team_abbr": col('team_abbr'),
+        "athlete_id": int(athlete_id) if athlete_id.isdigit() else None,
+        "athlete_name": athlete_name,
+        "sb_numeric": parse_time_or_distance(col('sb')),
+        "pb_numeric": parse_time_or_distance(col('pb'))
+    }
+
+    # Relay fix - for relays, team name becomes the full athlete name
+    if event_type == 'relay':
+        rec["team_name"] = athlete_name
+
+    return rec
+
+def parse_start_list(input_dir, input_filename):
+
+    input_csv_path = os.path.join(input_dir, input_filename)
+
+    if not os.path.exists(input_csv_path):
+        raise FileNotFoundError(f"File not found: {input_csv_path}")
+
+    with open(input_csv_path, 'r', encoding='utf-8') as f:
+        events = list(iter_start_list(f))
+
+    max_data_cols_found = max((len(row) for event in events for row in event.rows), default=0)
 
     # --- Pad rows to same length ---
     final_cleaned_rows_padded = []
-    for row in cleaned_rows:
-        data_parts = row[:-3]  # last 3 are gender, event_name, event_num
-        gender, event_name, event_num = row[-3], row[-2], row[-1]
-        padded_data_parts = data_parts + [''] * (max_data_cols_found - len(data_parts))
-        final_cleaned_rows_padded.append(padded_data_parts + [gender, event_name, event_num])
+    for event in events:
+        for row in event.rows:
+            padded_data_parts = row + [''] * (max_data_cols_found - len(row))
+            final_cleaned_rows_padded.append(padded_data_parts + [event.gender, event.event_name, event.event_num])
 
     # --- Column names ---
     data_column_names = [f"Col_{idx+1}" for idx in range(max_data_cols_found)]
@@ -242,81 +366,67 @@ def clean_start_list(df):
         r'\b(Men|Women)\b\s*', '', regex=True
     ).str.strip()
 
-    df['sb_numeric'] = df['SB'].apply(parse_time_or_distance)
-    df['pb_numeric'] = df['PB'].apply(parse_time_or_distance)
+    df['sb_numeric'] = parse_marks(df['SB'])
+    df['pb_numeric'] = parse_marks(df['PB'])
+
+    # --- One groupby pass over (gender, event_num), in file order ---
+    groups = df.groupby(['event_gender', 'event_num'], sort=False)
+    group_event_name = groups['event_name'].transform('first').str.strip()
+
+    # --- Classify each distinct event name once ---
+    event_infos = {name: classify_event(name) for name in group_event_name.unique()}
+    event_types = {name: info.event_type for name, info in event_infos.items()}
+
+    # --- Build record columns (raw, no ranks, no scores) ---
+    athlete_name = (df['first_name'].astype(str) + ' ' + df['last_name'].astype(str)).str.strip()
+    team_name = df['team_name'].str.upper().str.strip()
+    # Relay fix - for relays, team name becomes the full athlete name
+    team_name = team_name.where(group_event_name.map(event_types) != 'relay', athlete_name)
+
+    athlete_id = df['athlete_id'].astype(str).str.strip()
+    athlete_id = athlete_id.where(athlete_id.str.isdigit())
 
-    # --- Build nested_data (raw, no scoring) ---
+    records = pd.DataFrame({
+        "team_name": to_nullable(team_name),
+        "team_abbr": df['team_abbr'],
+        "athlete_id": to_nullable(pd.to_numeric(athlete_id).astype('Int64')),
+        "athlete_name": athlete_name,
+        "sb_numeric": to_nullable(df['sb_numeric']),
+        "pb_numeric": to_nullable(df['pb_numeric']),
+    }).to_dict('records')
+
+    # --- Build nested_data ---
     nested_data = {}
+    group_indices = sorted(groups.indices.items(), key=lambda item: item[1][0])
 
-    for gender in df['event_gender'].unique():
-        nested_data[gender] = {}
-        gender_df = df[df['event_gender'] == gender]
-
-        for event_num in gender_df['event_num'].unique():
-            event_df = gender_df[gender_df['event_num'] == event_num]
-            event_name = event_df['event_name'].iloc[0].strip()
-            event_type = get_event_type(event_name)
-
-            # Determine sorting for event
-            if event_name in MULTI_EVENT_LIST:
-              sort_ascending = False  # for multi-events, higher total points are better
-            elif event_name in FIELD_EVENT_LIST:
-              sort_ascending = False  # for field events, higher distance/height is better
-            else:
-              # Running events: lower times are better
-              sort_ascending = True
-
-            records = []
-            # Raw rows output (no ranks, no scores)
-            for _, row in event_df.iterrows():
-              athlete_name = f"{row['first_name']} {row['last_name']}".strip()
-              rec = {
-                  "team_name": row["team_name"].upper().strip() if isinstance(row["team_name"], str) else None,
-                  "team_abbr": row["team_abbr"],
-                  "athlete_id": int(row["athlete_id"]) if str(row["athlete_id"]).strip().isdigit() else None,
-                  "athlete_name": athlete_name,
-                  "sb_numeric": row["sb_numeric"],
-                  "pb_numeric": row["pb_numeric"]
-              }
-
-              # Relay fix - for relays, team name becomes the full athlete name
-              if event_type == 'relay':
-                rec["team_name"] = athlete_name
-
-              records.append(rec)
-
-            nested_data[gender][event_num] = {
-                'event_name': event_name,
-                'event_type': event_type,
-                'sort_ascending': sort_ascending,
-                'event_results': records
-            }
+    for (gender, event_num), positions in group_indices:
+        event_name = group_event_name.iat[positions[0]]
+        nested_data.setdefault(gender, {})[event_num] = {
+            'event_name': event_name,
+            'event_type': event_types[event_name],
+            'sort_ascending': event_infos[event_name].sort_ascending,
+            'event_results': [records[i] for i in positions]
+        }
 
     return nested_data
 
+def get_sort_ascending(event_name: str) -> bool:
+    """
+    Determine sorting for an event (see processors.catalog.classify_event).
+
+    Returns:
+        True when lower marks are better (running, relays), False otherwise.
+    """
+    return classify_event(event_name).sort_ascending
+
 def get_event_type(event_name: str) -> str:
     """
-    Determine the type of event based on its name.
+    Determine the type of event based on its name (see processors.catalog.classify_event).
 
     Args:
         event_name: Name of the event (e.g., '60 Meter Dash', 'Shot Put', 'Decathlon').
 
     Returns:
-        'running', 'field', or 'multi'
+        'running', 'field', 'relay' or 'multi'
     """
-    event_name_lower = event_name.lower()
-    # Multi-events first
-    for multi_event in MULTI_EVENT_LIST:
-      if multi_event.lower() in event_name_lower:
-        return 'multi'
-
-    # Field events
-    for field_event in FIELD_EVENT_LIST:
-      if field_event.lower() in event_name_lower:
-        return 'field'
-        
-    if 'relay' in event_name_lower or 'medley' in event_name_lower or 'dmr' in event_name_lower:
-      return 'relay'
-
-    # Otherwise, assume running
-    return 'running'
\ No newline at end of file
+    return classify_event(event_name).event_type
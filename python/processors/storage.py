@@ -0,0 +1,118 @@
+import os
+import functools
+import threading
+from processors.gcs import firestore, get_firestore_client, get_gcs_client, FIRESTORE_BATCH_LIMIT
+
+# "cloud" (Firestore + GCS) or "local" (SQLite + local files, synced to the cloud write-behind)
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "cloud")
+# Where the local backend keeps its database and raw files
+LOCAL_STORAGE_DIR = os.environ.get("LOCAL_STORAGE_DIR", "local-data")
+# "0" keeps the local backend fully offline (no cloud sync)
+LOCAL_SYNC_ENABLED = os.environ.get("LOCAL_SYNC_ENABLED", "1") != "0"
+# Upper bound on the backoff between failed sync attempts
+LOCAL_SYNC_RETRY_MAX_SECONDS = float(os.environ.get("LOCAL_SYNC_RETRY_MAX_SECONDS", "60"))
+# Attempts after which an entry the cloud keeps rejecting moves to outbox_failed
+LOCAL_SYNC_MAX_ATTEMPTS = int(os.environ.get("LOCAL_SYNC_MAX_ATTEMPTS", "10"))
+# Idle sync thread wake-up interval (writes wake it immediately)
+LOCAL_SYNC_INTERVAL_SECONDS = float(os.environ.get("LOCAL_SYNC_INTERVAL_SECONDS", "5"))
+
+BUCKET_NAME = "projections-data"
+
+_local = None
+_local_lock = threading.Lock()
+
+def _local_backend():
+    """(LocalDatabase, LocalBucket, CloudSync or None), created on first use."""
+    global _local
+    if _local is not None:
+        return _local
+
+    with _local_lock:
+        if _local is None:
+            # Imported here so the cloud backend never touches SQLite
+            from processors.local_storage import LocalDatabase, LocalBucket, CloudSync
+
+            os.makedirs(LOCAL_STORAGE_DIR, exist_ok=True)
+            db = LocalDatabase(os.path.join(LOCAL_STORAGE_DIR, "documents.sqlite3"))
+            bucket = LocalBucket(os.path.join(LOCAL_STORAGE_DIR, "blobs"), db, BUCKET_NAME)
+            sync = None
+            if LOCAL_SYNC_ENABLED:
+                sync = CloudSync(
+                    db, bucket,
+                    cloud_db=get_firestore_client(),
+                    cloud_bucket=get_gcs_client().bucket(BUCKET_NAME),
+                    batch_size=FIRESTORE_BATCH_LIMIT,
+                    retry_max_seconds=LOCAL_SYNC_RETRY_MAX_SECONDS,
+                    interval_seconds=LOCAL_SYNC_INTERVAL_SECONDS,
+                    max_attempts=LOCAL_SYNC_MAX_ATTEMPTS,
+                )
+            _local = (db, bucket, sync)
+        return _local
+
+def get_database():
+    """
+    The document store processors and endpoints read and write: the Firestore
+    client, or the local SQLite store with the same reference API.
+    """
+    if STORAGE_BACKEND == "local":
+        return _local_backend()[0]
+    if STORAGE_BACKEND != "cloud":
+        raise ValueError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (expected 'cloud' or 'local')")
+    return get_firestore_client()
+
+def get_bucket():
+    """The bucket raw uploads are archived to: GCS, or the local blob directory."""
+    if STORAGE_BACKEND == "local":
+        return _local_backend()[1]
+    return get_gcs_client().bucket(BUCKET_NAME)
+
+def transactional(func):
+    """
+    Backend-neutral firestore.transactional: func(transaction, ...) runs with
+    Firestore's retry-on-contention, or under the local store's lock.
+    """
+    cloud = None
+
+    @functools.wraps(func)
+    def wrapper(transaction, *args, **kwargs):
+        nonlocal cloud
+        run_locally = getattr(transaction, "run", None)
+        if run_locally is not None:
+            return run_locally(func, *args, **kwargs)
+        # Built on first call: decorating at import time must not import Firestore
+        if cloud is None:
+            cloud = firestore.transactional(func)
+        return cloud(transaction, *args, **kwargs)
+
+    return wrapper
+
+def start_sync():
+    """Start replicating local writes to the cloud (local backend with sync enabled)."""
+    if STORAGE_BACKEND == "local":
+        sync = _local_backend()[2]
+        if sync is not None:
+            sync.start()
+
+def stop_sync():
+    """
+    Stop the sync thread and close the local database; unsynced writes stay in
+    the outbox for the next start. Call once blocking work has finished.
+    """
+    global _local
+    with _local_lock:
+        if _local is None:
+            return
+        db, _, sync = _local
+        if sync is not None:
+            sync.stop()
+        db.close()
+        _local = None
+
+def storage_stats() -> dict:
+    if STORAGE_BACKEND != "local":
+        return {"backend": STORAGE_BACKEND}
+    db, _, sync = _local_backend()
+    return {
+        "backend": "local",
+        "sync": sync.stats() if sync is not None else {"running": False, **db.outbox_stats()},
+    }
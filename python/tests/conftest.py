@@ -0,0 +1,16 @@
+import os
+import tempfile
+import pytest
+
+# Offline local backend for every test; set before processors.storage reads it
+os.environ.setdefault("STORAGE_BACKEND", "local")
+os.environ.setdefault("LOCAL_STORAGE_DIR", tempfile.mkdtemp(prefix="flash-tests-"))
+os.environ.setdefault("LOCAL_SYNC_ENABLED", "0")
+os.environ.setdefault("NOTIFY_BACKEND", "memory")
+
+@pytest.fixture
+def client():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import app
+    return TestClient(app.app)
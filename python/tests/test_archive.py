@@ -0,0 +1,38 @@
+import app
+from processors.storage import get_bucket
+from tests.uploads import start_list_files, event_files
+
+MEET = "Archive Meet"
+ARCHIVE = "events/2025/indoor/archive-meet/women_1.csv"
+
+def archived_names():
+    return sorted(blob.name for blob in get_bucket().list_blobs("events/2025/indoor/archive-meet/"))
+
+def test_failed_reupload_keeps_previous_archive(client):
+    assert client.post("/upload_merged_start_list", files=start_list_files(MEET)).status_code == 200
+    good = event_files(MEET)
+    assert client.post("/upload_event", files=good).status_code == 200
+    assert archived_names() == [ARCHIVE]
+
+    name, content = event_files(MEET, seed=1)["file"]
+    bad = {"file": (name, content.replace(b",Scored,", b",Bogus,", 1))}
+    assert client.post("/upload_event", files=bad).status_code == 400
+
+    assert archived_names() == [ARCHIVE]
+    assert get_bucket().blob(ARCHIVE).download_as_bytes() == good["file"][1]
+
+def test_archive_failure_does_not_fail_committed_upload(client, monkeypatch):
+    assert client.post("/upload_merged_start_list", files=start_list_files(MEET)).status_code == 200
+
+    def failing_upload(*_):
+        raise ConnectionError("bucket unavailable")
+
+    notified = []
+    async def record_changes(changes):
+        notified.extend(changes)
+
+    monkeypatch.setattr(app, "_upload_blob", failing_upload)
+    monkeypatch.setattr(app, "notify_event_changes", record_changes)
+    response = client.post("/upload_event", files=event_files(MEET, seed=2))
+    assert response.status_code == 200
+    assert notified
@@ -0,0 +1,60 @@
+import io
+import zipfile
+import pytest
+import app
+
+def zipped(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def test_oversized_member_rejected_before_reading(monkeypatch):
+    data = zipped({"women_1.csv": b"0" * 10_000})
+    monkeypatch.setattr(app, "MAX_ZIPPED_EVENT_FILE_BYTES", 1_000)
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda *_: pytest.fail("member was decompressed"))
+    with pytest.raises(ValueError, match="too large"):
+        app.extract_event_csvs("events.zip", data)
+
+def test_unzipped_total_capped(monkeypatch):
+    data = zipped({f"women_{i}.csv": b"0" * 600 for i in range(3)})
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda *_: pytest.fail("member was decompressed"))
+    with pytest.raises(ValueError, match="Zip contents too large"):
+        app.extract_event_csvs("events.zip", data, max_bytes=1_000)
+
+def test_file_count_checked_before_reading(client, monkeypatch):
+    data = zipped({f"women_{i}.csv": b"x" for i in range(3)})
+    monkeypatch.setattr(app, "MAX_BULK_EVENT_FILES", 2)
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda *_: pytest.fail("member was decompressed"))
+    response = client.post("/upload_events", files=[("files", ("events.zip", data))])
+    assert response.status_code == 400
+
+def test_budget_shared_across_archives(client, monkeypatch):
+    monkeypatch.setattr(app, "MAX_BULK_UNZIPPED_BYTES", 1_000)
+    files = [("files", (f"events_{i}.zip", zipped({f"women_{i}.csv": b"0" * 600}))) for i in range(2)]
+    response = client.post("/upload_events", files=files)
+    assert response.status_code == 400
+
+def test_bulk_upload_is_one_broadcast(client, monkeypatch):
+    from processors.broadcast import broadcaster, coalesce_key
+    from tests.uploads import start_list_files, event_files
+
+    assert client.post("/upload_merged_start_list", files=start_list_files("Bulk Meet")).status_code == 200
+    payloads = []
+    monkeypatch.setattr(broadcaster, "publish", lambda payload, *args, **kwargs: payloads.append(payload))
+
+    files = [
+        ("files", event_files("Bulk Meet")["file"]),
+        ("files", event_files("Bulk Meet", gender="Men", event_num="2")["file"]),
+    ]
+    response = client.post("/upload_events", files=files)
+    assert response.status_code == 200
+    assert all(result["success"] for result in response.json()["results"])
+
+    [payload] = payloads
+    assert payload["type"] == "events_changed"
+    assert payload["meet_document_id"] == "2025/indoor/bulk-meet"
+    assert [(change["gender"], change["event_id"]) for change in payload["changes"]] == [("women", "1"), ("men", "2")]
+    # Every change must reach the client: a queued bulk message is never replaced
+    assert coalesce_key(payload) is None
@@ -0,0 +1,16 @@
+import asyncio
+from processors.broadcast import Broadcaster
+from processors.bus import RedisBus
+
+class FailingRedis:
+    async def publish(self, channel, message):
+        raise ConnectionError("redis is down")
+
+def test_redis_publish_failure_is_counted_not_raised():
+    bus = RedisBus(Broadcaster())
+    bus._redis = FailingRedis()
+
+    asyncio.run(bus.publish("2025/indoor/meet", {"type": "event_changed"}))
+
+    assert bus.stats()["publish_errors"] == 1
+    assert bus.stats()["published"] == 0
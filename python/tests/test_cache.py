@@ -0,0 +1,15 @@
+from processors.cache import DocumentCache
+
+def test_merge_wins_over_a_read_started_before_it():
+    cache = DocumentCache()
+    cache.put("meets/m", {"status": "old", "name": "Meet"})
+    _, data = cache._entries["meets/m"]
+    cache._entries["meets/m"] = (0, data)  # expired: the next get_or_load misses
+
+    def stale_read():
+        # Our own merge write lands while this read is in flight
+        cache.merge("meets/m", {"status": "new"})
+        return {"status": "old", "name": "Meet"}
+
+    cache.get_or_load("meets/m", stale_read)
+    assert cache.get_or_load("meets/m", lambda: None) == {"status": "new", "name": "Meet"}
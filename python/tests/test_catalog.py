@@ -0,0 +1,16 @@
+import pytest
+from processors.catalog import classify_event
+from processors.startlist import get_event_type, get_sort_ascending
+
+@pytest.mark.parametrize("event_name, event_type, sort_ascending", [
+    ("60 Meter Dash", "running", True),
+    ("Weight", "field", False),
+    ("4 X 400m Relay", "relay", True),
+    ("Heptathlon", "multi", False),
+])
+def test_startlist_helpers_follow_the_catalog(event_name, event_type, sort_ascending):
+    assert get_event_type(event_name) == event_type == classify_event(event_name).event_type
+    assert get_sort_ascending(event_name) is sort_ascending
+
+def test_relay_variants_share_a_name():
+    assert classify_event("Men 4x400 Meter Relay").name == classify_event("4 X 400m Relay").name == "4x400 Relay"
@@ -0,0 +1,62 @@
+import pytest
+from benchmarks.fake_firestore import FakeFirestore
+from processors.gcs import chunk_writes, commit_writes, PartialWriteError
+
+def test_chunks_split_on_write_count_and_payload_size():
+    db = FakeFirestore()
+    writes = [(db.collection("women").document(str(i)), {"results": "x" * 1000}) for i in range(10)]
+
+    assert [len(chunk) for chunk in chunk_writes(writes, batch_limit=4)] == [4, 4, 2]
+    assert [len(chunk) for chunk in chunk_writes(writes, batch_bytes=3500)] == [3, 3, 3, 1]
+    # Order is kept, so the commit marker written last still goes last
+    assert [ref for chunk in chunk_writes(writes, batch_bytes=3500) for ref, _ in chunk] == [ref for ref, _ in writes]
+
+def test_oversized_write_goes_alone():
+    db = FakeFirestore()
+    writes = [(db.collection("women").document("a"), {"x": 1}), (db.collection("women").document("big"), {"x": "y" * 5000}),
+              (db.collection("women").document("b"), {"x": 2})]
+    assert [len(chunk) for chunk in chunk_writes(writes, batch_bytes=1000)] == [1, 1, 1]
+
+def test_commit_writes_commits_every_chunk():
+    db = FakeFirestore()
+    writes = [(db.collection("women").document(str(i)), {"results": "x" * 1000}) for i in range(10)]
+    assert commit_writes(db, writes, batch_bytes=3500) == 10
+    assert all(db.collection("women").document(str(i)).get().exists for i in range(10))
+
+class FailingBatch:
+    def __init__(self, batch, fail_on: str):
+        self.batch = batch
+        self.fail_on = fail_on
+        self.paths = []
+
+    def set(self, doc_ref, data, merge=False):
+        self.paths.append(doc_ref.path)
+        self.batch.set(doc_ref, data, merge=merge)
+
+    def commit(self):
+        if self.fail_on in self.paths:
+            raise ConnectionError("batch failed")
+        self.batch.commit()
+
+def test_failed_chunk_leaves_the_commit_marker_unwritten():
+    db = FakeFirestore()
+    real_batch = db.batch
+    db.batch = lambda: FailingBatch(real_batch(), fail_on="women/3")
+    events = [(db.collection("women").document(str(i)), {"results": []}) for i in range(6)]
+    meet = (db.collection("meets").document("m"), {"name": "M"})
+
+    with pytest.raises(PartialWriteError) as raised:
+        commit_writes(db, events + [meet], batch_limit=2)
+
+    assert isinstance(raised.value.__cause__, ConnectionError)
+    assert not db.collection("meets").document("m").get().exists
+    assert db.collection("women").document("0").get().exists
+    assert not db.collection("women").document("3").get().exists
+
+def test_failure_with_nothing_committed_is_raised_as_is():
+    db = FakeFirestore()
+    real_batch = db.batch
+    db.batch = lambda: FailingBatch(real_batch(), fail_on="meets/m")
+
+    with pytest.raises(ConnectionError):
+        commit_writes(db, [(db.collection("meets").document("m"), {"name": "M"})])
@@ -0,0 +1,36 @@
+from processors.dedupe import UploadFingerprints
+from tests.uploads import start_list_files, event_files
+
+METADATA = {
+    "meet_year": "2025", "meet_season": "indoor", "meet_id": "big-meet",
+    "event_gender": "women", "event_num": "1", "event_round": "final",
+}
+
+def test_forget_meet_accepts_int_year():
+    fingerprints = UploadFingerprints()
+    fingerprints.remember(METADATA, "abc")
+    assert fingerprints.find("abc") == METADATA
+
+    fingerprints.forget_meet(2025, "indoor", "big-meet")
+    assert fingerprints.find("abc") is None
+
+def test_forget_meet_keeps_other_meets():
+    fingerprints = UploadFingerprints()
+    fingerprints.remember(METADATA, "abc")
+    fingerprints.forget_meet(2025, "indoor", "other-meet")
+    assert fingerprints.find("abc") == METADATA
+
+def test_reupload_after_reseed_is_processed(client):
+    meet_name = "Reseed Meet"
+    assert client.post("/upload_merged_start_list", files=start_list_files(meet_name)).status_code == 200
+
+    first = client.post("/upload_event", files=event_files(meet_name))
+    assert first.status_code == 200 and not first.json().get("duplicate")
+    assert client.post("/upload_event", files=event_files(meet_name)).json().get("duplicate")
+
+    # Reseeding wipes the event's results: the same file must restore them
+    assert client.post("/upload_merged_start_list", files=start_list_files(meet_name)).status_code == 200
+    again = client.post("/upload_event", files=event_files(meet_name))
+    assert again.status_code == 200
+    assert not again.json().get("duplicate")
+    assert again.json()["unchanged"] is False
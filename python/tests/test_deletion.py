@@ -0,0 +1,29 @@
+import time
+import app
+from tests.uploads import start_list_files
+
+MEET = "Deletion Meet"
+
+def job_status(client, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/delete_meet/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "deleting-files", "deleting-documents") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
+
+def test_background_deletion_failure_marks_the_job_failed(client, monkeypatch):
+    assert client.post("/upload_merged_start_list", files=start_list_files(MEET)).status_code == 200
+
+    def failing_delete(*_):
+        raise ConnectionError("firestore unavailable")
+
+    monkeypatch.setattr(app, "delete_meet_data", failing_delete)
+    response = client.delete(
+        "/delete_meet", params={"database_id": "2025/indoor/deletion-meet", "background": "true"}
+    )
+    assert response.status_code == 202
+
+    job = job_status(client, response.json()["job_id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "firestore unavailable"
@@ -0,0 +1,49 @@
+from processors.cache import document_cache
+from processors.storage import get_database
+from tests.uploads import start_list_files, event_files
+
+MEET = "Deleted Elsewhere Meet"
+MEET_PATH = "meets/2025/indoor/deleted-elsewhere-meet"
+
+def test_upload_for_a_meet_deleted_by_another_instance_is_rejected(client):
+    assert client.post("/upload_merged_start_list", files=start_list_files(MEET)).status_code == 200
+    db = get_database()
+    meet_ref = db.document(MEET_PATH)
+    assert document_cache.get(meet_ref) is not None
+
+    # Another instance deletes the meet: this instance's cache still has it
+    db.recursive_delete(meet_ref)
+    assert document_cache.get(meet_ref) is not None
+
+    response = client.post("/upload_event", files=event_files(MEET))
+    assert response.status_code == 400
+    assert "Meet not found" in response.json()["detail"]
+    assert not db.document(f"{MEET_PATH}/women/1").get().exists
+
+def test_update_of_a_missing_event_is_not_found(client):
+    assert client.post("/upload_merged_start_list", files=start_list_files("Update Meet")).status_code == 200
+    response = client.post("/update_event", json={
+        "meetDocumentId": "2025/indoor/update-meet", "gender": "women", "eventId": "999",
+        "updates": {"status": "scored"},
+    })
+    assert response.status_code == 404
+    assert "does not exist" in response.json()["detail"]
+
+def test_update_keys_containing_dots(client):
+    assert client.post("/upload_merged_start_list", files=start_list_files("Dotted Meet")).status_code == 200
+    update = {"meetDocumentId": "2025/indoor/dotted-meet", "gender": "women", "eventId": "1"}
+
+    response = client.post("/update_event", json={**update, "updates": {"notes.`Team A.B`": "protest"}})
+    assert response.status_code == 200
+    event = get_database().document("meets/2025/indoor/dotted-meet/women/1").get().to_dict()
+    assert event["notes"] == {"Team A.B": "protest"}
+
+    response = client.post("/update_event", json={**update, "updates": {"notes.`Team A": "protest"}})
+    assert response.status_code == 400
+
+def test_flattened_updates_quote_dotted_keys():
+    from processors.event import flatten_updates, apply_field_updates
+    payload = {"projection": {"St. Mary's": {"points": 1}}, "status": "scored"}
+    updates = flatten_updates(payload)
+    assert "status" in updates
+    assert apply_field_updates({}, updates) == payload
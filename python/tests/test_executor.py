@@ -0,0 +1,25 @@
+import time
+import asyncio
+import pytest
+from processors import executor
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_finishes(monkeypatch):
+    async def scenario():
+        monkeypatch.setattr(executor, "_slots", asyncio.Semaphore(1))
+        with pytest.raises(TimeoutError):
+            await executor.run_blocking(time.sleep, 0.3, timeout=0.05)
+        assert executor._slots.locked()
+
+        await asyncio.sleep(0.4)
+        assert not executor._slots.locked()
+        assert await executor.run_blocking(sum, [1, 2]) == 3
+
+    asyncio.run(scenario())
+
+def test_update_event_maps_errors(client):
+    response = client.post("/update_event", json={
+        "meetDocumentId": "2025/indoor/no-such-meet", "gender": "women", "eventId": "1",
+        "updates": {"status": "scored"},
+    })
+    assert response.status_code == 404
+    assert "Meet not found" in response.json()["detail"]
@@ -0,0 +1,200 @@
+import sqlite3
+import pytest
+from processors.local_storage import LocalDatabase, LocalBucket, CloudSync
+
+exceptions = pytest.importorskip("google.api_core.exceptions")
+
+class FakeCloud:
+    """Firestore client and GCS bucket stand-in that records what reaches it."""
+
+    def __init__(self):
+        self.docs = {}
+        self.blobs = {}
+        self.log = []
+        self.rejected = set()   # paths the cloud refuses (InvalidArgument)
+        self.offline = 0        # next commits that fail with ServiceUnavailable
+
+    def document(self, path):
+        return path
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def recursive_delete(self, path):
+        self.log.append(("delete_tree", path))
+        for key in [key for key in self.docs if key == path or key.startswith(f"{path}/")]:
+            del self.docs[key]
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+class FakeBatch:
+    def __init__(self, cloud):
+        self.cloud = cloud
+        self.writes = []
+
+    def set(self, path, data):
+        self.writes.append(("set", path, data))
+
+    def delete(self, path):
+        self.writes.append(("delete", path, None))
+
+    def commit(self):
+        if self.cloud.offline:
+            self.cloud.offline -= 1
+            raise exceptions.ServiceUnavailable("offline")
+        for _, path, _ in self.writes:
+            if path in self.cloud.rejected:
+                raise exceptions.InvalidArgument(f"rejected {path}")
+        for op, path, data in self.writes:
+            self.cloud.log.append((op, path))
+            if op == "set":
+                self.cloud.docs[path] = data
+            else:
+                self.cloud.docs.pop(path, None)
+
+class FakeBlob:
+    def __init__(self, cloud, name):
+        self.cloud = cloud
+        self.name = name
+
+    def upload_from_string(self, content, content_type=None):
+        self.cloud.log.append(("upload_blob", self.name))
+        self.cloud.blobs[self.name] = content
+
+    def delete(self):
+        self.cloud.log.append(("delete_blob", self.name))
+        if self.name not in self.cloud.blobs:
+            raise exceptions.NotFound(self.name)
+        del self.cloud.blobs[self.name]
+
+@pytest.fixture
+def local(tmp_path):
+    db = LocalDatabase(str(tmp_path / "documents.sqlite3"))
+    bucket = LocalBucket(str(tmp_path / "blobs"), db, "test-bucket")
+    cloud = FakeCloud()
+    sync = CloudSync(db, bucket, cloud, cloud, batch_size=50, retry_max_seconds=0.1,
+                     interval_seconds=0.1, max_attempts=3)
+    yield db, bucket, cloud, sync
+    db.close()
+
+def drain(sync, rounds: int = 10):
+    """Run sync_once like the sync thread does, swallowing retryable failures."""
+    for _ in range(rounds):
+        try:
+            sync.sync_once()
+        except Exception:
+            continue
+        if not sync.db.pending(1):
+            return
+
+def test_rejected_entry_moves_to_failed_and_unblocks_the_rest(local):
+    db, _, cloud, sync = local
+    meet = db.collection("meets").document("2025/indoor/m")
+    meet.set({"name": "M"})
+    meet.collection("women").document("bad").set({"x": 1})
+    meet.collection("women").document("1").set({"y": 2})
+    cloud.rejected.add("meets/2025/indoor/m/women/bad")
+
+    drain(sync)
+
+    assert set(cloud.docs) == {"meets/2025/indoor/m", "meets/2025/indoor/m/women/1"}
+    stats = sync.stats()
+    assert stats["pending"] == 0
+    assert stats["failed"] == 1
+    assert stats["given_up"] == 1
+    [failed] = stats["failed_entries"]
+    assert failed["path"] == "meets/2025/indoor/m/women/bad"
+    assert failed["attempts"] == 3
+
+def test_connectivity_errors_are_never_given_up_on(local):
+    db, _, cloud, sync = local
+    db.collection("meets").document("2025/indoor/m").set({"name": "M"})
+    cloud.offline = 5
+
+    for _ in range(5):
+        with pytest.raises(exceptions.ServiceUnavailable):
+            sync.sync_once()
+    assert sync.stats()["failed"] == 0
+
+    assert sync.sync_once() == 1
+    assert cloud.docs == {"meets/2025/indoor/m": {"name": "M"}}
+
+def test_stop_sync_closes_the_local_database():
+    from processors import storage
+
+    db = storage.get_database()
+    storage.stop_sync()
+    with pytest.raises(sqlite3.ProgrammingError):
+        db._read("meets/any")
+    assert storage.get_database() is not db
+
+def local_documents(db) -> dict:
+    meets = db.collection("meets").document("2025/indoor/m")
+    return {
+        snapshot.reference.path: snapshot.to_dict()
+        for collection in (db.collection("meets/2025/indoor"), meets.collection("women"))
+        for snapshot in collection.stream()
+    }
+
+def test_update_merge_and_delete_replay_to_the_same_state(local):
+    db, bucket, cloud, sync = local
+    meet = db.collection("meets").document("2025/indoor/m")
+    event = meet.collection("women").document("1")
+    meet.set({"name": "M", "teams": {}})
+    event.set({"results": [1], "meta": {"round": "Finals"}})
+    event.set({"meta": {"status": "Scored"}}, merge=True)
+    meet.update({"teams.`TEAM A`": 10, "name": "Meet"})
+    meet.collection("women").document("2").set({"results": []})
+    meet.collection("women").document("2").delete()
+    bucket.blob("events/2025/indoor/m/women_1.csv").upload_from_string(b"csv", content_type="text/csv")
+    event.update({"results": [1, 2]})
+
+    drain(sync)
+
+    assert cloud.docs == local_documents(db)
+    assert cloud.docs["meets/2025/indoor/m"] == {"name": "Meet", "teams": {"TEAM A": 10}}
+    assert cloud.docs["meets/2025/indoor/m/women/1"] == {
+        "results": [1, 2], "meta": {"round": "Finals", "status": "Scored"},
+    }
+    assert cloud.blobs == {"events/2025/indoor/m/women_1.csv": b"csv"}
+    # Document writes before the upload go out as one batch of latest states,
+    # each in the order of its last write
+    assert cloud.log == [
+        ("set", "meets/2025/indoor/m/women/1"),
+        ("set", "meets/2025/indoor/m"),
+        ("delete", "meets/2025/indoor/m/women/2"),
+        ("upload_blob", "events/2025/indoor/m/women_1.csv"),
+        ("set", "meets/2025/indoor/m/women/1"),
+    ]
+
+def test_delete_then_recreate_keeps_the_document(local):
+    db, _, cloud, sync = local
+    doc = db.collection("meets").document("2025/indoor/m")
+    doc.set({"name": "old"})
+    doc.delete()
+    doc.set({"name": "new"})
+
+    drain(sync)
+
+    assert cloud.docs == {"meets/2025/indoor/m": {"name": "new"}}
+
+def test_recursive_delete_removes_the_subtree_only(local):
+    db, _, cloud, sync = local
+    meet = db.collection("meets").document("2025/indoor/m")
+    meet.set({"name": "M"})
+    meet.collection("women").document("1").set({"results": []})
+    meet.collection("men").document("1").set({"results": []})
+    sibling = db.collection("meets").document("2025/indoor/m2")
+    sibling.set({"name": "M2"})
+    drain(sync)
+
+    assert db.recursive_delete(meet) == 3
+    assert not meet.get().exists
+    assert not meet.collection("women").document("1").get().exists
+    assert sibling.get().exists
+
+    drain(sync)
+
+    assert cloud.log[-1] == ("delete_tree", "meets/2025/indoor/m")
+    assert cloud.docs == {"meets/2025/indoor/m2": {"name": "M2"}}
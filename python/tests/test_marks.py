@@ -0,0 +1,22 @@
+import pytest
+from processors.gcs import parse_time_or_distance, parse_marks
+
+CASES = [
+    ("1:02.50", 62.5),
+    ("7.45m", 7.45),
+    ("21ft", 21.0),
+    ("6.71", 6.71),
+    ("12.50f", None),
+    ("DNF", None),
+    ("FOUL", None),
+    ("", None),
+]
+
+@pytest.mark.parametrize("raw, expected", CASES)
+def test_parse_time_or_distance(raw, expected):
+    assert parse_time_or_distance(raw) == expected
+
+def test_parse_marks_matches_single_parse():
+    pytest.importorskip("pandas")
+    raws = [raw for raw, _ in CASES]
+    assert parse_marks(raws) == [expected for _, expected in CASES]
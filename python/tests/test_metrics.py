@@ -0,0 +1,27 @@
+import pytest
+import app
+from processors.metrics import render_metrics, REQUEST_SECONDS
+
+def test_stats_types_and_values():
+    text = render_metrics({"stream": {"subscribers": 3, "published": 1234567, "nested": {"hits": 2}},
+                           "cache": {"hit_rate": 0.125, "running": True}})
+    assert "# TYPE flash_stream_subscribers gauge" in text
+    assert "# TYPE flash_stream_published counter" in text
+    assert "flash_stream_published 1234567\n" in text
+    assert "# TYPE flash_stream_nested_hits counter" in text
+    assert "flash_cache_hit_rate 0.125\n" in text
+    assert "flash_cache_running 1\n" in text
+
+def test_raised_request_is_observed_as_500(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    def failing_stats():
+        raise RuntimeError("stats unavailable")
+
+    monkeypatch.setattr(app, "instance_stats", failing_stats)
+    key = ("GET", "/stats", "500")
+    before = REQUEST_SECONDS._series.get(key, [0])[-1]
+    client = TestClient(app.app, raise_server_exceptions=False)
+    assert client.get("/stats").status_code == 500
+    assert REQUEST_SECONDS._series[key][-1] == before + 1
@@ -0,0 +1,25 @@
+from processors import profiling
+from processors.profiling import profiler, background_context, RequestProfile
+from tests.uploads import start_list_files
+
+def test_background_context_has_no_profile():
+    token = profiler.activate(RequestProfile("test"))
+    try:
+        assert profiling._active_profile.get() is not None
+        assert background_context().run(profiling._active_profile.get) is None
+    finally:
+        profiler.deactivate(token)
+
+def test_failed_profile_write_does_not_fail_the_request(client, monkeypatch):
+    monkeypatch.setattr(profiler, "token", "secret")
+
+    def failing_finish(profile):
+        profiler._busy.release()
+        raise OSError("disk full")
+
+    monkeypatch.setattr(profiler, "finish", failing_finish)
+    response = client.post(
+        "/upload_merged_start_list", files=start_list_files("Profiled Meet"), headers={"X-Profile": "secret"},
+    )
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
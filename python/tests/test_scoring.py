@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("numpy")
+from processors.scoring import rank_and_score
+
+def ranked(marks, ascending=True):
+    """[(mark, place, score)] best-first; place None when unplaced."""
+    order, places, scores = rank_and_score(marks, ascending)
+    return [
+        (marks[i], None if place != place else int(place), float(score))
+        for i, place, score in zip(order, places, scores)
+    ]
+
+def test_distinct_marks_take_the_points_table():
+    assert ranked([11.0, 10.0, 10.5]) == [(10.0, 1, 10.0), (10.5, 2, 8.0), (11.0, 3, 6.0)]
+
+def test_tie_splits_the_places_it_covers():
+    assert ranked([10.0, 10.5, 10.5, 11.0]) == [
+        (10.0, 1, 10.0), (10.5, 2, 7.0), (10.5, 2, 7.0), (11.0, 4, 5.0),
+    ]
+
+def test_three_way_tie_for_first():
+    assert [score for *_, score in ranked([9.9, 9.9, 9.9, 10.2])] == [8.0, 8.0, 8.0, 5.0]
+
+def test_tie_across_the_last_scoring_place():
+    marks = [10.0 + i / 10 for i in range(7)] + [11.0, 11.0]
+    assert ranked(marks)[-2:] == [(11.0, 8, 0.5), (11.0, 8, 0.5)]
+
+def test_field_events_rank_descending():
+    assert ranked([7.0, 7.5, 7.5], ascending=False) == [(7.5, 1, 9.0), (7.5, 1, 9.0), (7.0, 3, 6.0)]
+
+def test_missing_and_zero_marks():
+    result = ranked([None, 0, 10.0])
+    assert result[0] == (10.0, 1, 10.0)
+    assert (None, None, 0.0) in result
+    # A zero mark is placed after every real mark
+    assert (0, 2, 8.0) in result
+
+def test_standings_deltas_match_a_rebuild(client):
+    from processors.scoring import GENDERS, get_standings_ref, rebuild_standings
+    from processors.storage import get_database
+    from tests.uploads import start_list_files, event_files
+
+    meet = "Standings Parity Meet"
+    assert client.post("/upload_merged_start_list", files=start_list_files(meet)).status_code == 200
+    for upload in [
+        event_files(meet),
+        event_files(meet, gender="Men", event_num="2"),
+        event_files(meet, seed=1),
+        # Re-upload by another team: Team AA's scorers must drop out
+        event_files(meet, seed=2, team="BB"),
+    ]:
+        assert client.post("/upload_event", files=upload).status_code == 200
+
+    db = get_database()
+    meet_ref = db.document("meets/2025/indoor/standings-parity-meet")
+    materialized = {gender: get_standings_ref(meet_ref, gender).get().to_dict() for gender in GENDERS}
+    assert "TEAM BB" in materialized["women"]["events"]["1"]
+    assert materialized == rebuild_standings(db, meet_ref)
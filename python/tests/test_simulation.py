@@ -0,0 +1,13 @@
+from processors import simulation
+from tests.uploads import start_list_files
+
+def test_background_refresh_does_not_extend_the_window(client):
+    assert client.post("/upload_merged_start_list", files=start_list_files("Sim Meet")).status_code == 200
+    meet_document_id = "2025/indoor/sim-meet"
+    simulation._last_requested.pop(meet_document_id, None)
+
+    simulation.get_meet_simulation("2025", "indoor", "sim-meet", refresh=True)
+    assert not simulation.recently_requested(meet_document_id)
+
+    simulation.get_meet_simulation("2025", "indoor", "sim-meet")
+    assert simulation.recently_requested(meet_document_id)
@@ -0,0 +1,56 @@
+import app
+from processors.storage import get_database
+from tests.uploads import start_list_files, event_files
+
+MEET = "Reseed Meet"
+MEET_DOCUMENT_ID = "2025/indoor/reseed-meet"
+
+def event_version() -> int:
+    event_ref = get_database().document(f"meets/{MEET_DOCUMENT_ID}/women/1")
+    return event_ref.get().to_dict()["version"]
+
+def test_reseed_keeps_event_versions_increasing(client, monkeypatch):
+    published = []
+    async def record(payload):
+        published.append(payload)
+    monkeypatch.setattr(app, "notify_clients", record)
+
+    assert client.post("/upload_merged_start_list", files=start_list_files(MEET)).status_code == 200
+    assert client.post("/upload_event", files=event_files(MEET)).status_code == 200
+    uploaded = event_version()
+
+    assert client.post("/upload_merged_start_list", files=start_list_files(MEET)).status_code == 200
+    reseeded = event_version()
+    assert reseeded > uploaded
+    assert published[-1] == {"type": "resync", "meet_document_id": MEET_DOCUMENT_ID}
+
+    assert client.post("/upload_event", files=event_files(MEET, seed=1)).status_code == 200
+    assert event_version() > reseeded
+    assert published[-1]["version"] == event_version()
+
+def test_partially_written_reseed_can_be_retried(client, monkeypatch):
+    from processors import startlist
+    from processors.gcs import commit_writes, PartialWriteError
+
+    meet = "Partial Meet"
+    assert client.post("/upload_merged_start_list", files=start_list_files(meet)).status_code == 200
+    upload = event_files(meet)
+    assert client.post("/upload_event", files=upload).status_code == 200
+
+    def partial_commit(db, writes, **kwargs):
+        commit_writes(db, writes[:1], **kwargs)
+        raise PartialWriteError("1 of 3 writes were committed before a batch failed: offline")
+
+    monkeypatch.setattr(startlist, "commit_writes", partial_commit)
+    response = client.post("/upload_merged_start_list", files=start_list_files(meet))
+    assert response.status_code == 503
+    assert "upload it again" in response.json()["detail"]
+    # The partial reseed may have reset the event: the same file is processed again, not skipped
+    response = client.post("/upload_event", files=upload)
+    assert response.status_code == 200
+    assert not response.json().get("duplicate")
+
+    monkeypatch.setattr(startlist, "commit_writes", commit_writes)
+    assert client.post("/upload_merged_start_list", files=start_list_files(meet)).status_code == 200
+    event = get_database().document("meets/2025/indoor/partial-meet/women/1").get().to_dict()
+    assert event["status"] == "projected"
@@ -0,0 +1,21 @@
+import asyncio
+import app
+from processors.broadcast import broadcaster
+
+class FakeRequest:
+    async def is_disconnected(self):
+        return False
+
+def test_unsent_stream_response_leaves_no_subscriber():
+    async def scenario():
+        before = broadcaster.stats()["subscribers"]
+        response = await app.stream(FakeRequest(), meet_document_id="2025/indoor/stream-meet")
+        assert broadcaster.stats()["subscribers"] == before
+
+        body = response.body_iterator
+        assert (await body.__anext__()).startswith("retry:")
+        assert broadcaster.stats()["subscribers"] == before + 1
+        await body.aclose()
+        assert broadcaster.stats()["subscribers"] == before
+
+    asyncio.run(scenario())
@@ -0,0 +1,30 @@
+"""Synthetic upload files for endpoint tests."""
+
+MEET_INI = """[index]
+meet={meet_name}
+meetdate=Jan 1, 2025
+meetlocation=Lubbock, TX
+meetvenue=Sports Complex
+[switch]
+outdoor=off
+"""
+
+def start_list_files(meet_name: str) -> dict:
+    """Multipart files for /upload_merged_start_list: a small synthetic meet."""
+    from benchmarks.synthetic import generate_start_list
+    return {
+        "csv_file": ("start_list.csv", generate_start_list(16).encode("utf-8")),
+        "ini_file": ("meet.ini", MEET_INI.format(meet_name=meet_name).encode("utf-8")),
+    }
+
+def event_files(meet_name: str, seed: int = 0, gender: str = "Women", event_num: str = "1", team: str = "AA") -> dict:
+    """Multipart files for /upload_event: scored 60 m results (by default the meet's first event)."""
+    from benchmarks.synthetic import generate_event_results
+    entries = [
+        {"athlete_name": f"First{i} LAST{team}", "athlete_id": 10000 + i, "team_name": f"Team {team}",
+         "team_abbr": f"TEAM{team}", "sb_numeric": 7.0 + i / 10}
+        for i in range(4)
+    ]
+    content = generate_event_results(event_num, "60 Meter Dash", gender, entries, meet_name, "2025", "Indoor", seed=seed)
+    content = content.replace(",Finals,Official,", ",Finals,Scored,", 1)
+    return {"file": (f"{gender.lower()}_{event_num}.csv", content.encode("utf-8"))}